@@ -0,0 +1,174 @@
+# nfl_betting_app/ablation.py
+# Feature-group ablation for the against-the-spread model: how much each
+# group of features adds to (or costs) ATS accuracy and log loss.
+#
+# The feature matrix, targets and per-fold scaling statistics are built once
+# and placed in shared memory; worker processes attach to them and only
+# receive the column indices of each experiment.
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Seasons of history before the first test season of the time-ordered folds.
+ABLATION_MIN_TRAIN_SEASONS = 3
+ABLATION_C = 1.0
+
+_FEATURE_PATTERN = re.compile(r'^(home|away)_(avg|l\d+|rtg_off|rtg_def)_(.+)$')
+
+# Set in each worker process by _init_worker.
+_WORKER: Dict[str, Any] = {}
+
+
+def feature_groups(columns: List[str], by: str = 'stat') -> Dict[str, List[str]]:
+    """
+    Groups the home/away feature columns of a feature set.
+
+    Args:
+        by: 'stat' groups every window and side of a stat (e.g. all
+            passing_yards features); 'window' groups by average type
+            (avg, l1, l3, rtg_off, ...).
+    """
+    if by not in ('stat', 'window'):
+        raise ValueError(f"Unknown feature grouping '{by}'. Expected 'stat' or 'window'.")
+    groups: Dict[str, List[str]] = {}
+    for col in columns:
+        match = _FEATURE_PATTERN.match(col)
+        if match:
+            _, window, stat = match.groups()
+            groups.setdefault(stat if by == 'stat' else window, []).append(col)
+    return groups
+
+
+def _ats_rows(feature_df: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame:
+    """Graded games only: a result, a spread that is not a push, and complete features."""
+    df = feature_df.dropna(subset=['result', 'spread_line'] + feature_cols)
+    return df[df['result'] != df['spread_line']].sort_values(['season', 'week']).reset_index(drop=True)
+
+
+def _to_shared(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, Tuple[int, ...], str]]:
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _init_worker(specs: Dict[str, Tuple[str, Tuple[int, ...], str]], test_seasons: List[int], C: float) -> None:
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER[f'{name}_shm'] = shm  # Keeps the mapping alive.
+        _WORKER[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _WORKER['test_seasons'] = test_seasons
+    _WORKER['C'] = C
+
+
+def _evaluate(columns: np.ndarray) -> Tuple[float, float]:
+    """
+    Fits the model on each fold's earlier seasons and scores the pooled
+    out-of-sample predictions. Returns (ATS accuracy, log loss).
+    """
+    X, y, seasons = _WORKER['X'], _WORKER['y'], _WORKER['season']
+    means, stds = _WORKER['means'], _WORKER['stds']
+    probabilities, outcomes = [], []
+    for fold, test_season in enumerate(_WORKER['test_seasons']):
+        train, test = seasons < test_season, seasons == test_season
+        if len(columns):
+            scale = stds[fold, columns]
+            X_train = (X[np.ix_(train, columns)] - means[fold, columns]) / scale
+            X_test = (X[np.ix_(test, columns)] - means[fold, columns]) / scale
+            model = LogisticRegression(C=_WORKER['C'], max_iter=1000).fit(X_train, y[train])
+            probability = model.predict_proba(X_test)[:, 1]
+        else:
+            # Intercept only: the training cover rate.
+            probability = np.full(test.sum(), y[train].mean())
+        probabilities.append(probability)
+        outcomes.append(y[test])
+
+    probability = np.clip(np.concatenate(probabilities), 1e-12, 1 - 1e-12)
+    outcome = np.concatenate(outcomes)
+    ats_accuracy = float(np.mean((probability > 0.5) == (outcome == 1)))
+    log_loss = float(-np.mean(outcome * np.log(probability) + (1 - outcome) * np.log(1 - probability)))
+    return ats_accuracy, log_loss
+
+
+def run_ablation(
+    feature_df: pd.DataFrame,
+    groups: Optional[Dict[str, List[str]]] = None,
+    min_train_seasons: int = ABLATION_MIN_TRAIN_SEASONS,
+    n_jobs: Optional[int] = None,
+    C: float = ABLATION_C
+) -> pd.DataFrame:
+    """
+    Measures each feature group's contribution to a logistic model of the
+    home team covering `spread_line`.
+
+    Folds are time ordered: each season after the first `min_train_seasons`
+    is predicted by a model trained on all earlier seasons. Every group is
+    dropped from the full feature set (drop-one) and used alone (add-one,
+    compared with an intercept-only model). Experiments run in `n_jobs`
+    worker processes (default: one per core).
+
+    Returns:
+        One row per experiment with its ATS accuracy and log loss and their
+        deltas against the full model (drop) or the intercept-only model
+        (add). A positive drop delta in log loss means the group helps.
+    """
+    groups = groups if groups is not None else feature_groups(list(feature_df.columns))
+    if not groups:
+        raise ValueError("No feature groups to ablate.")
+    feature_cols = list(dict.fromkeys(col for cols in groups.values() for col in cols))
+    df = _ats_rows(feature_df, feature_cols)
+    all_seasons = sorted(df['season'].unique())
+    test_seasons = [int(season) for season in all_seasons[min_train_seasons:]]
+    if not test_seasons:
+        raise ValueError(f"Need more than {min_train_seasons} seasons of graded games for ablation folds.")
+
+    X = df[feature_cols].to_numpy(dtype=np.float64)
+    season = df['season'].to_numpy(dtype=np.int64)
+    # Standardization statistics of each fold's training rows, computed once.
+    means = np.stack([X[season < test].mean(axis=0) for test in test_seasons])
+    stds = np.stack([X[season < test].std(axis=0) for test in test_seasons])
+    stds[stds == 0] = 1.0
+    arrays = {
+        'X': X,
+        'y': (df['result'] > df['spread_line']).to_numpy(dtype=np.float64),
+        'season': season,
+        'means': means,
+        'stds': stds,
+    }
+
+    index = {col: i for i, col in enumerate(feature_cols)}
+    all_columns = np.arange(len(feature_cols))
+    experiments = [('baseline', 'all', all_columns), ('baseline', 'none', np.array([], dtype=int))]
+    for group, cols in groups.items():
+        group_columns = np.array([index[col] for col in cols])
+        experiments.append(('drop', group, np.setdiff1d(all_columns, group_columns)))
+        experiments.append(('add', group, group_columns))
+
+    print(f"Running {len(experiments)} ablation experiments over {len(test_seasons)} folds...")
+    shared = [_to_shared(array) for array in arrays.values()]
+    specs = {name: spec for name, (_, spec) in zip(arrays, shared)}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs or os.cpu_count(), initializer=_init_worker, initargs=(specs, test_seasons, C)
+        ) as pool:
+            scores = list(pool.map(_evaluate, [columns for _, _, columns in experiments]))
+    finally:
+        for shm, _ in shared:
+            shm.close()
+            shm.unlink()
+
+    results = pd.DataFrame([
+        {'kind': kind, 'group': group, 'n_features': len(columns), 'ats_accuracy': ats, 'log_loss': loss}
+        for (kind, group, columns), (ats, loss) in zip(experiments, scores)
+    ])
+    reference = results[results['kind'] == 'baseline'].set_index('group')
+    reference_group = results['kind'].map({'drop': 'all', 'add': 'none', 'baseline': None})
+    for metric in ['ats_accuracy', 'log_loss']:
+        baseline = reference_group.map(reference[metric])
+        results[f'{metric}_delta'] = (results[metric] - baseline).where(results['kind'] != 'baseline', 0.0)
+    return results
@@ -4,7 +4,13 @@
 # Import our custom application modules
 from nfl_betting_app.data_retriever import update_raw_pbp_data
 from nfl_betting_app.data_handler import load_raw_pbp_data
-from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.feature_engineering import create_final_feature_set, create_final_feature_set_from_partitions
+from nfl_betting_app.feature_snapshots import save_feature_snapshot
+from nfl_betting_app.game_index import build_game_index, sort_plays
+from nfl_betting_app.query_store import build_query_store
+from nfl_betting_app.ratings import RATING_STATS
+from nfl_betting_app.team_state import TeamStateTable
+from nfl_betting_app.team_tensor import build_team_tensor
 import nfl_betting_app.config as config # I noticed this was create_point_in_time_features, but the file has create_final_feature_set
 import os
 
@@ -24,16 +30,41 @@ def run_data_pipeline():
     # === STEP 2: Generate PROCESSED Features ===
     print("\n[Step 2/2] Generating PROCESSED features...")
     try:
-        # The PBP data is now the single source of truth for game and play information.
-        pbp_df = load_raw_pbp_data()
+        # The team-game stats and point-in-time team features the pipeline builds on the way.
+        team_tables = {}
+        # RATING_STATS adds home_/away_ rtg_off_<stat> and rtg_def_<stat> columns to the feature set.
+        if os.path.exists(config.RAW_PBP_MANIFEST_PATH):
+            # Read the season partitions in batches that fit config.FEATURE_MEMORY_BUDGET_BYTES.
+            feature_df = create_final_feature_set_from_partitions(
+                config.RAW_PBP_PARTITION_DIR, season_type='REG', rating_stats=RATING_STATS, team_tables=team_tables
+            )
+        else:
+            # The PBP data is now the single source of truth for game and play information.
+            pbp_df = load_raw_pbp_data()
+            # The game index lets the pipeline slice games by offset instead of regrouping every play.
+            # Build it from the frame just loaded so its offsets always match these rows.
+            pbp_df = sort_plays(pbp_df)
+            game_index = build_game_index(pbp_df)
 
-        feature_df = create_final_feature_set(pbp_df, season_type='REG')
+            feature_df = create_final_feature_set(
+                pbp_df, season_type='REG', game_index=game_index, rating_stats=RATING_STATS,
+                team_tables=team_tables
+            )
 
         os.makedirs(config.PROCESSED_DATA_DIR, exist_ok=True)
         feature_df.to_csv(config.MODEL_FEATURE_SET_PATH, index=False)
         print(
             f"Processed feature set saved locally to: {config.MODEL_FEATURE_SET_PATH}"
         )
+        # Keep the as-of history so past feature sets can be audited.
+        save_feature_snapshot(feature_df, config.FEATURE_SNAPSHOT_DIR)
+        # Indexed copy of the stats and features for ad-hoc team/week lookups.
+        build_query_store(team_tables, feature_df, path=config.QUERY_STORE_PATH)
+        # Dense team/week tensor for sequence models and matrix-style lookups.
+        build_team_tensor(team_tables, path=config.TEAM_TENSOR_DIR)
+        # Latest per-team state, served by team_state.serve_team_state for upcoming games.
+        TeamStateTable.from_team_tables(team_tables).save(config.TEAM_STATE_PATH)
+        print(f"Team state saved to: {config.TEAM_STATE_PATH}")
 
     except FileNotFoundError as e:
         print(
@@ -0,0 +1,231 @@
+# nfl_betting_app/artifacts.py
+# This module defines the on-disk artifact format for the play-by-play store:
+# one zstd-compressed Parquet file per season plus a JSON manifest recording
+# each partition's size, MD5 checksum and row count.
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import nfl_betting_app.config as config
+from nfl_betting_app.pbp_schema import schema_from_json, schema_to_json, unify_schema
+
+
+def file_md5(local_file_path: str) -> str:
+    """Computes the MD5 checksum of a local file, as reported by Drive's `md5Checksum`."""
+    md5 = hashlib.md5()
+    with open(local_file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def partition_filename(season: int) -> str:
+    return f"pbp_{int(season)}.parquet"
+
+
+def schedule_filename(season: int) -> str:
+    """The cached nflverse schedule of a season, kept next to its play partition."""
+    return f"schedules_{int(season)}.parquet"
+
+
+def new_manifest(schema_version: int = config.ARTIFACT_SCHEMA_VERSION) -> Dict[str, Any]:
+    return {
+        "schema_version": schema_version,
+        "compression": config.PARQUET_COMPRESSION,
+        "partitions": {},
+    }
+
+
+def load_manifest(
+    manifest_path: str = config.RAW_PBP_MANIFEST_PATH, schema_version: int = config.ARTIFACT_SCHEMA_VERSION
+) -> Dict[str, Any]:
+    """
+    Loads a manifest. Raises FileNotFoundError if it does not exist and
+    ValueError if it was written with a schema version other than
+    `schema_version` (the PBP store's by default).
+    """
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("schema_version") != schema_version:
+        raise ValueError(
+            f"Manifest schema version {manifest.get('schema_version')} does not match "
+            f"expected version {schema_version}."
+        )
+    return manifest
+
+
+def save_manifest(manifest: Dict[str, Any], manifest_path: str = config.RAW_PBP_MANIFEST_PATH) -> None:
+    """Writes the manifest atomically so a crash never leaves a half-written file."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def schema_fingerprint(schema: pa.Schema) -> str:
+    """A short hash of the column names and types of an Arrow schema."""
+    fields = [f"{field.name}:{field.type}" for field in schema]
+    return hashlib.md5(",".join(fields).encode()).hexdigest()[:16]
+
+
+def manifest_schema_version(manifest_path: str) -> Optional[int]:
+    """The schema version a manifest was written with, without checking it."""
+    with open(manifest_path) as f:
+        return json.load(f).get("schema_version")
+
+
+def _store_schema(manifest: Dict[str, Any], schema: pa.Schema, partition_dir: str) -> pa.Schema:
+    """
+    The full schema (declared columns plus any kept raw columns) the store's
+    partitions were written with, or `schema` for a store without partitions.
+    """
+    stored = manifest.get("arrow_schema")
+    if stored is None:
+        if manifest["partitions"]:
+            raise ValueError(
+                f"Partitions in '{partition_dir}' were written without a unified schema; rewrite them all "
+                f"with schema {schema_fingerprint(schema)}."
+            )
+        return schema
+    if stored["declared"] != schema_fingerprint(schema):
+        raise ValueError(
+            f"Partitions in '{partition_dir}' were written with a different schema "
+            f"({stored['declared']}); rewrite them all with schema {schema_fingerprint(schema)}."
+        )
+    return schema_from_json(stored["fields"])
+
+
+def _write_table(table: pa.Table, path: str) -> Dict[str, Any]:
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression=config.PARQUET_COMPRESSION)
+    os.replace(tmp_path, path)
+    return {"bytes": os.path.getsize(path), "md5": file_md5(path)}
+
+
+def _conform_partitions(entries: Dict[str, Dict[str, Any]], partition_dir: str, schema: pa.Schema) -> None:
+    """
+    Rewrites partitions (manifest entries by file name) to `schema`: null
+    columns for the fields they lack, and their null columns cast to the
+    type a later season settled.
+    """
+    for file_name, entry in entries.items():
+        path = os.path.join(partition_dir, file_name)
+        table = pq.read_table(path)
+        for field in schema:
+            if field.name not in table.column_names:
+                table = table.append_column(field, pa.nulls(len(table), type=field.type))
+        entry.update(_write_table(table.select(schema.names).cast(schema), path))
+
+
+def write_partitions(
+    df: pd.DataFrame,
+    partition_dir: str = config.RAW_PBP_PARTITION_DIR,
+    manifest: Optional[Dict[str, Any]] = None,
+    schema: Optional[pa.Schema] = None,
+) -> Dict[str, Any]:
+    """
+    Writes one Parquet partition per season present in `df` and records it in
+    the manifest. Seasons not present in `df` keep their existing entries.
+
+    With a `schema` (see pbp_schema.PBP_SCHEMA), each season is unified to
+    the store's schema before writing and its schema drift is recorded in the
+    partition's entry, so every partition is stored with identical columns
+    and types. Raw columns the store has not seen before are kept; the
+    existing partitions are then rewritten with nulls for them, and likewise
+    when a season settles the type of a column stored as null. Raises
+    ValueError if the store was written without or with another schema.
+
+    Returns the updated manifest (it is not saved to disk).
+    """
+    os.makedirs(partition_dir, exist_ok=True)
+    manifest = manifest if manifest is not None else new_manifest()
+    if schema is None and "arrow_schema" in manifest:
+        raise ValueError(f"Partitions in '{partition_dir}' have a unified schema; write them with it.")
+    store_schema = _store_schema(manifest, schema, partition_dir) if schema is not None else None
+
+    for season, season_df in df.groupby("season", sort=True):
+        file_name = partition_filename(season)
+        path = os.path.join(partition_dir, file_name)
+        entry: Dict[str, Any] = {"season": int(season), "rows": int(len(season_df))}
+        if store_schema is None:
+            season_df.to_parquet(path, index=False, compression=config.PARQUET_COMPRESSION)
+            entry.update(bytes=os.path.getsize(path), md5=file_md5(path))
+        else:
+            table, entry["schema_drift"] = unify_schema(season_df, store_schema, label=f"Season {int(season)}")
+            if not table.schema.equals(store_schema):
+                others = {name: e for name, e in manifest["partitions"].items() if name != file_name}
+                if others:
+                    print(
+                        f"  Adding {len(table.schema) - len(store_schema)} new columns and typing "
+                        f"{len(entry['schema_drift']['settled'])} null columns in {len(others)} partitions..."
+                    )
+                    _conform_partitions(others, partition_dir, table.schema)
+                store_schema = table.schema
+            entry.update(_write_table(table, path))
+            manifest["arrow_schema"] = {
+                "declared": schema_fingerprint(schema),
+                "fields": schema_to_json(store_schema),
+            }
+        manifest["partitions"][file_name] = entry
+
+    return manifest
+
+
+def manifest_seasons(manifest: Dict[str, Any]) -> List[int]:
+    return sorted(entry["season"] for entry in manifest["partitions"].values())
+
+
+def partition_is_valid(entry: Dict[str, Any], path: str, check_checksum: bool = True) -> bool:
+    """
+    Checks a local partition against its manifest entry. The size check is
+    free; the checksum reads the file bytes but never parses the Parquet.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) != entry["bytes"]:
+        return False
+    return not check_checksum or file_md5(path) == entry["md5"]
+
+
+def partitions_to_fetch(
+    manifest: Dict[str, Any], partition_dir: str = config.RAW_PBP_PARTITION_DIR
+) -> List[str]:
+    """Returns the partition file names that are missing or differ locally."""
+    return [
+        file_name for file_name, entry in sorted(manifest["partitions"].items())
+        if not partition_is_valid(entry, os.path.join(partition_dir, file_name))
+    ]
+
+
+def read_partitions(
+    partition_dir: str = config.RAW_PBP_PARTITION_DIR,
+    manifest: Optional[Dict[str, Any]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Reads the partitions listed in the manifest (optionally only some seasons
+    and columns) into a single DataFrame, ordered by season.
+    """
+    if manifest is None:
+        manifest = load_manifest(os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME))
+    wanted = set(seasons) if seasons is not None else None
+
+    frames = []
+    for file_name, entry in sorted(manifest["partitions"].items(), key=lambda item: item[1]["season"]):
+        if wanted is not None and entry["season"] not in wanted:
+            continue
+        path = os.path.join(partition_dir, file_name)
+        if not partition_is_valid(entry, path, check_checksum=False):
+            raise ValueError(f"Partition '{file_name}' is missing or does not match the manifest.")
+        frames.append(pd.read_parquet(path, columns=columns))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
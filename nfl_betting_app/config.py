@@ -14,6 +14,55 @@ RAW_PBP_DB_PATH = os.path.join(RAW_DATA_DIR, RAW_PBP_DB_FILENAME)
 RAW_PBP_PARQUET_FILENAME = "nfl_pbp_database_raw.parquet"
 RAW_PBP_PARQUET_PATH = os.path.join(RAW_DATA_DIR, RAW_PBP_PARQUET_FILENAME)
 
+# Season-partitioned PBP store. The manifest lives alongside the partitions so
+# the whole directory mirrors a single Drive folder.
+RAW_PBP_PARTITION_DIR = os.path.join(RAW_DATA_DIR, "pbp_partitions")
+RAW_PBP_MANIFEST_FILENAME = "manifest.json"
+RAW_PBP_MANIFEST_PATH = os.path.join(RAW_PBP_PARTITION_DIR, RAW_PBP_MANIFEST_FILENAME)
+# 2: partitions unified to pbp_schema.PBP_SCHEMA. Stores of older versions are rewritten on update.
+ARTIFACT_SCHEMA_VERSION = 2
+PARQUET_COMPRESSION = "zstd"
+
+# One row per game with its play offset range in the sorted store.
+GAME_INDEX_PATH = os.path.join(RAW_DATA_DIR, "game_index.parquet")
+# One row per game (played and scheduled) for consumers that never need plays.
+GAMES_PATH = os.path.join(RAW_DATA_DIR, "games.parquet")
+# Timestamped spread/total quotes per game, sorted by (game_id, timestamp) (see line_store.py).
+LINE_QUOTES_PATH = os.path.join(RAW_DATA_DIR, "line_quotes.parquet")
+
 MODEL_FEATURE_SET_PATH = os.path.join(PROCESSED_DATA_DIR, "nfl_model_features.csv")
+# Versioned, delta-encoded history of the feature set (see feature_snapshots.py).
+FEATURE_SNAPSHOT_DIR = os.path.join(PROCESSED_DATA_DIR, "feature_snapshots")
+# Versioned separately from the PBP store, so a PBP format change never invalidates the snapshot history.
+FEATURE_SNAPSHOT_SCHEMA_VERSION = 1
 
 START_YEAR = 2007
+
+TEAM_STATE_PATH = os.path.join(PROCESSED_DATA_DIR, "team_state.json")
+TEAM_STATE_SERVER_PORT = 8765
+
+ELO_STATE_PATH = os.path.join(PROCESSED_DATA_DIR, "elo_state.json")
+
+# Execution backend for the feature pipeline stages: "pandas" or "duckdb".
+FEATURE_BACKEND = "pandas"
+# DuckDB worker threads; None lets DuckDB use every core.
+DUCKDB_THREADS = None
+
+# Memory the feature pipeline may use. Above it, seasons are processed in
+# batches with intermediates spilled to Parquet. None disables batching.
+FEATURE_MEMORY_BUDGET_BYTES = 2 * 1024 ** 3
+# Where batch intermediates are spilled; None uses the system temp directory.
+FEATURE_SPILL_DIR = None
+
+PLAYER_STORE_DIR = os.path.join(PROCESSED_DATA_DIR, "player_store")
+
+# Sharded feature builds (see work_queue.py): a worker's shard lease expires
+# when its heartbeat is older than the timeout, and another worker takes over.
+WORK_QUEUE_LEASE_TIMEOUT_SECONDS = 120.0
+WORK_QUEUE_HEARTBEAT_SECONDS = 15.0
+
+# Indexed DuckDB file of team-game stats and features for fast lookups (see query_store.py).
+QUERY_STORE_PATH = os.path.join(PROCESSED_DATA_DIR, "query_store.duckdb")
+
+# Dense memory-mapped (season, week, team, feature) export of the team features (see team_tensor.py).
+TEAM_TENSOR_DIR = os.path.join(PROCESSED_DATA_DIR, "team_tensor")
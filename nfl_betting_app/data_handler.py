@@ -1,6 +1,8 @@
 import pandas as pd
 import os
+from typing import List, Optional
 import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import load_manifest, read_partitions
 
 # Specifying dtypes helps pandas read the large CSV much faster and use less memory.
 PBP_DTYPE_MAP = {
@@ -34,8 +36,13 @@ def load_raw_pbp_data() -> pd.DataFrame:
     Loads the raw play-by-play database from the local raw data folder.
     Raises FileNotFoundError if the database does not exist.
     """
-    # Prioritize loading the much faster Parquet file if it exists.
-    if os.path.exists(config.RAW_PBP_PARQUET_PATH):
+    # Prioritize the season-partitioned store described by the manifest.
+    if os.path.exists(config.RAW_PBP_MANIFEST_PATH):
+        print("Loading raw play-by-play data from local season partitions (fast)...")
+        return read_partitions(config.RAW_PBP_PARTITION_DIR, load_manifest(config.RAW_PBP_MANIFEST_PATH))
+
+    # Legacy single-file Parquet database.
+    elif os.path.exists(config.RAW_PBP_PARQUET_PATH):
         print("Loading raw play-by-play data from local Parquet file (fast)...")
         return pd.read_parquet(config.RAW_PBP_PARQUET_PATH)
 
@@ -47,6 +54,39 @@ def load_raw_pbp_data() -> pd.DataFrame:
 
     else:
         raise FileNotFoundError(
-            f"ERROR: Raw PBP database not found at '{config.RAW_PBP_DB_PATH}'. "
+            f"ERROR: Raw PBP database not found at '{config.RAW_PBP_PARTITION_DIR}'. "
+            "Please run the data_retriever.py script first to create it."
+        )
+
+
+def load_game_index() -> pd.DataFrame:
+    """
+    Loads the per-game index built at ingest time.
+    Raises FileNotFoundError if it does not exist.
+    """
+    if not os.path.exists(config.GAME_INDEX_PATH):
+        raise FileNotFoundError(
+            f"ERROR: Game index not found at '{config.GAME_INDEX_PATH}'. "
+            "Please run the data_retriever.py script first to create it."
+        )
+    return pd.read_parquet(config.GAME_INDEX_PATH)
+
+
+def load_game_table(seasons: Optional[List[int]] = None, season_type: Optional[str] = None) -> pd.DataFrame:
+    """
+    Loads the game/schedule table persisted at ingest time: one row per game
+    with its lines and result (NaN for games not yet played), without reading
+    any plays. Optionally only some seasons or one season type are read.
+    Raises FileNotFoundError if it does not exist.
+    """
+    if not os.path.exists(config.GAMES_PATH):
+        raise FileNotFoundError(
+            f"ERROR: Game table not found at '{config.GAMES_PATH}'. "
             "Please run the data_retriever.py script first to create it."
         )
+    filters = []
+    if seasons is not None:
+        filters.append(('season', 'in', list(seasons)))
+    if season_type is not None:
+        filters.append(('season_type', '==', season_type))
+    return pd.read_parquet(config.GAMES_PATH, filters=filters or None)
@@ -2,8 +2,24 @@ import pandas as pd
 import nfl_data_py as nfl
 from datetime import date, timedelta
 from tqdm import tqdm
+from typing import Optional
+import http.client
+import json
 import os
+import urllib.error
 import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import (
+    load_manifest, manifest_schema_version, manifest_seasons, new_manifest, partition_filename, read_partitions,
+    save_manifest, schedule_filename, write_partitions
+)
+from nfl_betting_app.data_handler import PBP_DTYPE_MAP
+from nfl_betting_app.pbp_schema import PBP_SCHEMA
+from nfl_betting_app.game_index import (
+    GAME_LEVEL_COLUMNS, build_game_index, build_game_table, sort_plays, write_game_index, write_game_table
+)
+
+# What a failed nflverse download raises (HTTP errors, unreachable host, timeouts).
+_NETWORK_ERRORS = (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError)
 
 
 def _get_latest_available_season() -> int:
@@ -18,19 +34,96 @@ def _get_latest_available_season() -> int:
     else:
         return today.year
 
+def _migrate_legacy_database() -> Optional[dict]:
+    """
+    Converts a legacy single-file database (Parquet or CSV) into season
+    partitions. Returns the new manifest, or None if there is nothing to migrate.
+    """
+    if os.path.exists(config.RAW_PBP_PARQUET_PATH):
+        legacy_df = pd.read_parquet(config.RAW_PBP_PARQUET_PATH)
+    elif os.path.exists(config.RAW_PBP_DB_PATH):
+        legacy_df = pd.read_csv(config.RAW_PBP_DB_PATH, dtype=PBP_DTYPE_MAP, low_memory=False)
+    else:
+        return None
+
+    print("Migrating legacy raw PBP database to season partitions...")
+    manifest = write_partitions(sort_plays(legacy_df), config.RAW_PBP_PARTITION_DIR, schema=PBP_SCHEMA)
+    save_manifest(manifest, config.RAW_PBP_MANIFEST_PATH)
+    return manifest
+
+def _upgrade_partition_store() -> dict:
+    """
+    Returns the partition manifest, first rewriting a store written with an
+    older ARTIFACT_SCHEMA_VERSION from its own partitions (one season at a
+    time, unified to PBP_SCHEMA) so no season has to be fetched again.
+    """
+    version = manifest_schema_version(config.RAW_PBP_MANIFEST_PATH)
+    if version == config.ARTIFACT_SCHEMA_VERSION:
+        return load_manifest(config.RAW_PBP_MANIFEST_PATH)
+
+    with open(config.RAW_PBP_MANIFEST_PATH) as f:
+        seasons = sorted(entry["season"] for entry in json.load(f)["partitions"].values())
+    print(f"Upgrading raw PBP partitions from schema version {version} to {config.ARTIFACT_SCHEMA_VERSION}...")
+    manifest = new_manifest()
+    for season in tqdm(seasons, desc="Rewriting PBP partitions"):
+        season_df = pd.read_parquet(os.path.join(config.RAW_PBP_PARTITION_DIR, partition_filename(season)))
+        manifest = write_partitions(season_df, config.RAW_PBP_PARTITION_DIR, manifest, schema=PBP_SCHEMA)
+    save_manifest(manifest, config.RAW_PBP_MANIFEST_PATH)
+    return manifest
+
+def _fetch_schedules(years) -> Optional[pd.DataFrame]:
+    """
+    Fetches the nflverse schedules for the given years, or returns None if
+    the download fails.
+    """
+    years = list(years)
+    try:
+        return nfl.import_schedules(years=years)
+    except _NETWORK_ERRORS as e:
+        print(f"Warning: could not fetch schedules for {years} ({type(e).__name__}: {e}).")
+        return None
+
+def _update_schedules(seasons) -> Optional[pd.DataFrame]:
+    """
+    Returns the schedules of the given seasons, cached per season next to the
+    play partitions. Only seasons without a cached schedule and the latest
+    season (whose upcoming games and lines still change) are fetched; a
+    failed fetch falls back to the cached copy. Returns None if no season
+    has a schedule, in which case the game table comes from the plays alone.
+    """
+    def schedule_path(season: int) -> str:
+        return os.path.join(config.RAW_PBP_PARTITION_DIR, schedule_filename(season))
+
+    seasons = sorted(seasons)
+    stale = [season for season in seasons if season == seasons[-1] or not os.path.exists(schedule_path(season))]
+    fetched = _fetch_schedules(stale) if stale else None
+    if fetched is not None:
+        for season, season_df in fetched.groupby('season'):
+            if season in stale:
+                season_df.to_parquet(schedule_path(season), index=False, compression=config.PARQUET_COMPRESSION)
+
+    cached = [schedule_path(season) for season in seasons if os.path.exists(schedule_path(season))]
+    if not cached:
+        print("Warning: no schedules are available. Building the game table from PBP only.")
+        return None
+    return pd.concat([pd.read_parquet(path) for path in cached], ignore_index=True)
+
 def update_raw_pbp_data() -> None:
     """
     Maintains and updates the local RAW database of play-by-play data.
+    The database is stored as one zstd Parquet partition per season plus a manifest.
     """
-    os.makedirs(config.RAW_DATA_DIR, exist_ok=True)
+    os.makedirs(config.RAW_PBP_PARTITION_DIR, exist_ok=True)
     latest_season = _get_latest_available_season()
-    
+
     years_to_fetch = []
-    existing_df = None
+    if os.path.exists(config.RAW_PBP_MANIFEST_PATH):
+        manifest = _upgrade_partition_store()
+    else:
+        manifest = _migrate_legacy_database()
 
-    if os.path.exists(config.RAW_PBP_DB_PATH):
-        existing_df = pd.read_csv(config.RAW_PBP_DB_PATH, low_memory=False)
-        last_year_in_db = int(existing_df["season"].max())
+    if manifest is not None and manifest["partitions"]:
+        last_year_in_db = manifest_seasons(manifest)[-1]
         if last_year_in_db < latest_season:
             print(
                 f"Raw PBP DB is outdated. Last season: {last_year_in_db}. Fetching new raw data..."
@@ -43,17 +136,32 @@ def update_raw_pbp_data() -> None:
         years_to_fetch = range(config.START_YEAR, latest_season + 1)
 
     if years_to_fetch:
-        all_new_data = [nfl.import_pbp_data(years=[year]) for year in tqdm(years_to_fetch, desc="Fetching PBP data by year")]
-        
-        new_data_df = pd.concat(all_new_data, ignore_index=True)
-        final_df = pd.concat([existing_df, new_data_df], ignore_index=True) if existing_df is not None else new_data_df
+        # Each season is written as its own partition, so only one season is held in memory at a time.
+        # Every season is unified to PBP_SCHEMA first, so columns nflverse added or retyped over
+        # the years never leave the partitions with different schemas.
+        for year in tqdm(years_to_fetch, desc="Fetching PBP data by year"):
+            season_df = sort_plays(nfl.import_pbp_data(years=[year]))
+            manifest = write_partitions(season_df, config.RAW_PBP_PARTITION_DIR, manifest, schema=PBP_SCHEMA)
+
+        print("Saving updated partition manifest...")
+        save_manifest(manifest, config.RAW_PBP_MANIFEST_PATH)
+
+    if years_to_fetch or not os.path.exists(config.GAME_INDEX_PATH):
+        # Only the game-level columns are read, so this is cheap even for the full history.
+        print("Building game index...")
+        index_source_df = read_partitions(config.RAW_PBP_PARTITION_DIR, manifest, columns=GAME_LEVEL_COLUMNS)
+        game_index = build_game_index(index_source_df)
+        write_game_index(game_index, config.GAME_INDEX_PATH)
+    else:
+        game_index = pd.read_parquet(config.GAME_INDEX_PATH)
 
-        print("Saving updated data to CSV and Parquet formats...")
-        final_df.to_csv(config.RAW_PBP_DB_PATH, index=False)
-        final_df.to_parquet(config.RAW_PBP_PARQUET_PATH, index=False)
+    # The schedule adds upcoming games and their latest lines, so the latest season's is refreshed on every update.
+    print("Building game table...")
+    schedules_df = _update_schedules(manifest_seasons(manifest))
+    write_game_table(build_game_table(game_index, schedules_df), config.GAMES_PATH)
 
     print(
-        f"Raw PBP database is up to date. Location: {config.RAW_PBP_DB_PATH}"
+        f"Raw PBP database is up to date. Location: {config.RAW_PBP_PARTITION_DIR}"
     )
 
 if __name__ == "__main__":
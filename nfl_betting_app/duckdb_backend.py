@@ -0,0 +1,213 @@
+# nfl_betting_app/duckdb_backend.py
+# In-process DuckDB implementation of the feature pipeline stages. Each stage
+# is a single multi-threaded SQL query whose output matches the pandas stage.
+import os
+from typing import List, Optional, Union
+
+import duckdb
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.feature_engineering import STATS_TO_CALCULATE, ROLLING_WINDOWS
+
+# Offensive stats per team-game; each also has an '_allowed' twin read from the opponent.
+_OFFENCE_STATS = [stat for stat in STATS_TO_CALCULATE if not stat.endswith('_allowed')]
+_GAME_COLS = ['game_id', 'season', 'week', 'home_team', 'away_team', 'spread_line', 'total_line', 'result']
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _yards_sum(col: str) -> str:
+    # Missing yardage counts as 0, as in `sum_offense_stat_for_team`.
+    return f"coalesce(sum({col}), 0.0)"
+
+
+def _rate(successes: str, failures: str) -> str:
+    return f"CASE WHEN {successes} + {failures} > 0 THEN {successes} / ({successes} + {failures}) ELSE 0.0 END"
+
+
+class DuckDBBackend:
+    """
+    Runs the team-stats, rolling and merge stages as DuckDB queries.
+
+    Wherever the pandas backend takes `pbp_df`, this backend also accepts the
+    path of the season partition directory, which DuckDB scans directly
+    without loading the plays into pandas.
+    """
+    name = 'duckdb'
+
+    def __init__(self, threads: Optional[int] = config.DUCKDB_THREADS):
+        self.con = duckdb.connect(config={'threads': threads} if threads else {})
+
+    def _register_pbp(self, pbp_df: Union[pd.DataFrame, str]) -> None:
+        if isinstance(pbp_df, str):
+            if not os.path.isdir(pbp_df):
+                raise FileNotFoundError(f"Partition directory '{pbp_df}' does not exist.")
+            pattern = os.path.join(pbp_df, 'pbp_*.parquet').replace("'", "''")
+            self.con.execute(f"CREATE OR REPLACE TEMP VIEW pbp AS SELECT * FROM read_parquet('{pattern}')")
+        else:
+            self.con.register('pbp', pbp_df)
+
+    def team_game_stats(
+        self, pbp_df: Union[pd.DataFrame, str], season_type: str, game_index: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Calculates one row per team per game, like `_calculate_team_game_stats`.
+        The game index is not needed: the plays are grouped inside DuckDB.
+        """
+        print(f"  Step A: Calculating team-level stats for {season_type} games with DuckDB...")
+        self._register_pbp(pbp_df)
+
+        offence = ',\n'.join(f"coalesce(o.{stat}, 0.0) AS {stat}" for stat in _OFFENCE_STATS)
+        allowed = ',\n'.join(
+            f"coalesce(d.{stat}, 0.0) AS {stat}_allowed" for stat in _OFFENCE_STATS
+            if f'{stat}_allowed' in STATS_TO_CALCULATE
+        )
+        query = f"""
+            WITH plays AS (
+                SELECT *,
+                    CASE
+                        WHEN pass_touchdown = 1 THEN 'passing'
+                        WHEN rush_touchdown = 1 THEN 'rushing'
+                        WHEN return_touchdown = 1 AND (interception = 1 OR fumble_lost = 1) THEN 'defence'
+                        WHEN return_touchdown = 1 THEN 'special_teams'
+                    END AS td_type
+                FROM pbp
+                WHERE season_type = $season_type AND posteam IS NOT NULL
+            ),
+            games AS (
+                SELECT game_id, first(season) AS season, first(week) AS week,
+                    first(home_team) AS home_team, first(away_team) AS away_team
+                FROM plays GROUP BY game_id
+            ),
+            sides AS (
+                SELECT game_id, season, week, home_team AS team, away_team AS opponent, 0 AS side FROM games
+                UNION ALL
+                SELECT game_id, season, week, away_team AS team, home_team AS opponent, 1 AS side FROM games
+            ),
+            posteam_stats AS (
+                SELECT game_id, posteam AS team,
+                    {_yards_sum('rushing_yards')} AS rushing_yards,
+                    {_yards_sum('passing_yards')} AS passing_yards,
+                    sum(CASE WHEN down = 3 THEN third_down_converted ELSE 0 END) AS third_s,
+                    sum(CASE WHEN down = 3 THEN third_down_failed ELSE 0 END) AS third_f,
+                    sum(CASE WHEN down = 4 THEN fourth_down_converted ELSE 0 END) AS fourth_s,
+                    sum(CASE WHEN down = 4 THEN fourth_down_failed ELSE 0 END) AS fourth_f
+                FROM plays GROUP BY game_id, posteam
+            ),
+            td_stats AS (
+                SELECT game_id, td_team AS team,
+                    count(*) FILTER (WHERE td_type = 'passing')::DOUBLE AS passing_tds,
+                    count(*) FILTER (WHERE td_type = 'rushing')::DOUBLE AS rushing_tds,
+                    count(*) FILTER (WHERE td_type = 'defence')::DOUBLE AS defence_tds,
+                    count(*) FILTER (WHERE td_type = 'special_teams')::DOUBLE AS special_teams_tds
+                FROM plays WHERE td_type IS NOT NULL AND td_team IS NOT NULL
+                GROUP BY game_id, td_team
+            ),
+            team_stats AS (
+                SELECT s.*,
+                    t.passing_tds, t.rushing_tds, t.defence_tds, t.special_teams_tds,
+                    p.rushing_yards, p.passing_yards,
+                    {_rate('p.third_s', 'p.third_f')} AS third_down_conv_rate,
+                    {_rate('p.fourth_s', 'p.fourth_f')} AS fourth_down_conv_rate
+                FROM sides s
+                LEFT JOIN posteam_stats p ON p.game_id = s.game_id AND p.team = s.team
+                LEFT JOIN td_stats t ON t.game_id = s.game_id AND t.team = s.team
+            )
+            SELECT o.team, o.opponent,
+                {offence},
+                {allowed},
+                o.game_id, o.season, o.week
+            FROM team_stats o
+            JOIN team_stats d ON d.game_id = o.game_id AND d.team = o.opponent
+            ORDER BY o.game_id, o.side
+        """
+        return self.con.execute(query, {'season_type': season_type}).df()
+
+    def rolling_averages(
+        self,
+        team_game_stats_df: pd.DataFrame,
+        stat_cols: Optional[List[str]] = None,
+        windows: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Calculates the shifted expanding and rolling averages with window
+        functions, like `_calculate_rolling_averages`.
+        """
+        print("  Step B: Calculating point-in-time rolling averages with DuckDB...")
+        stat_cols = stat_cols if stat_cols is not None else STATS_TO_CALCULATE
+        windows = windows if windows is not None else ROLLING_WINDOWS
+        self.con.register('team_game_stats', team_game_stats_df)
+
+        features = []
+        for col in stat_cols:
+            features.append(f"coalesce(avg({_quote(col)}) OVER season_to_date, 0) AS {_quote(f'avg_{col}')}")
+            for window in windows:
+                features.append(
+                    f"coalesce(avg({_quote(col)}) OVER (PARTITION BY team, season ORDER BY week "
+                    f"ROWS BETWEEN {window} PRECEDING AND 1 PRECEDING), 0) AS {_quote(f'l{window}_{col}')}"
+                )
+        # pandas averages skip NaN, but DuckDB's avg returns NaN if any input is
+        # NaN (frames backed by Arrow keep NaN distinct from NULL), so NaN is
+        # read as NULL, which avg skips.
+        as_null = ', '.join(f"nullif({_quote(col)}, 'NaN'::DOUBLE) AS {_quote(col)}" for col in stat_cols)
+        # The pandas stage fills every remaining NaN (including raw stats) with 0.
+        replaced = ', '.join(f"coalesce({_quote(col)}, 0) AS {_quote(col)}" for col in stat_cols)
+        query = f"""
+            SELECT * REPLACE ({replaced}), {', '.join(features)}
+            FROM (SELECT * REPLACE ({as_null}) FROM team_game_stats)
+            WINDOW season_to_date AS (
+                PARTITION BY team, season ORDER BY week ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+            )
+            ORDER BY team, season, week
+        """
+        return self.con.execute(query).df()
+
+    def merge_features(
+        self,
+        pbp_df: Union[pd.DataFrame, str],
+        point_in_time_stats_df: pd.DataFrame,
+        game_index: Optional[pd.DataFrame] = None,
+        ratings_df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Joins home and away features to one row per played game, like `_merge_features_to_games`.
+        """
+        print("  Step C: Merging point-in-time stats to game-level data with DuckDB...")
+        feature_cols = [col for col in point_in_time_stats_df.columns if col.startswith(('avg_', 'l'))]
+        self.con.register('point_in_time_stats', point_in_time_stats_df)
+        features_query = f"SELECT game_id, team, {', '.join(_quote(col) for col in feature_cols)} FROM point_in_time_stats"
+        if ratings_df is not None:
+            rating_cols = [col for col in ratings_df.columns if col.startswith('rtg_')]
+            self.con.register('ratings', ratings_df)
+            features_query = f"""
+                SELECT f.*, {', '.join('r.' + _quote(col) for col in rating_cols)}
+                FROM ({features_query}) f
+                LEFT JOIN ratings r ON r.game_id = f.game_id AND r.team = f.team
+            """
+            feature_cols += rating_cols
+
+        if game_index is not None:
+            self.con.register('games_source', game_index)
+        else:
+            self._register_pbp(pbp_df)
+            self.con.execute("CREATE OR REPLACE TEMP VIEW games_source AS SELECT * FROM pbp")
+
+        side_cols = [
+            f"{side[0]}.{_quote(col)} AS {_quote(f'{side}_{col}')}" for side in ['home', 'away'] for col in feature_cols
+        ]
+        query = f"""
+            WITH games AS (
+                SELECT DISTINCT ON (game_id) {', '.join(_GAME_COLS)}
+                FROM games_source WHERE result IS NOT NULL
+            ),
+            features AS ({features_query})
+            SELECT g.*, {', '.join(side_cols)}
+            FROM games g
+            LEFT JOIN features h ON h.game_id = g.game_id AND h.team = g.home_team
+            LEFT JOIN features a ON a.game_id = g.game_id AND a.team = g.away_team
+            ORDER BY g.game_id
+        """
+        return self.con.execute(query).df()
@@ -0,0 +1,281 @@
+# nfl_betting_app/elo.py
+# Elo-style margin-of-victory ratings over the game table, plus a sweep that
+# scores many K-factor / home-advantage settings in one pass.
+import json
+import os
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import nfl_betting_app.config as config
+
+ELO_INITIAL_RATING = 1500.0
+ELO_K_FACTOR = 20.0
+ELO_HOME_ADVANTAGE = 48.0
+# Share of each rating's distance from the mean removed at a new season.
+ELO_SEASON_REVERSION = 1 / 3
+# Elo points per point of margin, used to turn a rating gap into a spread.
+ELO_POINTS_PER_MARGIN_POINT = 25.0
+
+GAME_COLUMNS = ['game_id', 'season', 'week', 'home_team', 'away_team', 'result']
+
+
+def win_probability(rating_diff: np.ndarray) -> np.ndarray:
+    """Home win probability for a home-minus-away rating gap (home advantage included)."""
+    return 1.0 / (1.0 + 10.0 ** (-rating_diff / 400.0))
+
+
+def _mov_multiplier(margin: np.ndarray, winner_diff: np.ndarray) -> np.ndarray:
+    """
+    Scales updates by the margin of victory, damped when the favourite wins so
+    ratings do not run away (ties give no update).
+    """
+    return np.log(np.abs(margin) + 1.0) * 2.2 / (winner_diff * 0.001 + 2.2)
+
+
+def _play_week(
+    ratings: np.ndarray, home: np.ndarray, away: np.ndarray, margin: np.ndarray,
+    k_factor: Any, home_advantage: Any
+) -> np.ndarray:
+    """
+    Plays one week of games in place and returns the pre-game rating gaps.
+
+    `ratings` has the team axis last, so the same code updates one rating
+    vector or a whole grid of settings (with `k_factor` and `home_advantage`
+    broadcast against the leading axes). Games without a result (NaN margin)
+    do not change the ratings.
+    """
+    diff = ratings[..., home] - ratings[..., away] + home_advantage
+    played = ~np.isnan(margin)
+    margin = np.where(played, margin, 0.0)
+    actual = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+    winner_diff = np.where(margin >= 0, diff, -diff)
+    delta = k_factor * _mov_multiplier(margin, winner_diff) * (actual - win_probability(diff)) * played
+    ratings[..., home] += delta
+    ratings[..., away] -= delta
+    return diff
+
+
+def _sorted_games(games_df: pd.DataFrame) -> pd.DataFrame:
+    missing = [col for col in GAME_COLUMNS if col not in games_df.columns]
+    if missing:
+        raise ValueError(f"Games are missing columns: {missing}")
+    return games_df.sort_values(['season', 'week', 'game_id']).reset_index(drop=True)
+
+
+def _week_batches(games: pd.DataFrame) -> Iterator[Tuple[int, int, slice]]:
+    """
+    Yields (season, week, rows) for each week of the sorted games. A team may
+    only play once per week because a week's games are updated together.
+    """
+    keys = games['season'].to_numpy() * 100 + games['week'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    stops = np.r_[starts[1:], len(games)]
+    for start, stop in zip(starts, stops):
+        week = games.iloc[start:stop]
+        teams = pd.concat([week['home_team'], week['away_team']])
+        if teams.duplicated().any():
+            raise ValueError(
+                f"Teams {sorted(teams[teams.duplicated()].unique())} play more than once in "
+                f"season {week['season'].iloc[0]} week {week['week'].iloc[0]}."
+            )
+        yield int(week['season'].iloc[0]), int(week['week'].iloc[0]), slice(start, stop)
+
+
+class EloRatings:
+    """
+    Chronological Elo ratings held in one array indexed by team code.
+
+    `process_games` emits each game's pre-game ratings before applying its
+    result, so the output is leak-free, and can be called again with later
+    weeks to continue from the current state without replaying history.
+    """
+
+    def __init__(
+        self,
+        k_factor: float = ELO_K_FACTOR,
+        home_advantage: float = ELO_HOME_ADVANTAGE,
+        season_reversion: float = ELO_SEASON_REVERSION,
+        initial_rating: float = ELO_INITIAL_RATING
+    ):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.season_reversion = season_reversion
+        self.initial_rating = initial_rating
+        self.teams: List[str] = []
+        self.ratings = np.empty(0)
+        self.season = None
+        # (season, week) of the last week whose games all have results
+        # applied, and the games applied since then from a partly played week.
+        self.last_week = None
+        self.applied_games: set = set()
+        self._codes: Dict[str, int] = {}
+
+    def _team_codes(self, teams: pd.Series) -> np.ndarray:
+        new_teams = [team for team in pd.unique(teams) if team not in self._codes]
+        for team in new_teams:
+            self._codes[team] = len(self.teams)
+            self.teams.append(team)
+        if new_teams:
+            self.ratings = np.r_[self.ratings, np.full(len(new_teams), self.initial_rating)]
+        return teams.map(self._codes).to_numpy()
+
+    def _start_season(self, season: int) -> None:
+        if self.season is not None and season != self.season:
+            self.ratings = self.initial_rating + (self.ratings - self.initial_rating) * (1 - self.season_reversion)
+        self.season = season
+
+    def rating(self, team: str) -> float:
+        return float(self.ratings[self._codes[team]])
+
+    def process_games(self, games_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rates games in chronological order and applies their results.
+
+        Args:
+            games_df: One row per game with GAME_COLUMNS (e.g. the game index).
+                      `result` is the home margin; unplayed games (NaN) are
+                      rated but leave the ratings unchanged, so a week can be
+                      fed again once its remaining games are played.
+
+        Returns:
+            The games with home_elo, away_elo, elo_diff (home advantage
+            included), elo_home_win_prob and elo_spread (predicted home margin).
+
+        Raises:
+            ValueError: If a game falls in or before the last fully played week,
+                        or its result has already been applied.
+        """
+        games = _sorted_games(games_df)
+        if self.last_week is not None and len(games):
+            first = (int(games['season'].iloc[0]), int(games['week'].iloc[0]))
+            if first <= self.last_week:
+                raise ValueError(
+                    f"Games from season {first[0]} week {first[1]} are not after the last "
+                    f"processed week {self.last_week}."
+                )
+        reapplied = sorted(set(games['game_id']) & self.applied_games)
+        if reapplied:
+            raise ValueError(f"Games {reapplied} already have their results applied.")
+
+        home = self._team_codes(games['home_team'])
+        away = self._team_codes(games['away_team'])
+        margin = games['result'].to_numpy(dtype=float)
+        home_elo = np.empty(len(games))
+        away_elo = np.empty(len(games))
+        diff = np.empty(len(games))
+
+        for season, week, rows in _week_batches(games):
+            self._start_season(season)
+            home_elo[rows] = self.ratings[home[rows]]
+            away_elo[rows] = self.ratings[away[rows]]
+            diff[rows] = _play_week(
+                self.ratings, home[rows], away[rows], margin[rows], self.k_factor, self.home_advantage
+            )
+            if np.isnan(margin[rows]).any():
+                self.applied_games.update(games['game_id'].iloc[rows][~np.isnan(margin[rows])])
+            else:
+                self.last_week = (season, week)
+                self.applied_games.clear()
+
+        result = games[['game_id', 'season', 'week', 'home_team', 'away_team']].copy()
+        result['home_elo'] = home_elo
+        result['away_elo'] = away_elo
+        result['elo_diff'] = diff
+        result['elo_home_win_prob'] = win_probability(diff)
+        result['elo_spread'] = diff / ELO_POINTS_PER_MARGIN_POINT
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'k_factor': self.k_factor,
+            'home_advantage': self.home_advantage,
+            'season_reversion': self.season_reversion,
+            'initial_rating': self.initial_rating,
+            'season': self.season,
+            'last_week': list(self.last_week) if self.last_week is not None else None,
+            'applied_games': sorted(self.applied_games),
+            'ratings': dict(zip(self.teams, self.ratings.tolist())),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EloRatings':
+        elo = cls(data['k_factor'], data['home_advantage'], data['season_reversion'], data['initial_rating'])
+        elo.teams = list(data['ratings'])
+        elo._codes = {team: code for code, team in enumerate(elo.teams)}
+        elo.ratings = np.array(list(data['ratings'].values()), dtype=float)
+        elo.season = data['season']
+        elo.last_week = tuple(data['last_week']) if data['last_week'] is not None else None
+        elo.applied_games = set(data.get('applied_games', []))
+        return elo
+
+    def save(self, path: str = config.ELO_STATE_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str = config.ELO_STATE_PATH) -> 'EloRatings':
+        """
+        Loads saved ratings. Raises FileNotFoundError if they do not exist.
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def sweep_elo(
+    games_df: pd.DataFrame,
+    k_factors: Sequence[float],
+    home_advantages: Sequence[float],
+    season_reversion: float = ELO_SEASON_REVERSION,
+    initial_rating: float = ELO_INITIAL_RATING
+) -> Dict[str, np.ndarray]:
+    """
+    Runs the rating engine for every K-factor / home-advantage pair at once.
+
+    The ratings of all settings are held in one (k, home_advantage, team)
+    array, so each week is a handful of array operations regardless of how
+    many settings are evaluated. Only games with a result are scored.
+
+    Returns:
+        A dict of (len(k_factors), len(home_advantages)) arrays:
+            log_loss: Mean log loss of the pre-game home win probability.
+            brier: Mean Brier score of the same probability.
+            ats_accuracy: Share of games where the Elo spread picked the side
+                          that covered `spread_line` (pushes and games without
+                          a line are excluded). Requires a spread_line column.
+    """
+    games = _sorted_games(games_df)
+    codes, teams = pd.factorize(pd.concat([games['home_team'], games['away_team']], ignore_index=True))
+    home, away = codes[:len(games)], codes[len(games):]
+    margin = games['result'].to_numpy(dtype=float)
+
+    k = np.asarray(k_factors, dtype=float)[:, None, None]
+    advantage = np.asarray(home_advantages, dtype=float)[None, :, None]
+    ratings = np.full((k.shape[0], advantage.shape[1], len(teams)), initial_rating)
+    diffs = np.empty((k.shape[0], advantage.shape[1], len(games)))
+
+    previous_season = None
+    for season, _, rows in _week_batches(games):
+        if previous_season is not None and season != previous_season:
+            ratings = initial_rating + (ratings - initial_rating) * (1 - season_reversion)
+        previous_season = season
+        diffs[..., rows] = _play_week(ratings, home[rows], away[rows], margin[rows], k, advantage)
+
+    played = ~np.isnan(margin)
+    probability = np.clip(win_probability(diffs[..., played]), 1e-12, 1 - 1e-12)
+    actual = np.where(margin[played] > 0, 1.0, np.where(margin[played] < 0, 0.0, 0.5))
+    results = {
+        'log_loss': -np.mean(actual * np.log(probability) + (1 - actual) * np.log(1 - probability), axis=-1),
+        'brier': np.mean((probability - actual) ** 2, axis=-1),
+    }
+
+    if 'spread_line' in games.columns:
+        spread = games['spread_line'].to_numpy(dtype=float)
+        graded = played & ~np.isnan(spread) & (margin != spread)
+        home_covered = margin[graded] > spread[graded]
+        picked_home = diffs[..., graded] / ELO_POINTS_PER_MARGIN_POINT > spread[graded]
+        results['ats_accuracy'] = np.mean(picked_home == home_covered, axis=-1)
+
+    return results
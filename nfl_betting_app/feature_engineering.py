@@ -1,13 +1,28 @@
 # nfl_betting_app/feature_engineering.py
 # This module is responsible for processing the raw data and creating
 # the final feature set for the model.
-from typing import Dict, Union
+import gc
+import os
+from dataclasses import dataclass
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import load_manifest, read_partitions
+from nfl_betting_app.game_index import GAME_LEVEL_COLUMNS, build_game_index, iter_game_columns
+from nfl_betting_app.memory_budget import (
+    PIPELINE_MEMORY_FACTOR, StageMemoryTracker, frame_season_bytes, partition_season_bytes, plan_season_batches
+)
+from nfl_betting_app.ratings import calculate_weekly_ratings
+
 # Import the analysis library components
 from nfl_betting_app.nfl_pbp_analysis import (
     game_from_single_game_dataframe,
+    game_from_columns,
     passing_touchdowns,
     rushing_touchdowns,
     defence_touchdowns,
@@ -16,7 +31,12 @@ from nfl_betting_app.nfl_pbp_analysis import (
     calculate_passing_yards_per_game,
     third_down_conversion_rate,
     fourth_down_conversion_rate,
-    TeamSide, Game,
+    TeamSide, Game, GameAccumulator,
+    validate_pbp_frame,
+    calculate_split_stats,
+    pivot_split_stats,
+    calculate_drive_stats,
+    DRIVE_STATS,
     passing_touchdowns_allowed,
     rushing_touchdowns_allowed,
     calculate_rushing_yards_allowed_per_game,
@@ -24,6 +44,7 @@ from nfl_betting_app.nfl_pbp_analysis import (
     third_down_conversion_rate_allowed,
     fourth_down_conversion_rate_allowed
 )
+from nfl_betting_app.nfl_pbp_analysis.pbp_data_models_factories import REQUIRED_COLS
 
 STATS_TO_CALCULATE = [
     # Offensive Stats
@@ -63,73 +84,173 @@ def _get_all_stats_for_game(game: Game) -> Dict[str, Dict[TeamSide, Union[float,
         'fourth_down_conv_rate_allowed': fourth_down_conversion_rate_allowed(game),
     }
 
-def _calculate_team_game_stats(pbp_df: pd.DataFrame, season_type: str) -> pd.DataFrame:
+# The analysis function behind each stat, by name (see GameAccumulator.snapshot).
+STAT_FUNCTION_NAMES = {
+    'passing_tds': 'passing_touchdowns',
+    'rushing_tds': 'rushing_touchdowns',
+    'defence_tds': 'defence_touchdowns',
+    'special_teams_tds': 'special_teams_touchdowns',
+    'rushing_yards': 'calculate_rushing_yards_per_game',
+    'passing_yards': 'calculate_passing_yards_per_game',
+    'third_down_conv_rate': 'third_down_conversion_rate',
+    'fourth_down_conv_rate': 'fourth_down_conversion_rate',
+    'passing_tds_allowed': 'passing_touchdowns_allowed',
+    'rushing_tds_allowed': 'rushing_touchdowns_allowed',
+    'rushing_yards_allowed': 'calculate_rushing_yards_allowed_per_game',
+    'passing_yards_allowed': 'calculate_passing_yards_allowed_per_game',
+    'third_down_conv_rate_allowed': 'third_down_conversion_rate_allowed',
+    'fourth_down_conv_rate_allowed': 'fourth_down_conversion_rate_allowed',
+}
+
+def _get_all_stats_for_accumulator(accumulator: GameAccumulator) -> Dict[str, Dict[TeamSide, Union[float, int]]]:
+    """
+    Same as `_get_all_stats_for_game`, read from a live game's running totals
+    instead of rescanning its plays.
+    """
+    snapshot = accumulator.snapshot()
+    return {stat: snapshot[name] for stat, name in STAT_FUNCTION_NAMES.items()}
+
+def _team_rows_for_game(game: Game, season: int, week: int) -> List[Dict]:
+    """
+    Runs the analysis library on one game and returns its home and away rows.
+    """
+    all_stats = _get_all_stats_for_game(game)
+
+    # Structure the results for home and away teams
+    home_stats = {
+        'team': game.home_team, 'opponent': game.away_team,
+        **{stat_name: stats[TeamSide.HOME] for stat_name, stats in all_stats.items()}
+    }
+
+    away_stats = {
+        'team': game.away_team, 'opponent': game.home_team,
+        **{stat_name: stats[TeamSide.AWAY] for stat_name, stats in all_stats.items()}
+    }
+
+    # Add game identifiers to each record
+    for stats in [home_stats, away_stats]:
+        stats['game_id'] = game.game_id
+        stats['season'] = season
+        stats['week'] = week
+
+    return [home_stats, away_stats]
+
+def _calculate_team_game_stats(
+    pbp_df: pd.DataFrame, season_type: str, game_index: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Calculates team-level stats for each game from the PBP data for a specific season type.
     The output is a DataFrame with one row per team, per game.
+
+    When a game index is given, `pbp_df` must be the sorted store it was built
+    from; each game is then read as column views at its offsets instead of
+    being grouped and copied.
     """
+    game_stats = []
+
+    if game_index is not None:
+        # Validate the whole frame once so games can be built without per-play validation.
+        validate_pbp_frame(pbp_df).raise_if_invalid()
+
+        games = game_index[game_index['season_type'] == season_type]
+        print(f"  Step A: Calculating team-level stats for {len(games)} {season_type} games...")
+
+        play_columns = [col for col in REQUIRED_COLS if col not in ('game_id', 'home_team', 'away_team')]
+        # Plays with no posteam are filtered out once for the whole frame, so
+        # each game is a contiguous slice of the kept plays.
+        has_posteam = pd.notna(pbp_df['posteam']).to_numpy()
+        game_columns = iter_game_columns(pbp_df, games, play_columns, keep=has_posteam)
+        for game_row, columns in tqdm(game_columns, total=len(games), desc=f"Processing {season_type} Games"):
+            if len(columns['posteam']) == 0:
+                continue
+            game = game_from_columns(
+                game_row.game_id, game_row.home_team, game_row.away_team, columns, validate=False
+            )
+            game_stats.extend(_team_rows_for_game(game, game_row.season, game_row.week))
+
+        return pd.DataFrame(game_stats)
+
     # Filter for the specified season type and drop plays with no posteam.
     pbp_df_filtered = pbp_df[
         (pbp_df['season_type'] == season_type) & (pbp_df['posteam'].notna())
-    ].copy()
+    ]
 
     print(f"  Step A: Calculating team-level stats for {pbp_df_filtered['game_id'].nunique()} {season_type} games...")
 
-    game_stats = []
-
     # Group by game_id and iterate
     for game_id, game_df in tqdm(pbp_df_filtered.groupby('game_id'), desc=f"Processing {season_type} Games"):
         game = game_from_single_game_dataframe(game_df)
-        all_stats = _get_all_stats_for_game(game)
+        game_stats.extend(_team_rows_for_game(game, game_df['season'].iloc[0], game_df['week'].iloc[0]))
 
-        # Structure the results for home and away teams
-        home_stats = {
-            'team': game.home_team, 'opponent': game.away_team,
-            **{stat_name: stats[TeamSide.HOME] for stat_name, stats in all_stats.items()}
-        }
-
-        away_stats = {
-            'team': game.away_team, 'opponent': game.home_team,
-            **{stat_name: stats[TeamSide.AWAY] for stat_name, stats in all_stats.items()}
-        }
-
-        # Add game identifiers to each record
-        for stats in [home_stats, away_stats]:
-            stats['game_id'] = game_id
-            stats['season'] = game_df['season'].iloc[0]
-            stats['week'] = game_df['week'].iloc[0]
+    return pd.DataFrame(game_stats)
 
-        game_stats.extend([home_stats, away_stats])
+def _add_split_stats(
+    team_game_stats_df: pd.DataFrame, pbp_df: pd.DataFrame, season_type: str, splits: List[str]
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Adds situational split stats (e.g. red-zone TD rate, per-quarter yards) as
+    extra team-game columns. Returns the extended DataFrame and the new column names.
+    """
+    print(f"  Step A2: Calculating split stats for {', '.join(splits)}...")
+    split_wide = pivot_split_stats(
+        calculate_split_stats(pbp_df[pbp_df['season_type'] == season_type], splits=splits)
+    )
+    split_cols = [col for col in split_wide.columns if col not in ('game_id', 'team')]
+
+    df = team_game_stats_df.merge(split_wide, on=['game_id', 'team'], how='left')
+    df[split_cols] = df[split_cols].fillna(0.0)
+    return df, split_cols
+
+def _add_drive_stats(
+    team_game_stats_df: pd.DataFrame, pbp_df: pd.DataFrame, season_type: str
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Adds per-drive efficiency (points, yards and plays per drive, TD drive
+    rate, and their allowed twins) as extra team-game columns. Returns the
+    extended DataFrame and the new column names.
+    """
+    print("  Step A3: Calculating drive stats...")
+    drive_stats = calculate_drive_stats(pbp_df[pbp_df['season_type'] == season_type])
 
-    return pd.DataFrame(game_stats)
+    df = team_game_stats_df.merge(drive_stats[['game_id', 'team'] + DRIVE_STATS], on=['game_id', 'team'], how='left')
+    df[DRIVE_STATS] = df[DRIVE_STATS].fillna(0.0)
+    return df, list(DRIVE_STATS)
 
-def _calculate_rolling_averages(team_game_stats_df: pd.DataFrame) -> pd.DataFrame:
+def _calculate_rolling_averages(
+    team_game_stats_df: pd.DataFrame, stat_cols: Optional[List[str]] = None, windows: Optional[List[int]] = None
+) -> pd.DataFrame:
     """
     Calculates point-in-time rolling and expanding averages for all stats.
 
     This function takes the team-game-level stats and computes rolling and
     expanding averages, shifting the results to prevent data leakage.
+
+    Args:
+        stat_cols: The stat columns to average. Defaults to STATS_TO_CALCULATE.
+        windows: The rolling window sizes (in games). Defaults to ROLLING_WINDOWS.
     """
     print("  Step B: Calculating point-in-time rolling averages...")
+    stat_cols = stat_cols if stat_cols is not None else STATS_TO_CALCULATE
+    windows = windows if windows is not None else ROLLING_WINDOWS
 
     # Sort values to ensure chronological order for rolling calculations
-    df = team_game_stats_df.sort_values(by=['team', 'season', 'week']).copy()
+    df = team_game_stats_df.sort_values(by=['team', 'season', 'week'])
 
     # --- Calculate Rolling and Expanding Averages ---
-    feature_cols = []
-    for col in tqdm(STATS_TO_CALCULATE, desc="Calculating Averages"):
+    # Collected first and added in one concat: inserting hundreds of columns
+    # one at a time fragments the frame.
+    features = {}
+    for col in tqdm(stat_cols, desc="Calculating Averages"):
         # Calculate expanding average (season-to-date)
-        expanding_avg_col = f'avg_{col}'
         expanding_avg = df.groupby(['team', 'season'])[col].expanding().mean()
-        df[expanding_avg_col] = expanding_avg.reset_index(level=[0, 1], drop=True)
-        feature_cols.append(expanding_avg_col)
+        features[f'avg_{col}'] = expanding_avg.reset_index(level=[0, 1], drop=True)
 
         # Calculate rolling window averages
-        for window in ROLLING_WINDOWS:
-            rolling_avg_col = f'l{window}_{col}'
+        for window in windows:
             rolling_avg = df.groupby(['team', 'season'])[col].rolling(window=window, min_periods=1).mean()
-            df[rolling_avg_col] = rolling_avg.reset_index(level=[0, 1], drop=True)
-            feature_cols.append(rolling_avg_col)
+            features[f'l{window}_{col}'] = rolling_avg.reset_index(level=[0, 1], drop=True)
+    feature_cols = list(features)
+    df = pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
 
     # Shift all calculated features to prevent data leakage from the current game
     df[feature_cols] = df.groupby(['team', 'season'])[feature_cols].shift(1)
@@ -139,16 +260,26 @@ def _calculate_rolling_averages(team_game_stats_df: pd.DataFrame) -> pd.DataFram
 
     return df
 
-def _merge_features_to_games(pbp_df: pd.DataFrame, point_in_time_stats_df: pd.DataFrame) -> pd.DataFrame:
+def _merge_features_to_games(
+    pbp_df: pd.DataFrame,
+    point_in_time_stats_df: pd.DataFrame,
+    game_index: Optional[pd.DataFrame] = None,
+    ratings_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Merges the point-in-time team stats back to a game-level DataFrame.
+    The game-level data is read from the game index when one is given.
+    Pre-game team ratings (see ratings.calculate_weekly_ratings) are merged
+    as extra home/away features when `ratings_df` is given.
     """
     print("  Step C: Merging point-in-time stats to game-level data...")
 
-    # First, create a clean, unique-per-game DataFrame from the PBP data
-    game_level_df = pbp_df[[
-        'game_id', 'season', 'week', 'home_team', 'away_team', 'spread_line', 'total_line', 'result'
-    ]].drop_duplicates(subset=['game_id']).reset_index(drop=True)
+    game_cols = ['game_id', 'season', 'week', 'home_team', 'away_team', 'spread_line', 'total_line', 'result']
+    if game_index is not None:
+        game_level_df = game_index[game_cols].reset_index(drop=True)
+    else:
+        # First, create a clean, unique-per-game DataFrame from the PBP data
+        game_level_df = pbp_df[game_cols].drop_duplicates(subset=['game_id']).reset_index(drop=True)
 
     # Filter for played games only
     game_level_df = game_level_df.dropna(subset=['result']).copy()
@@ -157,6 +288,13 @@ def _merge_features_to_games(pbp_df: pd.DataFrame, point_in_time_stats_df: pd.Da
     feature_cols = [col for col in point_in_time_stats_df.columns if col.startswith(('avg_', 'l'))]
     stats_for_merge = point_in_time_stats_df[['game_id', 'team'] + feature_cols]
 
+    if ratings_df is not None:
+        rating_cols = [col for col in ratings_df.columns if col.startswith('rtg_')]
+        stats_for_merge = stats_for_merge.merge(
+            ratings_df[['game_id', 'team'] + rating_cols], on=['game_id', 'team'], how='left'
+        )
+        feature_cols += rating_cols
+
     # Merge for the home team
     final_df = pd.merge(
         game_level_df,
@@ -181,27 +319,441 @@ def _merge_features_to_games(pbp_df: pd.DataFrame, point_in_time_stats_df: pd.Da
 
     return final_df
 
-def create_final_feature_set(pbp_df: pd.DataFrame, season_type: str = 'REG') -> pd.DataFrame:
+class PandasBackend:
+    """
+    The reference execution backend: runs each pipeline stage with pandas and
+    the analysis library.
+    """
+    name = 'pandas'
+
+    def team_game_stats(
+        self, pbp_df: pd.DataFrame, season_type: str, game_index: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        return _calculate_team_game_stats(pbp_df, season_type=season_type, game_index=game_index)
+
+    def rolling_averages(
+        self,
+        team_game_stats_df: pd.DataFrame,
+        stat_cols: Optional[List[str]] = None,
+        windows: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        return _calculate_rolling_averages(team_game_stats_df, stat_cols, windows)
+
+    def merge_features(
+        self,
+        pbp_df: pd.DataFrame,
+        point_in_time_stats_df: pd.DataFrame,
+        game_index: Optional[pd.DataFrame] = None,
+        ratings_df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        return _merge_features_to_games(pbp_df, point_in_time_stats_df, game_index=game_index, ratings_df=ratings_df)
+
+
+FEATURE_BACKENDS = ['pandas', 'duckdb']
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Returns the execution backend for the pipeline stages, defaulting to
+    config.FEATURE_BACKEND. DuckDB is only imported when it is selected.
+    """
+    name = name if name is not None else config.FEATURE_BACKEND
+    if name == 'pandas':
+        return PandasBackend()
+    if name == 'duckdb':
+        from nfl_betting_app.duckdb_backend import DuckDBBackend
+        return DuckDBBackend()
+    raise ValueError(f"Unknown feature backend '{name}'. Expected one of {FEATURE_BACKENDS}.")
+
+
+def benchmark_backends(
+    pbp_df: pd.DataFrame,
+    season_type: str = 'REG',
+    backends: Iterable[str] = FEATURE_BACKENDS,
+    game_index: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Times the team-stats, rolling and merge stages on each backend.
+
+    Returns:
+        A DataFrame with one row per backend and a seconds column per stage.
+    """
+    rows = []
+    for name in backends:
+        backend = get_backend(name)
+        timings = {'backend': name}
+
+        start = time.perf_counter()
+        team_game_stats_df = backend.team_game_stats(pbp_df, season_type, game_index=game_index)
+        timings['team_game_stats'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        point_in_time_stats_df = backend.rolling_averages(team_game_stats_df)
+        timings['rolling_averages'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        backend.merge_features(pbp_df, point_in_time_stats_df, game_index=game_index)
+        timings['merge_features'] = time.perf_counter() - start
+
+        timings['total'] = timings['team_game_stats'] + timings['rolling_averages'] + timings['merge_features']
+        rows.append(timings)
+    return pd.DataFrame(rows)
+
+
+def _team_features(point_in_time_stats_df: pd.DataFrame, ratings_df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """The point-in-time team-game frame with the pre-game ratings joined on, one row per team and game."""
+    if ratings_df is None:
+        return point_in_time_stats_df.reset_index(drop=True)
+    rating_cols = [col for col in ratings_df.columns if col.startswith('rtg_')]
+    return point_in_time_stats_df.merge(
+        ratings_df[['game_id', 'team'] + rating_cols], on=['game_id', 'team'], how='left'
+    )
+
+
+def _create_feature_set_in_batches(
+    load_seasons: Callable[[List[int]], pd.DataFrame],
+    batches: List[List[int]],
+    season_type: str,
+    splits: Optional[List[str]],
+    rating_stats: Optional[List[str]],
+    backend: Optional[str],
+    tracker: StageMemoryTracker,
+    index_batches: bool,
+    drive_stats: bool = False,
+    team_tables: Optional[Dict[str, pd.DataFrame]] = None
+) -> pd.DataFrame:
+    """
+    Runs the pipeline one batch of seasons at a time. Averages are computed per
+    (team, season), so batching by season gives the same features as a single
+    pass. Each stage's output is spilled to Parquet and dropped before the next
+    batch is loaded, so only one batch is ever held in memory.
+
+    Args:
+        load_seasons: Returns the plays of the given seasons.
+        batches: The season batches, in chronological order.
+        index_batches: Build a game index over each batch (the plays must be
+                       sorted as in the partition store).
+        team_tables: Filled as in `create_final_feature_set`.
+    """
+    engine = get_backend(backend)
+    print(f"  Processing {len(batches)} season batches within the memory budget...")
+
+    with tempfile.TemporaryDirectory(prefix='features_', dir=config.FEATURE_SPILL_DIR) as spill_dir:
+        def spill_path(name: str, batch: int) -> str:
+            return os.path.join(spill_dir, f'{name}_{batch}.parquet')
+
+        # Split labels missing from a batch (e.g. no overtime) must still get columns.
+        split_cols: List[str] = []
+        for batch, seasons in enumerate(batches):
+            with tracker.stage('team_game_stats', batch):
+                pbp_df = load_seasons(seasons)
+                batch_index = build_game_index(pbp_df) if index_batches else None
+                team_game_stats_df = engine.team_game_stats(pbp_df, season_type, game_index=batch_index)
+                if splits:
+                    team_game_stats_df, batch_split_cols = _add_split_stats(
+                        team_game_stats_df, pbp_df, season_type, splits
+                    )
+                    split_cols += [col for col in batch_split_cols if col not in split_cols]
+                if drive_stats:
+                    team_game_stats_df, _ = _add_drive_stats(team_game_stats_df, pbp_df, season_type)
+                team_game_stats_df.to_parquet(spill_path('team_game_stats', batch), index=False)
+                # The merge stage only needs one row per game, not the plays.
+                pbp_df[GAME_LEVEL_COLUMNS].drop_duplicates(subset=['game_id']).to_parquet(
+                    spill_path('games', batch), index=False
+                )
+                del pbp_df, batch_index, team_game_stats_df
+                gc.collect()
+
+        stat_cols = list(STATS_TO_CALCULATE) + sorted(split_cols) + (list(DRIVE_STATS) if drive_stats else [])
+        team_game_stats_paths = [spill_path('team_game_stats', batch) for batch in range(len(batches))]
+
+        ratings_df = None
+        if rating_stats:
+            with tracker.stage('ratings'):
+                print("  Step B2: Fitting weekly opponent-adjusted ratings...")
+                all_team_games = pd.concat(
+                    [pd.read_parquet(path, columns=['game_id', 'team', 'opponent', 'season', 'week'] + rating_stats)
+                     for path in team_game_stats_paths],
+                    ignore_index=True
+                )
+                ratings_df = calculate_weekly_ratings(all_team_games, rating_stats)
+                del all_team_games
+
+        def read_team_game_stats(batch: int) -> pd.DataFrame:
+            team_game_stats_df = pd.read_parquet(team_game_stats_paths[batch])
+            for col in split_cols:
+                if col not in team_game_stats_df.columns:
+                    team_game_stats_df[col] = 0.0
+            return team_game_stats_df
+
+        for batch in range(len(batches)):
+            with tracker.stage('rolling_averages', batch):
+                team_game_stats_df = read_team_game_stats(batch)
+                point_in_time_stats_df = engine.rolling_averages(team_game_stats_df, stat_cols)
+                point_in_time_stats_df.to_parquet(spill_path('rolling', batch), index=False)
+                del team_game_stats_df, point_in_time_stats_df
+                gc.collect()
+
+        for batch in range(len(batches)):
+            with tracker.stage('merge_features', batch):
+                batch_features_df = engine.merge_features(
+                    pd.read_parquet(spill_path('games', batch)),
+                    pd.read_parquet(spill_path('rolling', batch)),
+                    ratings_df=ratings_df
+                )
+                batch_features_df.to_parquet(spill_path('features', batch), index=False)
+                del batch_features_df
+                gc.collect()
+
+        final_feature_df = pd.concat(
+            [pd.read_parquet(spill_path('features', batch)) for batch in range(len(batches))], ignore_index=True
+        )
+        if team_tables is not None:
+            team_tables['team_game_stats'] = pd.concat(
+                [read_team_game_stats(batch) for batch in range(len(batches))], ignore_index=True
+            )
+            team_tables['team_features'] = _team_features(
+                pd.concat([pd.read_parquet(spill_path('rolling', batch)) for batch in range(len(batches))],
+                          ignore_index=True),
+                ratings_df
+            )
+
+    # Filter out Week 1 games, as they have no historical data
+    final_feature_df = final_feature_df[final_feature_df['week'] > 1].reset_index(drop=True)
+
+    print("Feature engineering pipeline complete.")
+    return final_feature_df
+
+
+def create_final_feature_set(
+    pbp_df: pd.DataFrame,
+    season_type: str = 'REG',
+    game_index: Optional[pd.DataFrame] = None,
+    splits: Optional[List[str]] = None,
+    rating_stats: Optional[List[str]] = None,
+    backend: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+    memory_tracker: Optional[StageMemoryTracker] = None,
+    drive_stats: bool = False,
+    team_tables: Optional[Dict[str, pd.DataFrame]] = None
+) -> pd.DataFrame:
     """
     Orchestrates the entire feature engineering pipeline using play-by-play data.
 
     Args:
         pbp_df: The raw play-by-play DataFrame.
         season_type: The type of season to process ('REG' or 'POST').
+        game_index: Optional per-game index built over `pbp_df` at ingest time.
+        splits: Optional split dimensions (see nfl_pbp_analysis.SPLITS) whose
+                split stats are averaged alongside STATS_TO_CALCULATE.
+        rating_stats: Optional team-game stats to fit opponent-adjusted
+                      ratings for (see ratings.RATING_STATS).
+        backend: The execution backend for the pipeline stages ('pandas' or
+                 'duckdb'). Defaults to config.FEATURE_BACKEND.
+        memory_budget: Bytes the pipeline may use. Defaults to
+                       config.FEATURE_MEMORY_BUDGET_BYTES. When the plays are
+                       estimated (see frame_season_bytes) to need more, seasons
+                       are processed in batches. Both paths return a fresh
+                       RangeIndex.
+        memory_tracker: Optional tracker that records time and peak RSS per stage.
+        drive_stats: Also average the per-drive efficiency stats (DRIVE_STATS).
+        team_tables: Optional dict that is filled with the pipeline's
+                     team-level tables, one row per team and game:
+                     'team_game_stats' (the per-game stats, split stats
+                     included) and 'team_features' (the point-in-time
+                     averages with the rtg_ ratings joined on).
     """
     print(f"Starting PBP feature engineering pipeline for season_type='{season_type}'...")
-
-    # Step 1: Calculate per-game stats using the analysis library.
-    team_game_stats_df = _calculate_team_game_stats(pbp_df, season_type=season_type)
+    tracker = memory_tracker if memory_tracker is not None else StageMemoryTracker()
+
+    memory_budget = memory_budget if memory_budget is not None else config.FEATURE_MEMORY_BUDGET_BYTES
+    if memory_budget is not None:
+        season_bytes = frame_season_bytes(pbp_df)
+        if sum(season_bytes.values()) * PIPELINE_MEMORY_FACTOR > memory_budget:
+            return _create_feature_set_in_batches(
+                lambda seasons: pbp_df[pbp_df['season'].isin(seasons)],
+                plan_season_batches(season_bytes, memory_budget),
+                season_type, splits, rating_stats, backend, tracker,
+                index_batches=game_index is not None, drive_stats=drive_stats, team_tables=team_tables
+            )
+
+    engine = get_backend(backend)
+
+    # Step 1: Calculate per-game stats.
+    with tracker.stage('team_game_stats'):
+        team_game_stats_df = engine.team_game_stats(pbp_df, season_type, game_index=game_index)
+
+        stat_cols = list(STATS_TO_CALCULATE)
+        if splits:
+            team_game_stats_df, split_cols = _add_split_stats(team_game_stats_df, pbp_df, season_type, splits)
+            stat_cols += split_cols
+        if drive_stats:
+            team_game_stats_df, drive_cols = _add_drive_stats(team_game_stats_df, pbp_df, season_type)
+            stat_cols += drive_cols
+
+    ratings_df = None
+    if rating_stats:
+        with tracker.stage('ratings'):
+            print("  Step B2: Fitting weekly opponent-adjusted ratings...")
+            ratings_df = calculate_weekly_ratings(team_game_stats_df, rating_stats)
 
     # Step 2: Calculate rolling and expanding averages for these stats.
-    point_in_time_stats_df = _calculate_rolling_averages(team_game_stats_df)
+    with tracker.stage('rolling_averages'):
+        point_in_time_stats_df = engine.rolling_averages(team_game_stats_df, stat_cols)
+        if team_tables is not None:
+            team_tables['team_game_stats'] = team_game_stats_df
+            team_tables['team_features'] = _team_features(point_in_time_stats_df, ratings_df)
+        del team_game_stats_df
 
     # Step 3: Merge features back to a game-level DataFrame.
-    final_feature_df = _merge_features_to_games(pbp_df, point_in_time_stats_df)
+    with tracker.stage('merge_features'):
+        final_feature_df = engine.merge_features(
+            pbp_df, point_in_time_stats_df, game_index=game_index, ratings_df=ratings_df
+        )
+        del point_in_time_stats_df
 
     # Step 4: Filter out Week 1 games, as they have no historical data
-    final_feature_df = final_feature_df[final_feature_df['week'] > 1].copy()
+    final_feature_df = final_feature_df[final_feature_df['week'] > 1].reset_index(drop=True)
 
     print("Feature engineering pipeline complete.")
     return final_feature_df
+
+
+def create_final_feature_set_from_partitions(
+    partition_dir: str = config.RAW_PBP_PARTITION_DIR,
+    season_type: str = 'REG',
+    splits: Optional[List[str]] = None,
+    rating_stats: Optional[List[str]] = None,
+    backend: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+    memory_tracker: Optional[StageMemoryTracker] = None,
+    drive_stats: bool = False,
+    team_tables: Optional[Dict[str, pd.DataFrame]] = None
+) -> pd.DataFrame:
+    """
+    Builds the feature set straight from the season partition store, reading
+    only one batch of seasons at a time so the full play history never has to
+    be in memory. Batches are sized from the partition footers to fit
+    `memory_budget` (default config.FEATURE_MEMORY_BUDGET_BYTES). `team_tables`
+    is filled as in `create_final_feature_set`.
+    """
+    print(f"Starting PBP feature engineering pipeline for season_type='{season_type}' from partitions...")
+    manifest = load_manifest(os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME))
+    season_bytes = partition_season_bytes(partition_dir, manifest)
+
+    memory_budget = memory_budget if memory_budget is not None else config.FEATURE_MEMORY_BUDGET_BYTES
+    if memory_budget is not None:
+        batches = plan_season_batches(season_bytes, memory_budget)
+    else:
+        batches = [sorted(season_bytes)]
+
+    return _create_feature_set_in_batches(
+        lambda seasons: read_partitions(partition_dir, manifest, seasons=seasons),
+        batches, season_type, splits, rating_stats, backend,
+        memory_tracker if memory_tracker is not None else StageMemoryTracker(),
+        index_batches=True, drive_stats=drive_stats, team_tables=team_tables
+    )
+
+
+@dataclass(frozen=True)
+class FeatureSetSpec:
+    """
+    One output of `create_feature_sets`.
+
+    Attributes:
+        name: Key of the feature set in the returned dict.
+        season_type: The type of season to process ('REG' or 'POST').
+        windows: Rolling window sizes (in games). Defaults to ROLLING_WINDOWS.
+        splits: Optional split dimensions, as in `create_final_feature_set`.
+        rating_stats: Optional stats to fit opponent-adjusted ratings for.
+        drive_stats: Also average the per-drive efficiency stats.
+        output_path: If set, the feature set is also written there as CSV.
+    """
+    name: str
+    season_type: str = 'REG'
+    windows: Optional[Tuple[int, ...]] = None
+    splits: Optional[Tuple[str, ...]] = None
+    rating_stats: Optional[Tuple[str, ...]] = None
+    drive_stats: bool = False
+    output_path: Optional[str] = None
+
+
+def create_feature_sets(
+    pbp_df: pd.DataFrame,
+    specs: List[FeatureSetSpec],
+    game_index: Optional[pd.DataFrame] = None,
+    backend: Optional[str] = None,
+    memory_tracker: Optional[StageMemoryTracker] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Builds several feature sets from one pass over the plays.
+
+    Each game's stats are computed once per season type, however many specs
+    use it; split stats, ratings and rolling averages are computed once per
+    distinct configuration, and only the final merge runs per spec. Every
+    feature set equals `create_final_feature_set` with the same options.
+
+    Returns:
+        The feature sets by spec name.
+    """
+    names = [spec.name for spec in specs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Feature set names must be unique, got {names}.")
+    print(f"Starting PBP feature engineering pipeline for {len(specs)} feature sets...")
+    tracker = memory_tracker if memory_tracker is not None else StageMemoryTracker()
+    engine = get_backend(backend)
+
+    team_game_stats: Dict[str, pd.DataFrame] = {}
+    with tracker.stage('team_game_stats'):
+        for season_type in dict.fromkeys(spec.season_type for spec in specs):
+            team_game_stats[season_type] = engine.team_game_stats(pbp_df, season_type, game_index=game_index)
+        # The merge stage only needs one row per game, not the plays.
+        games_df = game_index if game_index is not None else pbp_df[GAME_LEVEL_COLUMNS].drop_duplicates(subset=['game_id'])
+
+    with_splits: Dict[Tuple[str, Optional[Tuple[str, ...]], bool], Tuple[pd.DataFrame, List[str]]] = {}
+    ratings: Dict[Tuple[str, Optional[Tuple[str, ...]], bool, Tuple[str, ...]], pd.DataFrame] = {}
+    rolling: Dict[Tuple[str, Optional[Tuple[str, ...]], bool, Optional[Tuple[int, ...]]], pd.DataFrame] = {}
+    feature_sets = {}
+    for spec in specs:
+        split_key = (spec.season_type, spec.splits, spec.drive_stats)
+        if split_key not in with_splits:
+            with tracker.stage('team_game_stats'):
+                df, stat_cols = team_game_stats[spec.season_type], list(STATS_TO_CALCULATE)
+                if spec.splits:
+                    df, split_cols = _add_split_stats(df, pbp_df, spec.season_type, list(spec.splits))
+                    stat_cols += split_cols
+                if spec.drive_stats:
+                    df, drive_cols = _add_drive_stats(df, pbp_df, spec.season_type)
+                    stat_cols += drive_cols
+                with_splits[split_key] = (df, stat_cols)
+        team_game_stats_df, stat_cols = with_splits[split_key]
+
+        ratings_df = None
+        if spec.rating_stats:
+            # Fitted on the stats with their splits, which a rating stat may name.
+            ratings_key = split_key + (spec.rating_stats,)
+            if ratings_key not in ratings:
+                with tracker.stage('ratings'):
+                    print("  Step B2: Fitting weekly opponent-adjusted ratings...")
+                    ratings[ratings_key] = calculate_weekly_ratings(team_game_stats_df, list(spec.rating_stats))
+            ratings_df = ratings[ratings_key]
+
+        rolling_key = split_key + (spec.windows,)
+        if rolling_key not in rolling:
+            with tracker.stage('rolling_averages'):
+                rolling[rolling_key] = engine.rolling_averages(
+                    team_game_stats_df, stat_cols, list(spec.windows) if spec.windows is not None else None
+                )
+
+        with tracker.stage('merge_features'):
+            final_feature_df = engine.merge_features(games_df, rolling[rolling_key], ratings_df=ratings_df)
+        final_feature_df = final_feature_df[final_feature_df['week'] > 1].reset_index(drop=True)
+        feature_sets[spec.name] = final_feature_df
+
+        if spec.output_path:
+            os.makedirs(os.path.dirname(spec.output_path) or '.', exist_ok=True)
+            final_feature_df.to_csv(spec.output_path, index=False)
+            print(f"Feature set '{spec.name}' saved to: {spec.output_path}")
+
+    print("Feature engineering pipeline complete.")
+    return feature_sets
@@ -0,0 +1,197 @@
+# nfl_betting_app/feature_snapshots.py
+# Versioned point-in-time snapshots of the model feature set. Each version
+# stores only what changed since the previous one, so the history grows with
+# the weekly deltas rather than with full copies of the feature set.
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import load_manifest, new_manifest, save_manifest
+
+SNAPSHOT_KEY = 'game_id'
+SNAPSHOT_MANIFEST_FILENAME = "manifest.json"
+
+
+def _manifest_path(snapshot_dir: str) -> str:
+    return os.path.join(snapshot_dir, SNAPSHOT_MANIFEST_FILENAME)
+
+
+def _load_snapshot_manifest(snapshot_dir: str) -> Dict[str, Any]:
+    path = _manifest_path(snapshot_dir)
+    if not os.path.exists(path):
+        manifest = new_manifest(config.FEATURE_SNAPSHOT_SCHEMA_VERSION)
+        del manifest["partitions"]
+        manifest["versions"] = []
+        return manifest
+    return load_manifest(path, config.FEATURE_SNAPSHOT_SCHEMA_VERSION)
+
+
+def _latest_as_of(feature_df: pd.DataFrame) -> Tuple[int, int]:
+    season = feature_df['season'].max()
+    return int(season), int(feature_df.loc[feature_df['season'] == season, 'week'].max())
+
+
+def _changed_cells(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Boolean frame of the cells that differ, treating NaN as equal to NaN."""
+    return ~((old == new) | (old.isna() & new.isna()))
+
+
+def save_feature_snapshot(
+    feature_df: pd.DataFrame,
+    snapshot_dir: str = config.FEATURE_SNAPSHOT_DIR,
+    as_of: Optional[Tuple[int, int]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Stores `feature_df` as the next snapshot version, delta-encoded against
+    the previous version:
+
+        v<N>_added.parquet    full rows for games not in the previous version
+        v<N>_changed.parquet  game_id plus only the columns that changed, for
+                              only the rows that changed
+
+    Deleted games and dropped columns are recorded in the manifest.
+
+    Args:
+        as_of: The (season, week) the features are current as of. Defaults to
+               the latest (season, week) in `feature_df`.
+
+    Returns:
+        The manifest entry of the new version, or None if nothing changed.
+    """
+    if feature_df[SNAPSHOT_KEY].duplicated().any():
+        raise ValueError(f"Feature snapshots need a unique '{SNAPSHOT_KEY}' per row.")
+
+    manifest = _load_snapshot_manifest(snapshot_dir)
+    version = len(manifest["versions"]) + 1
+    new = feature_df.set_index(SNAPSHOT_KEY)
+
+    if manifest["versions"]:
+        old = load_feature_snapshot(snapshot_dir).set_index(SNAPSHOT_KEY)
+    else:
+        old = pd.DataFrame(columns=new.columns, index=pd.Index([], name=SNAPSHOT_KEY))
+
+    added_keys = new.index.difference(old.index, sort=False)
+    deleted_keys = old.index.difference(new.index, sort=False)
+    common_keys = new.index.intersection(old.index, sort=False)
+    common_columns = [col for col in new.columns if col in old.columns]
+    new_columns = [col for col in new.columns if col not in old.columns]
+
+    changed = _changed_cells(old.loc[common_keys, common_columns], new.loc[common_keys, common_columns])
+    if new_columns:
+        # A new column "changes" every existing row that has a value for it.
+        changed = changed.join(new.loc[common_keys, new_columns].notna())
+    changed_rows = changed.index[changed.any(axis=1)]
+    changed_columns = [col for col in changed.columns if changed[col].any()]
+
+    # Adding, dropping or reordering columns is a change even when no value
+    # differs (e.g. a new column that is missing everywhere).
+    columns_changed = list(new.columns) != list(old.columns)
+    if not len(added_keys) and not len(deleted_keys) and not len(changed_rows) and not columns_changed:
+        print("Feature set unchanged since the last snapshot; nothing stored.")
+        return None
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    entry = {
+        "version": version,
+        "as_of": list(as_of if as_of is not None else _latest_as_of(feature_df)),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "columns": list(feature_df.columns),
+        "deleted": [str(key) for key in deleted_keys],
+        "rows_added": int(len(added_keys)),
+        "rows_changed": int(len(changed_rows)),
+        "files": {},
+    }
+    deltas = {
+        "added": new.loc[added_keys] if len(added_keys) else None,
+        "changed": new.loc[changed_rows, changed_columns] if len(changed_rows) else None,
+    }
+    for kind, delta_df in deltas.items():
+        if delta_df is None:
+            continue
+        file_name = f"v{version:05d}_{kind}.parquet"
+        delta_df.reset_index().to_parquet(
+            os.path.join(snapshot_dir, file_name), index=False, compression=config.PARQUET_COMPRESSION
+        )
+        entry["files"][kind] = file_name
+
+    manifest["versions"].append(entry)
+    save_manifest(manifest, _manifest_path(snapshot_dir))
+    print(
+        f"Saved feature snapshot v{version} as of {entry['as_of']}: {entry['rows_added']} added, "
+        f"{entry['rows_changed']} changed, {len(entry['deleted'])} deleted rows."
+    )
+    return entry
+
+
+def list_feature_snapshots(snapshot_dir: str = config.FEATURE_SNAPSHOT_DIR) -> pd.DataFrame:
+    """Returns one row per stored version with its as-of week and delta sizes."""
+    versions = _load_snapshot_manifest(snapshot_dir)["versions"]
+    return pd.DataFrame([
+        {
+            'version': v['version'], 'as_of_season': v['as_of'][0], 'as_of_week': v['as_of'][1],
+            'created_at': v['created_at'], 'rows_added': v['rows_added'], 'rows_changed': v['rows_changed'],
+            'rows_deleted': len(v['deleted']),
+        }
+        for v in versions
+    ], columns=['version', 'as_of_season', 'as_of_week', 'created_at', 'rows_added', 'rows_changed', 'rows_deleted'])
+
+
+def _select_version(versions: List[Dict[str, Any]], version: Optional[int], as_of: Optional[Tuple[int, int]]) -> int:
+    if version is not None:
+        if not 1 <= version <= len(versions):
+            raise KeyError(f"Feature snapshot version {version} does not exist.")
+        return version
+    if as_of is not None:
+        eligible = [v['version'] for v in versions if tuple(v['as_of']) <= tuple(as_of)]
+        if not eligible:
+            raise KeyError(f"No feature snapshot as of season {as_of[0]} week {as_of[1]}.")
+        return eligible[-1]
+    return len(versions)
+
+
+def load_feature_snapshot(
+    snapshot_dir: str = config.FEATURE_SNAPSHOT_DIR,
+    version: Optional[int] = None,
+    as_of: Optional[Tuple[int, int]] = None
+) -> pd.DataFrame:
+    """
+    Reconstructs a stored version of the feature set by replaying the deltas
+    up to it. Selects `version` if given, else the latest version as of the
+    given (season, week), else the latest version. Rows are ordered by game_id.
+
+    Raises FileNotFoundError if there are no snapshots and KeyError if the
+    requested version does not exist.
+    """
+    manifest_path = _manifest_path(snapshot_dir)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No feature snapshots found in '{snapshot_dir}'.")
+    versions = load_manifest(manifest_path, config.FEATURE_SNAPSHOT_SCHEMA_VERSION)["versions"]
+    target = _select_version(versions, version, as_of)
+
+    # Added rows are buffered and concatenated in one go. The buffer is
+    # flushed before a version's changes or deletions, which may touch them.
+    frames: List[pd.DataFrame] = []
+    df = pd.DataFrame()
+    for entry in versions[:target]:
+        if "added" in entry["files"]:
+            frames.append(pd.read_parquet(os.path.join(snapshot_dir, entry["files"]["added"])).set_index(SNAPSHOT_KEY))
+        if "changed" in entry["files"] or entry["deleted"]:
+            df = pd.concat([df] + frames) if frames else df
+            frames = []
+        if "changed" in entry["files"]:
+            changed = pd.read_parquet(os.path.join(snapshot_dir, entry["files"]["changed"])).set_index(SNAPSHOT_KEY)
+            for col in changed.columns:
+                if col not in df.columns:
+                    df[col] = pd.Series(dtype=changed[col].dtype)
+            df.loc[changed.index, changed.columns] = changed
+        if entry["deleted"]:
+            df = df.drop(index=entry["deleted"])
+    if frames:
+        df = pd.concat([df] + frames)
+
+    columns = versions[target - 1]["columns"]
+    df.index.name = SNAPSHOT_KEY
+    return df.sort_index().reset_index().reindex(columns=columns)
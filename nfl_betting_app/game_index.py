@@ -0,0 +1,251 @@
+# nfl_betting_app/game_index.py
+# This module builds and persists the per-game index over the sorted raw PBP
+# store: one row per game with its game-level attributes and the offset range
+# of its plays, so game-level consumers never have to rescan every play.
+import os
+import time
+import tracemalloc
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.nfl_pbp_analysis import game_from_columns
+from nfl_betting_app.nfl_pbp_analysis.pbp_data_models_factories import REQUIRED_COLS
+
+# Plays are stored sorted by these columns so each game is one contiguous block.
+PLAY_SORT_COLUMNS = ['season', 'game_id', 'play_id']
+
+GAME_LEVEL_COLUMNS = [
+    'game_id', 'season', 'week', 'season_type', 'home_team', 'away_team',
+    'spread_line', 'total_line', 'result'
+]
+
+
+def sort_plays(pbp_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sorts plays into storage order. The sort is stable, so plays keep their
+    original order within a game when there is no 'play_id' column.
+    """
+    sort_cols = [col for col in PLAY_SORT_COLUMNS if col in pbp_df.columns]
+    return pbp_df.sort_values(by=sort_cols, kind='stable').reset_index(drop=True)
+
+
+def game_boundaries(game_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the start and stop offsets of each run of equal game_ids.
+    Raises ValueError if a game's plays are not contiguous.
+    """
+    n = len(game_ids)
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    changes = np.flatnonzero(game_ids[1:] != game_ids[:-1]) + 1
+    starts = np.concatenate(([0], changes)).astype(np.int64)
+    stops = np.concatenate((changes, [n])).astype(np.int64)
+    if len(pd.unique(game_ids[starts])) != len(starts):
+        raise ValueError("Plays are not grouped by game_id. Sort them with sort_plays() first.")
+    return starts, stops
+
+
+def build_game_index(sorted_pbp_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the game index from plays in storage order. The play_start/play_stop
+    columns are row offsets into `sorted_pbp_df`.
+    """
+    starts, stops = game_boundaries(sorted_pbp_df['game_id'].to_numpy())
+    game_index = sorted_pbp_df[GAME_LEVEL_COLUMNS].iloc[starts].reset_index(drop=True)
+    game_index['play_start'] = starts
+    game_index['play_stop'] = stops
+    return game_index
+
+
+def write_game_index(game_index: pd.DataFrame, path: str = config.GAME_INDEX_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    game_index.to_parquet(path, index=False, compression=config.PARQUET_COMPRESSION)
+
+
+def schedules_to_game_table(schedules_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts an nflverse schedule (`nfl.import_schedules`) to game table rows.
+    Every game_type other than 'REG' (WC, DIV, CON, SB) is a 'POST' game.
+    """
+    games = schedules_df.copy()
+    games['season_type'] = np.where(games['game_type'] == 'REG', 'REG', 'POST')
+    return games[GAME_LEVEL_COLUMNS]
+
+
+def build_game_table(game_index: pd.DataFrame, schedules_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Builds the game/schedule table: one row per game with GAME_LEVEL_COLUMNS,
+    sorted by season, week and game_id.
+
+    Games in the game index come from the plays and take precedence. A
+    schedule, when given, adds games without plays yet (e.g. next week's) and
+    fills in lines missing from the plays.
+    """
+    games = game_index[GAME_LEVEL_COLUMNS].set_index('game_id')
+    if schedules_df is not None:
+        games = games.combine_first(schedules_to_game_table(schedules_df).set_index('game_id'))
+    games = games.reset_index()[GAME_LEVEL_COLUMNS].astype({'season': 'int64', 'week': 'int64'})
+    return games.sort_values(['season', 'week', 'game_id']).reset_index(drop=True)
+
+
+def write_game_table(games_df: pd.DataFrame, path: str = config.GAMES_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    games_df.to_parquet(path, index=False, compression=config.PARQUET_COMPRESSION)
+
+
+def check_game_index(pbp_df: pd.DataFrame, game_index: pd.DataFrame) -> None:
+    """
+    Verifies that the index offsets point into `pbp_df`, i.e. that the frame is
+    the unfiltered sorted store the index was built from.
+    Raises ValueError otherwise.
+    """
+    if game_index.empty:
+        return
+    starts = game_index['play_start'].to_numpy()
+    if game_index['play_stop'].max() > len(pbp_df) or not np.array_equal(
+        pbp_df['game_id'].to_numpy()[starts], game_index['game_id'].to_numpy()
+    ):
+        raise ValueError("Game index does not match the play-by-play frame it is used with.")
+
+
+def game_slice(pbp_df: pd.DataFrame, game_row) -> pd.DataFrame:
+    """
+    Returns the plays of one game as a positional slice of the sorted store,
+    which pandas serves as a view rather than a gathered copy.
+    """
+    return pbp_df.iloc[int(game_row.play_start):int(game_row.play_stop)]
+
+
+def iter_game_frames(pbp_df: pd.DataFrame, game_index: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Yields (game_id, plays) for each game in the index."""
+    for game_row in game_index.itertuples(index=False):
+        yield game_row.game_id, game_slice(pbp_df, game_row)
+
+
+def column_arrays(pbp_df: pd.DataFrame, columns: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Returns the backing NumPy array of each column. For the single-dtype
+    columns of a store read from Parquet these are not copies.
+    """
+    return {col: pbp_df[col].to_numpy() for col in columns}
+
+
+def _game_column_arrays(
+    pbp_df: pd.DataFrame, game_index: pd.DataFrame, columns: List[str], keep: Optional[np.ndarray]
+) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """The column arrays `iter_game_columns` slices and each game's start and stop offsets into them."""
+    check_game_index(pbp_df, game_index)
+    arrays = column_arrays(pbp_df, columns)
+    starts = game_index['play_start'].to_numpy(dtype=np.int64)
+    stops = game_index['play_stop'].to_numpy(dtype=np.int64)
+    if keep is not None:
+        arrays = {col: values[keep] for col, values in arrays.items()}
+        kept_before = np.concatenate(([0], np.cumsum(keep)))
+        starts, stops = kept_before[starts], kept_before[stops]
+    return arrays, starts, stops
+
+
+def iter_game_columns(
+    pbp_df: pd.DataFrame, game_index: pd.DataFrame, columns: List[str], keep: Optional[np.ndarray] = None
+) -> Iterator[Tuple[object, Dict[str, np.ndarray]]]:
+    """
+    Yields (game_row, {column: view}) for each game in the index.
+
+    The column arrays are fetched once and each game's values are basic
+    slices of them, so there is no groupby, no hashing and no per-game copy.
+    `pbp_df` must be the sorted store the index was built from.
+
+    Args:
+        keep: Optional boolean mask over the rows of `pbp_df`. The columns are
+              filtered with it once, up front, and each game's views cover
+              only its kept plays, so games never need a gathering filter.
+    """
+    arrays, starts, stops = _game_column_arrays(pbp_df, game_index, columns, keep)
+    for game_row, start, stop in zip(game_index.itertuples(index=False), starts, stops):
+        yield game_row, {col: values[start:stop] for col, values in arrays.items()}
+
+
+def measure_game_iteration(
+    pbp_df: pd.DataFrame, game_index: pd.DataFrame, season_type: Optional[str] = None
+) -> Dict[str, float]:
+    """
+    Times the team-stats pipeline's per-game loop (skip plays without a
+    posteam, then build each Game with `game_from_columns`) over groupby
+    against the offset views, and reports the copies the views avoid.
+
+    For each path the report holds the seconds taken, the number of
+    per-game column arrays that were copies of the arrays the path reads
+    from, the bytes those copies allocated, the peak traced memory, and the
+    memory blocks and bytes the path still holds for its per-game arrays
+    (the tracemalloc snapshot difference while they are kept alive).
+    """
+    if season_type is not None:
+        game_index = game_index[game_index['season_type'] == season_type]
+    columns = [col for col in REQUIRED_COLS if col not in ('game_id', 'home_team', 'away_team')]
+    game_ids = set(game_index['game_id'])
+    has_posteam = pd.notna(pbp_df['posteam']).to_numpy()
+
+    def build_games(per_game_arrays: Iterator[Tuple[object, Dict[str, np.ndarray]]],
+                    source: Dict[str, np.ndarray]) -> Tuple[int, int, list]:
+        copies, copied_bytes, kept = 0, 0, []
+        for game_row, game_arrays in per_game_arrays:
+            kept.append(game_arrays)
+            for col, values in game_arrays.items():
+                if not np.shares_memory(values, source[col]):
+                    copies += 1
+                    copied_bytes += values.nbytes
+            if len(game_arrays['posteam']):
+                game_from_columns(game_row.game_id, game_row.home_team, game_row.away_team, game_arrays,
+                                  validate=False)
+        return copies, copied_bytes, kept
+
+    def groupby_path() -> Tuple[int, int, list]:
+        source = pbp_df[pbp_df['game_id'].isin(game_ids) & has_posteam]
+        return build_games(
+            ((game_df.iloc[0], {col: game_df[col].to_numpy() for col in columns})
+             for _, game_df in source.groupby('game_id')),
+            column_arrays(pbp_df, columns)
+        )
+
+    def view_path() -> Tuple[int, int, list]:
+        arrays, starts, stops = _game_column_arrays(pbp_df, game_index, columns, has_posteam)
+        return build_games(
+            ((game_row, {col: values[start:stop] for col, values in arrays.items()})
+             for game_row, start, stop in zip(game_index.itertuples(index=False), starts, stops)),
+            arrays
+        )
+
+    report: Dict[str, float] = {'games': len(game_index)}
+    for name, path in [('groupby', groupby_path), ('views', view_path)]:
+        # Timed untraced, since tracing slows allocation-heavy code the most.
+        start = time.perf_counter()
+        path()
+        report[f'{name}_seconds'] = time.perf_counter() - start
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        copies, copied_bytes, kept = path()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        allocated = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'filename')
+        report[f'{name}_copied_arrays'] = copies
+        report[f'{name}_copied_bytes'] = copied_bytes
+        report[f'{name}_peak_bytes'] = peak
+        report[f'{name}_allocations'] = sum(stat.count_diff for stat in allocated)
+        report[f'{name}_allocated_bytes'] = sum(stat.size_diff for stat in allocated)
+
+    print(
+        f"Game iteration over {report['games']} games: "
+        f"groupby took {report['groupby_seconds']:.2f}s and copied {report['groupby_copied_arrays']} column arrays "
+        f"({report['groupby_copied_bytes'] / 1e6:.1f} MB, peak {report['groupby_peak_bytes'] / 1e6:.1f} MB, "
+        f"{report['groupby_allocations']} blocks held); "
+        f"views took {report['views_seconds']:.2f}s and copied {report['views_copied_arrays']} "
+        f"({report['views_copied_bytes'] / 1e6:.1f} MB, peak {report['views_peak_bytes'] / 1e6:.1f} MB, "
+        f"{report['views_allocations']} blocks held)."
+    )
+    return report
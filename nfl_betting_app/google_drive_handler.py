@@ -3,7 +3,15 @@
 
 from pydrive2.auth import GoogleAuth
 from pydrive2.drive import GoogleDrive
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 import os
+import threading
+import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import (
+    file_md5, load_manifest, partition_is_valid, partitions_to_fetch
+)
 
 # The path to your client secrets file, located in the project root.
 SECRETS_FILE = os.path.join(os.path.dirname(__file__), "..", "client_secrets.json")
@@ -46,38 +54,241 @@ def authenticate():
     return GoogleDrive(gauth)
 
 
-def upload_file_to_drive(local_file_path: str, drive_folder_id: str):
+# Files are transferred in chunks of this size so a dropped connection only
+# costs the current chunk. Must be a multiple of 256 KB for the Drive API.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Number of retries per chunk before a transfer is abandoned.
+CHUNK_RETRIES = 3
+
+
+class PyDriveBackend:
     """
-    Uploads a local file to a specific folder in Google Drive. If the file
-    already exists, it updates it.
+    Drive backend that talks to Google Drive through an authenticated pydrive2 session.
+
+    Every backend exposes the same three operations (`list_folder`, `upload`,
+    `download`) so `DriveSync` can run against a fake backend in tests.
     """
-    try:
-        print("Authenticating with Google Drive for upload...")
-        drive = authenticate()
-        print("Authentication successful.")
 
-        file_name = os.path.basename(local_file_path)
+    def __init__(self, drive: GoogleDrive):
+        self.drive = drive
+        self._local = threading.local()
 
-        file_list = drive.ListFile({
-            "q": f"'{drive_folder_id}' in parents and title='{file_name}' and trashed=false"
+    def _http(self):
+        # httplib2 connections are not thread-safe, so each worker thread gets its own.
+        if not hasattr(self._local, "http"):
+            self._local.http = self.drive.auth.Get_Http_Object()
+        return self._local.http
+
+    def list_folder(self, folder_id: str) -> List[Dict[str, Any]]:
+        """Returns metadata for every file in a folder with a single query."""
+        file_list = self.drive.ListFile({
+            "q": f"'{folder_id}' in parents and trashed=false"
         }).GetList()
+        return [dict(drive_file) for drive_file in file_list]
+
+    def upload(
+        self, local_file_path: str, folder_id: str, file_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Uploads a file with a resumable, chunked transfer. Updates `file_id` in
+        place when given, otherwise creates a new file in the folder.
+        """
+        media = MediaFileUpload(
+            local_file_path, mimetype="application/octet-stream",
+            chunksize=UPLOAD_CHUNK_SIZE, resumable=True
+        )
+        files = self.drive.auth.service.files()
+        if file_id:
+            request = files.update(fileId=file_id, media_body=media, supportsAllDrives=True)
+        else:
+            request = files.insert(
+                body={"title": os.path.basename(local_file_path), "parents": [{"id": folder_id}]},
+                media_body=media, supportsAllDrives=True
+            )
+
+        response = None
+        while response is None:
+            _, response = request.next_chunk(http=self._http(), num_retries=CHUNK_RETRIES)
+        return response
+
+    def download(self, file_id: str, local_save_path: str) -> None:
+        """Downloads a file in chunks to a local path."""
+        request = self.drive.auth.service.files().get_media(fileId=file_id)
+        request.http = self._http()
+        with open(local_save_path, "wb") as f:
+            downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk(num_retries=CHUNK_RETRIES)
+
 
-        if file_list:
-            drive_file = file_list[0]
+class DriveSync:
+    """
+    A single authenticated Drive session for keeping local folders in sync.
+
+    Authenticates once, lists each Drive folder once (caching titles and MD5
+    checksums), and only transfers files whose checksum differs.
+    """
+
+    def __init__(self, backend=None, max_workers: int = 4):
+        if backend is None:
+            print("Authenticating with Google Drive...")
+            backend = PyDriveBackend(authenticate())
+            print("Authentication successful.")
+        self.backend = backend
+        self.max_workers = max_workers
+        self._listings: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def list_folder(self, folder_id: str, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Returns the cached listing of a Drive folder, keyed by file title."""
+        with self._lock:
+            if refresh or folder_id not in self._listings:
+                self._listings[folder_id] = {
+                    drive_file["title"]: drive_file
+                    for drive_file in self.backend.list_folder(folder_id)
+                }
+            return self._listings[folder_id]
+
+    def needs_upload(self, local_file_path: str, folder_id: str) -> bool:
+        """True if the file is missing from Drive or its checksum differs."""
+        remote = self.list_folder(folder_id).get(os.path.basename(local_file_path))
+        return remote is None or remote.get("md5Checksum") != file_md5(local_file_path)
+
+    def upload_file(self, local_file_path: str, folder_id: str) -> bool:
+        """
+        Uploads a file if it changed. Returns True if bytes were transferred.
+        """
+        file_name = os.path.basename(local_file_path)
+        if not self.needs_upload(local_file_path, folder_id):
+            print(f"'{file_name}' is unchanged in Google Drive. Skipping upload.")
+            return False
+
+        remote = self.list_folder(folder_id).get(file_name)
+        if remote:
             print(f"Updating existing file '{file_name}' in Google Drive...")
-            drive_file.SetContentFile(local_file_path)
-            drive_file.Upload()
-            print("File updated successfully.")
         else:
             print(f"Uploading new file '{file_name}' to Google Drive...")
-            drive_file = drive.CreateFile({
-                "title": file_name,
-                "parents": [{"id": drive_folder_id}],
-            })
-            drive_file.SetContentFile(local_file_path)
-            drive_file.Upload()
-            print("File uploaded successfully.")
+        metadata = self.backend.upload(
+            local_file_path, folder_id, file_id=remote["id"] if remote else None
+        )
+        with self._lock:
+            self._listings[folder_id][file_name] = metadata
+        return True
+
+    def download_file(self, folder_id: str, file_name: str, local_save_path: str) -> bool:
+        """
+        Downloads a file unless an identical local copy already exists.
+        Returns False if the file is not in the Drive folder.
+        """
+        remote = self.list_folder(folder_id).get(file_name)
+        if remote is None:
+            print(f"'{file_name}' not found in the specified Google Drive folder.")
+            return False
 
+        if os.path.exists(local_save_path) and file_md5(local_save_path) == remote.get("md5Checksum"):
+            print(f"Local copy of '{file_name}' is up to date. Skipping download.")
+            return True
+
+        print(f"Downloading '{file_name}' to '{local_save_path}'...")
+        os.makedirs(os.path.dirname(os.path.abspath(local_save_path)), exist_ok=True)
+        self.backend.download(remote["id"], local_save_path)
+        return True
+
+    def upload_files(self, local_file_paths: List[str], folder_id: str) -> List[str]:
+        """
+        Uploads several files in parallel. Returns the names of the files
+        that were actually transferred.
+        """
+        # Populate the listing cache before the workers start reading it.
+        self.list_folder(folder_id)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            transferred = list(executor.map(
+                lambda path: self.upload_file(path, folder_id), local_file_paths
+            ))
+        return [
+            os.path.basename(path) for path, sent in zip(local_file_paths, transferred) if sent
+        ]
+
+    def sync_folder(self, local_dir: str, folder_id: str) -> List[str]:
+        """
+        Uploads every file in `local_dir` whose content differs from Drive.
+        Returns the names of the files that were transferred.
+        """
+        local_file_paths = sorted(
+            os.path.join(local_dir, name) for name in os.listdir(local_dir)
+            if os.path.isfile(os.path.join(local_dir, name))
+        )
+        transferred = self.upload_files(local_file_paths, folder_id)
+        print(f"Synced '{local_dir}': {len(transferred)} of {len(local_file_paths)} files transferred.")
+        return transferred
+
+    def push_partitions(
+        self,
+        folder_id: str = config.GDRIVE_RAW_DATA_FOLDER_ID,
+        partition_dir: str = config.RAW_PBP_PARTITION_DIR,
+    ) -> List[str]:
+        """
+        Uploads the partitions listed in the local manifest that changed, then
+        the manifest itself, so Drive never references a partition it lacks.
+        """
+        manifest = load_manifest(os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME))
+        partition_paths = [os.path.join(partition_dir, name) for name in sorted(manifest["partitions"])]
+        transferred = self.upload_files(partition_paths, folder_id)
+        if self.upload_file(os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME), folder_id):
+            transferred.append(config.RAW_PBP_MANIFEST_FILENAME)
+        return transferred
+
+    def restore_partitions(
+        self,
+        folder_id: str = config.GDRIVE_RAW_DATA_FOLDER_ID,
+        partition_dir: str = config.RAW_PBP_PARTITION_DIR,
+    ) -> List[str]:
+        """
+        Restores the partition store from Drive: downloads the manifest, then
+        only the partitions that are missing or differ locally. Returns the
+        names of the downloaded partitions.
+
+        Raises FileNotFoundError if Drive has no manifest and ValueError if a
+        partition fails its integrity check.
+        """
+        os.makedirs(partition_dir, exist_ok=True)
+        manifest_tmp_path = os.path.join(partition_dir, f"{config.RAW_PBP_MANIFEST_FILENAME}.remote")
+        if not self.download_file(folder_id, config.RAW_PBP_MANIFEST_FILENAME, manifest_tmp_path):
+            raise FileNotFoundError(f"No artifact manifest found in Drive folder '{folder_id}'.")
+        manifest = load_manifest(manifest_tmp_path)
+
+        to_fetch = partitions_to_fetch(manifest, partition_dir)
+        listing = self.list_folder(folder_id)
+        for file_name in to_fetch:
+            # Drive reports checksums in the listing, so a stale remote copy is caught before downloading it.
+            remote = listing.get(file_name)
+            if remote is None or remote.get("md5Checksum") != manifest["partitions"][file_name]["md5"]:
+                raise ValueError(f"Partition '{file_name}' in Drive does not match the manifest.")
+
+        def fetch(file_name: str) -> None:
+            path = os.path.join(partition_dir, file_name)
+            self.download_file(folder_id, file_name, path)
+            if not partition_is_valid(manifest["partitions"][file_name], path):
+                raise ValueError(f"Downloaded partition '{file_name}' failed its integrity check.")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(fetch, to_fetch))
+
+        # The manifest goes into place last, once every partition it lists is valid.
+        os.replace(manifest_tmp_path, os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME))
+        print(f"Restored {len(to_fetch)} of {len(manifest['partitions'])} partitions from Google Drive.")
+        return to_fetch
+
+
+def upload_file_to_drive(local_file_path: str, drive_folder_id: str):
+    """
+    Uploads a local file to a specific folder in Google Drive. If the file
+    already exists, it updates it (unless the content is unchanged).
+    """
+    try:
+        DriveSync().upload_file(local_file_path, drive_folder_id)
     except Exception as e:
         print(f"An error occurred during Google Drive upload: {e}")
 
@@ -90,23 +301,7 @@ def download_file_from_drive(
     """
     try:
         print(f"Attempting to download '{file_name}' from Google Drive...")
-        drive = authenticate()
-
-        file_list = drive.ListFile({
-            "q": f"'{drive_folder_id}' in parents and title='{file_name}' and trashed=false"
-        }).GetList()
-
-        if file_list:
-            drive_file = file_list[0]
-            print(f"File found. Downloading to '{local_save_path}'...")
-            drive_file.GetContentFile(local_save_path)
-            print("Download successful.")
-            return True
-        else:
-            print("File not found in the specified Google Drive folder.")
-            return False
-
+        return DriveSync().download_file(drive_folder_id, file_name, local_save_path)
     except Exception as e:
         print(f"An error occurred during Google Drive download: {e}")
         return False
-
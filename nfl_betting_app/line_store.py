@@ -0,0 +1,144 @@
+# nfl_betting_app/line_store.py
+# Historical spread/total quotes per game, from opening to closing line, kept
+# in one columnar file sorted by (game_id, timestamp), and an as-of join that
+# attaches the line available at a decision time to each game.
+import os
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import nfl_betting_app.config as config
+
+QUOTE_KEY = ['game_id', 'timestamp']
+QUOTE_LINES = ['spread_line', 'total_line']
+QUOTE_COLUMNS = QUOTE_KEY + QUOTE_LINES
+# Row group size of the store; lookups for a few games read few row groups.
+QUOTE_ROW_GROUP_SIZE = 256 * 1024
+
+
+def _read_quote_file(path: str) -> pd.DataFrame:
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    elif path.endswith(('.csv', '.csv.gz')):
+        df = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported quote file '{path}'. Expected .csv, .csv.gz or .parquet.")
+    missing = [col for col in QUOTE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Quote file '{path}' is missing columns: {missing}")
+    return df[QUOTE_COLUMNS]
+
+
+def _normalize_quotes(df: pd.DataFrame) -> pd.DataFrame:
+    """Compact dtypes, UTC timestamps, one quote per (game_id, timestamp), sorted."""
+    df = df.assign(
+        game_id=df['game_id'].astype(str),
+        timestamp=pd.to_datetime(df['timestamp'], utc=True),
+        spread_line=df['spread_line'].astype('float32'),
+        total_line=df['total_line'].astype('float32'),
+    )
+    # A later file's quote for the same moment replaces an earlier one.
+    df = df.drop_duplicates(subset=QUOTE_KEY, keep='last')
+    return df.sort_values(QUOTE_KEY, kind='stable').reset_index(drop=True)
+
+
+def ingest_quotes(paths: Iterable[str], store_path: str = config.LINE_QUOTES_PATH) -> int:
+    """
+    Merges quote files (CSV or Parquet with game_id, timestamp, spread_line
+    and total_line columns) into the quote store. Timestamps without a time
+    zone are taken as UTC.
+
+    Returns:
+        The number of quotes in the store.
+    """
+    frames = [pd.read_parquet(store_path)] if os.path.exists(store_path) else []
+    frames += [_read_quote_file(path) for path in paths]
+    if not frames:
+        raise ValueError("No quote files to ingest.")
+    quotes = _normalize_quotes(pd.concat(frames, ignore_index=True))
+
+    os.makedirs(os.path.dirname(store_path) or '.', exist_ok=True)
+    tmp_path = f"{store_path}.tmp"
+    quotes.to_parquet(
+        tmp_path, index=False, compression=config.PARQUET_COMPRESSION, row_group_size=QUOTE_ROW_GROUP_SIZE
+    )
+    os.replace(tmp_path, store_path)
+    print(f"Quote store saved to: {store_path} ({len(quotes)} quotes for {quotes['game_id'].nunique()} games)")
+    return len(quotes)
+
+
+def load_quotes(game_ids: Optional[List[str]] = None, store_path: str = config.LINE_QUOTES_PATH) -> pd.DataFrame:
+    """
+    Loads the quotes, optionally only for some games, sorted by
+    (game_id, timestamp). Raises FileNotFoundError if there is no store.
+    """
+    if not os.path.exists(store_path):
+        raise FileNotFoundError(f"Quote store not found at '{store_path}'. Ingest quote files first.")
+    filters = [('game_id', 'in', list(game_ids))] if game_ids is not None else None
+    return pd.read_parquet(store_path, filters=filters)
+
+
+def line_movement(quotes: pd.DataFrame) -> pd.DataFrame:
+    """Opening and closing lines and the number of quotes per game."""
+    grouped = quotes.groupby('game_id', sort=False)
+    summary = grouped[QUOTE_LINES].agg(['first', 'last'])
+    summary.columns = [f"{'opening' if agg == 'first' else 'closing'}_{line}" for line, agg in summary.columns]
+    summary['n_quotes'] = grouped.size()
+    return summary.reset_index()
+
+
+def attach_lines_as_of(
+    games_df: pd.DataFrame,
+    quotes: pd.DataFrame,
+    decision_time: Union[str, pd.Timestamp, pd.Series],
+    suffix: str = '_asof'
+) -> pd.DataFrame:
+    """
+    Adds the latest quote at or before each game's decision time, with one
+    vectorized as-of join. A game with no quote by then gets NaN lines.
+
+    Args:
+        games_df: One row per game, e.g. the output of `_merge_features_to_games`.
+        quotes: Quotes sorted by (game_id, timestamp), as from `load_quotes`.
+        decision_time: A column of `games_df`, a Series aligned with it, or
+                       one timestamp for every game. Naive times are UTC.
+        suffix: Appended to the line columns and 'line_timestamp' added.
+
+    Returns:
+        `games_df` in its original order with spread_line{suffix},
+        total_line{suffix} and line_timestamp{suffix} columns.
+    """
+    if isinstance(decision_time, str):
+        decision_time = games_df[decision_time]
+    elif not isinstance(decision_time, pd.Series):
+        decision_time = pd.Series(decision_time, index=games_df.index)
+
+    # Games are matched on integer codes, and only quotes for these games are sorted.
+    game_ids = pd.Index(games_df['game_id'].astype(str).unique())
+    left = pd.DataFrame({
+        'game': game_ids.get_indexer(games_df['game_id'].astype(str)),
+        'decision_time': pd.to_datetime(decision_time, utc=True).reset_index(drop=True),
+        'row': np.arange(len(games_df)),
+    })
+    # Games without a decision time get no line.
+    left = left[left['decision_time'].notna()].sort_values('decision_time', kind='stable')
+    # Quotes come in runs per game, so only the first quote of each run is looked up.
+    quote_game_ids = quotes['game_id'].to_numpy()
+    run_starts = np.flatnonzero(np.r_[True, quote_game_ids[1:] != quote_game_ids[:-1]])
+    run_lengths = np.diff(np.r_[run_starts, len(quote_game_ids)])
+    right = pd.DataFrame({
+        'game': np.repeat(game_ids.get_indexer(quote_game_ids[run_starts]), run_lengths),
+        'line_timestamp': quotes['timestamp'].reset_index(drop=True),
+        **{col: quotes[col].to_numpy() for col in QUOTE_LINES},
+    })
+    right = right[right['game'] >= 0].sort_values('line_timestamp', kind='stable')
+
+    joined = pd.merge_asof(
+        left, right, left_on='decision_time', right_on='line_timestamp', by='game', direction='backward'
+    ).set_index('row').reindex(np.arange(len(games_df)))
+
+    result = games_df.copy()
+    for col in QUOTE_LINES + ['line_timestamp']:
+        result[f'{col}{suffix}'] = joined[col].to_numpy()
+    return result
@@ -0,0 +1,121 @@
+# nfl_betting_app/memory_budget.py
+# Helpers for keeping the feature pipeline within a memory budget: sizing
+# season batches and reporting peak RSS per pipeline stage.
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Rough number of simultaneous copies of the play data the pipeline holds:
+# the input frame, the season-type subset, the sorted team-game table and the
+# merge outputs.
+PIPELINE_MEMORY_FACTOR = 4
+# Rows sampled to size the string columns of an in-memory frame.
+FRAME_SIZE_SAMPLE_ROWS = 1000
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Returns the peak resident set size of this process so far, or None where
+    the platform does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def frame_season_bytes(pbp_df: pd.DataFrame, sample_rows: int = FRAME_SIZE_SAMPLE_ROWS) -> Dict[int, int]:
+    """
+    Estimates the in-memory size of each season of a PBP frame. Fixed-width
+    columns are sized from their dtypes; object (string) columns from
+    `sample_rows` rows spread evenly over the frame, so the estimate never
+    scans every string.
+    """
+    n_rows = max(len(pbp_df), 1)
+    sample = np.unique(np.linspace(0, len(pbp_df) - 1, min(len(pbp_df), sample_rows)).astype(np.int64))
+    frame_bytes = 0.0
+    for col, dtype in pbp_df.dtypes.items():
+        values = pbp_df[col]
+        if dtype == object and len(sample):
+            frame_bytes += values.iloc[sample].memory_usage(index=False, deep=True) / len(sample) * n_rows
+        else:
+            frame_bytes += values.memory_usage(index=False)
+    bytes_per_row = frame_bytes / n_rows
+    return {int(season): int(rows * bytes_per_row) for season, rows in pbp_df['season'].value_counts().items()}
+
+
+def partition_season_bytes(partition_dir: str, manifest: Dict[str, Any]) -> Dict[int, int]:
+    """
+    Estimates the in-memory size of each season partition from the
+    uncompressed sizes in its Parquet footer, without reading any data.
+    """
+    sizes = {}
+    for file_name, entry in manifest["partitions"].items():
+        metadata = pq.read_metadata(os.path.join(partition_dir, file_name))
+        sizes[entry["season"]] = sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    return sizes
+
+
+def plan_season_batches(
+    season_bytes: Dict[int, int], memory_budget: int, factor: int = PIPELINE_MEMORY_FACTOR
+) -> List[List[int]]:
+    """
+    Groups consecutive seasons into batches whose estimated pipeline memory
+    (size times `factor`) fits the budget. A season that alone exceeds the
+    budget still gets a batch of its own, since seasons cannot be split.
+    """
+    batches: List[List[int]] = []
+    batch_bytes = 0
+    for season in sorted(season_bytes):
+        needed = season_bytes[season] * factor
+        if batches and batch_bytes + needed <= memory_budget:
+            batches[-1].append(season)
+            batch_bytes += needed
+        else:
+            if needed > memory_budget:
+                print(f"Warning: season {season} alone needs ~{needed / 1e6:.0f} MB, over the memory budget.")
+            batches.append([season])
+            batch_bytes = needed
+    return batches
+
+
+class StageMemoryTracker:
+    """
+    Records the wall time and peak RSS after each pipeline stage. Peak RSS
+    is a process-wide high-water mark, so a stage's value includes every
+    earlier stage.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str, batch: Optional[int] = None) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        peak = peak_rss_bytes()
+        self.records.append({
+            'stage': name,
+            'batch': batch,
+            'seconds': time.perf_counter() - start,
+            'peak_rss_mb': peak / 2 ** 20 if peak is not None else None,
+        })
+
+    def summary(self) -> pd.DataFrame:
+        """Returns one row per stage with its total time and highest peak RSS."""
+        df = pd.DataFrame(self.records, columns=['stage', 'batch', 'seconds', 'peak_rss_mb'])
+        return df.groupby('stage', sort=False).agg(
+            batches=('batch', 'count'), seconds=('seconds', 'sum'), peak_rss_mb=('peak_rss_mb', 'max')
+        ).reset_index()
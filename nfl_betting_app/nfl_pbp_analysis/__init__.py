@@ -2,7 +2,11 @@
 
 # Expose the data models and factory at the top level of the library
 from .pbp_data_models import Game, Play, Touchdown, TeamSide, TouchdownType
-from .pbp_data_models_factories import game_from_single_game_dataframe
+from .pbp_data_models_factories import game_from_single_game_dataframe, game_from_columns
+from .validation import validate_pbp_frame, PbpValidationReport, Violation
+from .online import GameAccumulator, ACCUMULATED_STATS
+from .serialization import GameArchive, save_games, load_games
+from .drive_stats import segment_drives, calculate_drives, calculate_drive_stats, DRIVE_STATS
 
 # Expose the analysis functions
 from .score_analysis import (
@@ -24,4 +28,12 @@ from .down_conversion_rate import (
     fourth_down_conversion_rate,
     third_down_conversion_rate_allowed,
     fourth_down_conversion_rate_allowed
-)
\ No newline at end of file
+)
+from .split_stats import (
+    calculate_split_stats,
+    pivot_split_stats,
+    register_split,
+    register_split_stat,
+    SPLITS,
+    SPLIT_STATS
+)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+# Per-team-game drive stats; each offensive stat has an '_allowed' twin
+# computed from the opponent's drives.
+DRIVE_OFFENCE_STATS = ['plays_per_drive', 'yards_per_drive', 'points_per_drive', 'td_drive_rate']
+DRIVE_STATS = DRIVE_OFFENCE_STATS + [f'{stat}_allowed' for stat in DRIVE_OFFENCE_STATS]
+
+# Optional scoring columns of the raw data: (column, scoring value, points).
+_KICK_POINTS = [
+    ('field_goal_result', 'made', 3.0),
+    ('extra_point_result', 'good', 1.0),
+    ('two_point_conv_result', 'success', 2.0),
+]
+
+
+def _sorted_plays(plays: pd.DataFrame) -> pd.DataFrame:
+    """Plays in game order; frames from the partition store already are."""
+    if 'play_id' in plays.columns:
+        return plays.sort_values(['game_id', 'play_id'], kind='stable')
+    return plays
+
+
+def segment_drives(plays: pd.DataFrame, use_drive_column: bool = True) -> np.ndarray:
+    """
+    Labels each play of game-ordered plays with a drive number, by run-length
+    encoding possession: a drive starts at the first play of a game and
+    whenever posteam changes (or the raw 'drive' column changes, when present
+    and `use_drive_column` is set). Plays without posteam get -1 and do not
+    break a drive.
+
+    Returns:
+        Drive numbers, 0-based and increasing across the whole frame.
+    """
+    has_posteam = plays['posteam'].notna().to_numpy()
+    game_ids = plays['game_id'].to_numpy()[has_posteam]
+    posteams = plays['posteam'].to_numpy()[has_posteam]
+
+    starts = np.ones(len(posteams), dtype=bool)
+    starts[1:] = (game_ids[1:] != game_ids[:-1]) | (posteams[1:] != posteams[:-1])
+    if use_drive_column and 'drive' in plays.columns:
+        drives = plays['drive'].to_numpy()[has_posteam]
+        starts[1:] |= drives[1:] != drives[:-1]
+
+    labels = np.full(len(plays), -1, dtype=np.int64)
+    labels[has_posteam] = np.cumsum(starts) - 1
+    return labels
+
+
+def _drive_points(plays: pd.DataFrame) -> pd.Series:
+    """Points scored by the offence on each play: touchdowns plus any kicks and conversions in the data."""
+    offensive_td = (plays['td_team'] == plays['posteam']) & (
+        (plays['pass_touchdown'] == 1) | (plays['rush_touchdown'] == 1) | (plays['return_touchdown'] == 1)
+    )
+    points = 6.0 * offensive_td
+    for col, made, value in _KICK_POINTS:
+        if col in plays.columns:
+            points = points + value * (plays[col] == made)
+    return points
+
+
+def calculate_drives(plays: pd.DataFrame, use_drive_column: bool = True) -> pd.DataFrame:
+    """
+    One row per drive: game_id, team (the offence), defteam, drive (1-based
+    within the game), plays, yards, points and whether it ended in a
+    touchdown. Aggregated with bincount, without a per-play Python loop.
+    """
+    plays = _sorted_plays(plays)
+    labels = segment_drives(plays, use_drive_column)
+    in_drive = labels >= 0
+    labels = labels[in_drive]
+    drive_plays = plays[in_drive]
+    n_drives = labels[-1] + 1 if len(labels) else 0
+
+    yards = (drive_plays['rushing_yards'].fillna(0) + drive_plays['passing_yards'].fillna(0)).to_numpy(dtype=float)
+    points = _drive_points(drive_plays).to_numpy(dtype=float)
+    touchdown = ((drive_plays['td_team'] == drive_plays['posteam'])
+                 & (drive_plays[['pass_touchdown', 'rush_touchdown', 'return_touchdown']] == 1).any(axis=1))
+
+    first = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    drives = drive_plays.iloc[first][['game_id', 'posteam', 'home_team', 'away_team']].reset_index(drop=True)
+    game_start = np.r_[True, drives['game_id'].to_numpy()[1:] != drives['game_id'].to_numpy()[:-1]]
+    drive_number = np.arange(n_drives) - np.maximum.accumulate(np.where(game_start, np.arange(n_drives), 0)) + 1
+
+    return pd.DataFrame({
+        'game_id': drives['game_id'],
+        'team': drives['posteam'],
+        'defteam': np.where(drives['posteam'] == drives['home_team'], drives['away_team'], drives['home_team']),
+        'drive': drive_number,
+        'plays': np.bincount(labels, minlength=n_drives),
+        'yards': np.bincount(labels, weights=yards, minlength=n_drives),
+        'points': np.bincount(labels, weights=points, minlength=n_drives),
+        'touchdown': np.bincount(labels, weights=touchdown.to_numpy(dtype=float), minlength=n_drives) > 0,
+    })
+
+
+def calculate_drive_stats(
+    plays: pd.DataFrame, drives: Optional[pd.DataFrame] = None, use_drive_column: bool = True
+) -> pd.DataFrame:
+    """
+    Per-team-game drive efficiency: one row per (game_id, team) with the
+    number of drives and the DRIVE_STATS columns (0.0 for a side with no
+    drives).
+    """
+    drives = drives if drives is not None else calculate_drives(plays, use_drive_column)
+    per_drive = drives.assign(touchdown=drives['touchdown'].astype(float))
+    aggregations = {
+        'plays_per_drive': ('plays', 'mean'),
+        'yards_per_drive': ('yards', 'mean'),
+        'points_per_drive': ('points', 'mean'),
+        'td_drive_rate': ('touchdown', 'mean'),
+    }
+    offence = per_drive.groupby(['game_id', 'team']).agg(drives=('drive', 'size'), **aggregations)
+    defence = per_drive.groupby(['game_id', 'defteam']).agg(**aggregations)
+    defence.index.names = ['game_id', 'team']
+    defence.columns = [f'{col}_allowed' for col in defence.columns]
+
+    stats = offence.join(defence, how='outer').fillna(0.0).reset_index()
+    stats['drives'] = stats['drives'].astype(int)
+    return stats[['game_id', 'team', 'drives'] + DRIVE_STATS]
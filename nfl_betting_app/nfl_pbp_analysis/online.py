@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Union
+import pandas as pd
+from .pbp_data_models import Game, Play, TeamSide, TouchdownType
+
+
+class GameAccumulator:
+    """
+    Keeps every game statistic up to date as plays are appended one at a time.
+
+    Each append updates running touchdown counts, yardage totals and the
+    third/fourth down successes and failures in O(1), so a live game can be
+    followed play by play. The snapshot methods return exactly what the batch
+    functions in score_analysis, game_statistics and down_conversion_rate
+    return for a Game holding the same plays.
+    """
+
+    def __init__(self, game_id: str, home_team: str, away_team: str):
+        self.game_id = game_id
+        self.home_team = home_team
+        self.away_team = away_team
+        self.plays: List[Play] = []
+        self._touchdowns = {td_type: {TeamSide.HOME: 0.0, TeamSide.AWAY: 0.0} for td_type in TouchdownType}
+        self._yards = {stat: {TeamSide.HOME: 0.0, TeamSide.AWAY: 0.0} for stat in ['rushing_yards', 'passing_yards']}
+        # down -> side -> [successes, failures]
+        self._downs = {down: {TeamSide.HOME: [0, 0], TeamSide.AWAY: [0, 0]} for down in [3, 4]}
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'GameAccumulator':
+        accumulator = cls(game.game_id, game.home_team, game.away_team)
+        for play in game:
+            accumulator.append(play)
+        return accumulator
+
+    def __len__(self) -> int:
+        return len(self.plays)
+
+    def _side(self, team: Optional[str]) -> Optional[TeamSide]:
+        if team == self.home_team:
+            return TeamSide.HOME
+        if team == self.away_team:
+            return TeamSide.AWAY
+        return None
+
+    def append(self, play: Play) -> None:
+        """Adds the next play of the game and updates every statistic."""
+        self.plays.append(play)
+
+        if play.touchdown is not None:
+            self._touchdowns[play.touchdown.type][play.touchdown.scoring_team] += 1
+
+        side = self._side(play.posteam)
+        if side is None:
+            return
+        for stat, totals in self._yards.items():
+            value = getattr(play, stat)
+            if not pd.isna(value):
+                totals[side] += value
+        if play.down == 3:
+            self._downs[3][side][0] += int(play.third_down_converted)
+            self._downs[3][side][1] += int(play.third_down_failed)
+        elif play.down == 4:
+            self._downs[4][side][0] += int(play.fourth_down_converted)
+            self._downs[4][side][1] += int(play.fourth_down_failed)
+
+    def to_game(self) -> Game:
+        return Game(game_id=self.game_id, home_team=self.home_team, away_team=self.away_team, plays=list(self.plays))
+
+    def _touchdown_counts(self, td_type: TouchdownType) -> Dict[TeamSide, float]:
+        return dict(self._touchdowns[td_type])
+
+    def _conversion_rate(self, down: int) -> Dict[TeamSide, float]:
+        rates = {}
+        for side, (successes, failures) in self._downs[down].items():
+            attempts = successes + failures
+            rates[side] = successes / attempts if attempts > 0 else 0.0
+        return rates
+
+    @staticmethod
+    def _flip(stats: Dict[TeamSide, float]) -> Dict[TeamSide, float]:
+        return {TeamSide.HOME: stats[TeamSide.AWAY], TeamSide.AWAY: stats[TeamSide.HOME]}
+
+    def passing_touchdowns(self) -> Dict[TeamSide, float]:
+        return self._touchdown_counts(TouchdownType.PASSING)
+
+    def rushing_touchdowns(self) -> Dict[TeamSide, float]:
+        return self._touchdown_counts(TouchdownType.RUSHING)
+
+    def defence_touchdowns(self) -> Dict[TeamSide, float]:
+        return self._touchdown_counts(TouchdownType.DEFENCE)
+
+    def special_teams_touchdowns(self) -> Dict[TeamSide, float]:
+        return self._touchdown_counts(TouchdownType.SPECIAL_TEAMS)
+
+    def passing_touchdowns_allowed(self) -> Dict[TeamSide, float]:
+        return self._flip(self.passing_touchdowns())
+
+    def rushing_touchdowns_allowed(self) -> Dict[TeamSide, float]:
+        return self._flip(self.rushing_touchdowns())
+
+    def calculate_rushing_yards_per_game(self) -> Dict[TeamSide, float]:
+        return dict(self._yards['rushing_yards'])
+
+    def calculate_passing_yards_per_game(self) -> Dict[TeamSide, float]:
+        return dict(self._yards['passing_yards'])
+
+    def calculate_rushing_yards_allowed_per_game(self) -> Dict[TeamSide, float]:
+        return self._flip(self.calculate_rushing_yards_per_game())
+
+    def calculate_passing_yards_allowed_per_game(self) -> Dict[TeamSide, float]:
+        return self._flip(self.calculate_passing_yards_per_game())
+
+    def third_down_conversion_rate(self) -> Dict[TeamSide, float]:
+        return self._conversion_rate(3)
+
+    def fourth_down_conversion_rate(self) -> Dict[TeamSide, float]:
+        return self._conversion_rate(4)
+
+    def third_down_conversion_rate_allowed(self) -> Dict[TeamSide, float]:
+        return self._flip(self.third_down_conversion_rate())
+
+    def fourth_down_conversion_rate_allowed(self) -> Dict[TeamSide, float]:
+        return self._flip(self.fourth_down_conversion_rate())
+
+    def snapshot(self) -> Dict[str, Dict[TeamSide, Union[float, int]]]:
+        """
+        Returns every statistic, keyed by the name of the batch function that
+        computes it from a complete Game.
+        """
+        return {name: getattr(self, name)() for name in ACCUMULATED_STATS}
+
+
+# The batch functions the accumulator mirrors, by name.
+ACCUMULATED_STATS = [
+    'passing_touchdowns', 'rushing_touchdowns', 'defence_touchdowns', 'special_teams_touchdowns',
+    'passing_touchdowns_allowed', 'rushing_touchdowns_allowed',
+    'calculate_rushing_yards_per_game', 'calculate_passing_yards_per_game',
+    'calculate_rushing_yards_allowed_per_game', 'calculate_passing_yards_allowed_per_game',
+    'third_down_conversion_rate', 'fourth_down_conversion_rate',
+    'third_down_conversion_rate_allowed', 'fourth_down_conversion_rate_allowed',
+]
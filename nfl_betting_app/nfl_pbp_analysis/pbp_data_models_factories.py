@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Mapping, Optional
 from .pbp_data_models import Game, Play, Touchdown, TouchdownType, TeamSide
 
 # These are the raw columns we need from the PBP data to construct our models.
@@ -12,21 +13,28 @@ REQUIRED_COLS = [
     'pass_touchdown', 'rush_touchdown', 'return_touchdown',
     'interception', 'fumble_lost', 'td_team', 'td_player_name'
 ]
+DOWN_FLAG_COLS = [
+    'third_down_converted', 'third_down_failed',
+    'fourth_down_converted', 'fourth_down_failed',
+]
 
-def _create_touchdown(row: pd.Series) -> Optional[Touchdown]:
+def _touchdown_from_values(
+    pass_touchdown, rush_touchdown, return_touchdown, interception, fumble_lost,
+    td_team, home_team, away_team, td_player_name, validate: bool = True
+) -> Optional[Touchdown]:
     """
-    Factory function to create a Touchdown object from a raw data row.
+    Creates a Touchdown object from the raw values of a single play.
     Returns None if no touchdown occurred on the play.
     """
     td_type = None
     # nfl-py uses 0/1 for these boolean-like columns
-    if row.get('pass_touchdown') == 1:
+    if pass_touchdown == 1:
         td_type = TouchdownType.PASSING
-    elif row.get('rush_touchdown') == 1:
+    elif rush_touchdown == 1:
         td_type = TouchdownType.RUSHING
-    elif row.get('return_touchdown') == 1:
+    elif return_touchdown == 1:
         # Defensive TDs are typically on interceptions or fumble returns
-        if row.get('interception') == 1 or row.get('fumble_lost') == 1:
+        if interception == 1 or fumble_lost == 1:
             td_type = TouchdownType.DEFENCE
         else:  # Otherwise, assume it's a special teams return (punt or kickoff)
             td_type = TouchdownType.SPECIAL_TEAMS
@@ -34,26 +42,44 @@ def _create_touchdown(row: pd.Series) -> Optional[Touchdown]:
     if not td_type:
         return None
 
-    scoring_team_abbr = row.get('td_team')
-    if pd.isna(scoring_team_abbr):
+    if pd.isna(td_team):
         return None
 
     scoring_team_side = None
-    if scoring_team_abbr == row.get('home_team'):
+    if td_team == home_team:
         scoring_team_side = TeamSide.HOME
-    elif scoring_team_abbr == row.get('away_team'):
+    elif td_team == away_team:
         scoring_team_side = TeamSide.AWAY
 
     if not scoring_team_side:
         return None
 
-    return Touchdown(
+    touchdown_cls = Touchdown if validate else Touchdown.model_construct
+    return touchdown_cls(
         type=td_type,
         scoring_team=scoring_team_side,
-        player_name=row.get('td_player_name')
+        player_name=td_player_name
     )
 
-def game_from_single_game_dataframe(data_frame: pd.DataFrame)-> Game: 
+def _create_touchdown(row: pd.Series) -> Optional[Touchdown]:
+    """
+    Factory function to create a Touchdown object from a raw data row.
+    Returns None if no touchdown occurred on the play.
+    """
+    return _touchdown_from_values(
+        row.get('pass_touchdown'), row.get('rush_touchdown'), row.get('return_touchdown'),
+        row.get('interception'), row.get('fumble_lost'), row.get('td_team'),
+        row.get('home_team'), row.get('away_team'), row.get('td_player_name')
+    )
+
+def game_from_single_game_dataframe(data_frame: pd.DataFrame, validate: bool = True)-> Game:
+    """
+    Builds a Game from the plays of a single game.
+
+    Pass validate=False only for frames that already passed
+    `validate_pbp_frame`; plays are then constructed without per-field
+    pydantic validation.
+    """
     if not all(col in data_frame.columns for col in REQUIRED_COLS):
         missing = [col for col in REQUIRED_COLS if col not in data_frame.columns]
         raise ValueError(f"Missing required columns to form a Game: {missing}")
@@ -61,7 +87,16 @@ def game_from_single_game_dataframe(data_frame: pd.DataFrame)-> Game:
         raise ValueError("Input DataFrame cannot be empty.")
     if data_frame['game_id'].nunique() > 1:
             raise ValueError("Input DataFrame contains data for more than one game.")
-        
+
+    if not validate:
+        return game_from_columns(
+            data_frame['game_id'].iloc[0],
+            data_frame['home_team'].iloc[0],
+            data_frame['away_team'].iloc[0],
+            {col: data_frame[col].to_numpy() for col in REQUIRED_COLS},
+            validate=False
+        )
+
     play_objects = []
     for _, row in data_frame.iterrows():
         # Start with all the raw data from the row
@@ -83,3 +118,75 @@ def game_from_single_game_dataframe(data_frame: pd.DataFrame)-> Game:
         away_team=data_frame['away_team'].iloc[0],
         plays=play_objects
     )
+
+def game_from_columns(
+    game_id: str,
+    home_team: str,
+    away_team: str,
+    columns: Mapping[str, np.ndarray],
+    rows: Optional[np.ndarray] = None,
+    validate: bool = True
+) -> Game:
+    """
+    Builds a Game from per-column arrays of a single game's plays (e.g. the
+    views yielded by `iter_game_columns`) without materialising a row Series
+    per play.
+
+    Args:
+        columns: Arrays for the play-level columns in REQUIRED_COLS.
+        rows: Optional positions of the plays to include; all plays if None.
+              An array of positions gathers a copy of every column; prefer
+              passing pre-filtered contiguous views (see
+              `iter_game_columns(keep=...)`).
+        validate: If False, the columns must already have passed
+                  `validate_pbp_frame`. Values are then converted per column
+                  and plays are built without per-field pydantic validation.
+    """
+    missing = [col for col in REQUIRED_COLS if col not in columns and col not in ('game_id', 'home_team', 'away_team')]
+    if missing:
+        raise ValueError(f"Missing required columns to form a Game: {missing}")
+
+    def values(col: str) -> list:
+        array = columns[col] if rows is None else columns[col][rows]
+        return array.tolist()
+
+    def flags(col: str) -> list:
+        array = columns[col] if rows is None else columns[col][rows]
+        return (array == 1).tolist()
+
+    if validate:
+        play_cls = Play
+        downs = values('down')
+        down_flags = [values(col) for col in DOWN_FLAG_COLS]
+    else:
+        # The frame validator guarantees downs in 1-4 and 0/1 flags, so the
+        # conversions pydantic would do per field are done once per column.
+        play_cls = Play.model_construct
+        downs = [None if pd.isna(down) else int(down) for down in values('down')]
+        down_flags = [flags(col) for col in DOWN_FLAG_COLS]
+
+    play_objects = []
+    for (posteam, down, third_conv, third_fail, fourth_conv, fourth_fail, rushing_yards, passing_yards,
+         pass_td, rush_td, return_td, interception, fumble_lost, td_team, td_player_name) in zip(
+        values('posteam'), downs, *down_flags,
+        values('rushing_yards'), values('passing_yards'),
+        values('pass_touchdown'), values('rush_touchdown'), values('return_touchdown'),
+        values('interception'), values('fumble_lost'), values('td_team'), values('td_player_name'),
+    ):
+        play_objects.append(play_cls(
+            posteam=posteam,
+            down=None if pd.isna(down) else down,
+            touchdown=_touchdown_from_values(
+                pass_td, rush_td, return_td, interception, fumble_lost,
+                td_team, home_team, away_team, td_player_name, validate=validate
+            ),
+            third_down_converted=third_conv,
+            third_down_failed=third_fail,
+            fourth_down_converted=fourth_conv,
+            fourth_down_failed=fourth_fail,
+            rushing_yards=rushing_yards,
+            passing_yards=passing_yards,
+        ))
+
+    game_cls = Game if validate else Game.model_construct
+    return game_cls(game_id=game_id, home_team=home_team, away_team=away_team, plays=play_objects)
@@ -0,0 +1,177 @@
+import bisect
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+
+from .pbp_data_models import Game, Play, TeamSide, Touchdown, TouchdownType
+
+# Plays of all games, one row per play, in game order. The game offset table
+# in the schema metadata maps each game to its [start, stop) rows.
+PLAY_SCHEMA = pa.schema([
+    ('posteam', pa.string()),
+    ('down', pa.int8()),
+    ('touchdown_type', pa.string()),
+    ('touchdown_side', pa.string()),
+    ('touchdown_player', pa.string()),
+    ('third_down_converted', pa.bool_()),
+    ('third_down_failed', pa.bool_()),
+    ('fourth_down_converted', pa.bool_()),
+    ('fourth_down_failed', pa.bool_()),
+    ('rushing_yards', pa.float64()),
+    ('passing_yards', pa.float64()),
+])
+GAME_OFFSETS_KEY = b'game_offsets'
+FORMAT_VERSION = 1
+# Games per record batch; a lookup only decodes the batches a game spans.
+GAMES_PER_BATCH = 16
+
+_TOUCHDOWN_TYPES = {td_type.value: td_type for td_type in TouchdownType}
+_TEAM_SIDES = {side.value: side for side in TeamSide}
+
+
+def _game_columns(games: List[Game]) -> Dict[str, list]:
+    columns: Dict[str, list] = {name: [] for name in PLAY_SCHEMA.names}
+    for game in games:
+        for play in game.plays:
+            td = play.touchdown
+            columns['posteam'].append(play.posteam)
+            columns['down'].append(play.down)
+            columns['touchdown_type'].append(td.type.value if td is not None else None)
+            columns['touchdown_side'].append(td.scoring_team.value if td is not None else None)
+            columns['touchdown_player'].append(td.player_name if td is not None else None)
+            columns['third_down_converted'].append(play.third_down_converted)
+            columns['third_down_failed'].append(play.third_down_failed)
+            columns['fourth_down_converted'].append(play.fourth_down_converted)
+            columns['fourth_down_failed'].append(play.fourth_down_failed)
+            columns['rushing_yards'].append(play.rushing_yards)
+            columns['passing_yards'].append(play.passing_yards)
+    return columns
+
+
+def _record_batch(games: List[Game], schema: pa.Schema) -> pa.RecordBatch:
+    columns = _game_columns(games)
+    # Missing values, NaN included, are stored as null.
+    arrays = [pa.array(columns[field.name], type=field.type, from_pandas=True) for field in PLAY_SCHEMA]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def save_games(games: Iterable[Game], path: str) -> None:
+    """
+    Writes games (typically one season) to an Arrow IPC file: the plays as
+    record batches and a game offset table for random access by game_id.
+    Missing values (NaN yardage included) are read back as None.
+    """
+    games = list(games)
+    offsets = []
+    start = 0
+    for game in games:
+        offsets.append([game.game_id, game.home_team, game.away_team, start, start + len(game.plays)])
+        start += len(game.plays)
+    schema = PLAY_SCHEMA.with_metadata({
+        GAME_OFFSETS_KEY: json.dumps({'version': FORMAT_VERSION, 'games': offsets}).encode(),
+    })
+
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        for i in range(0, len(games), GAMES_PER_BATCH):
+            writer.write_batch(_record_batch(games[i:i + GAMES_PER_BATCH], schema))
+
+
+def _plays_from_table(table: pa.Table) -> List[Play]:
+    columns = {name: table.column(name).to_pylist() for name in PLAY_SCHEMA.names}
+    plays = []
+    for (posteam, down, td_type, td_side, td_player, third_conv, third_fail, fourth_conv, fourth_fail,
+         rushing_yards, passing_yards) in zip(*(columns[name] for name in PLAY_SCHEMA.names)):
+        touchdown = None
+        if td_type is not None:
+            touchdown = Touchdown.model_construct(
+                type=_TOUCHDOWN_TYPES[td_type], scoring_team=_TEAM_SIDES[td_side], player_name=td_player
+            )
+        # The plays were valid models when saved, so validation is skipped.
+        plays.append(Play.model_construct(
+            posteam=posteam, down=down, touchdown=touchdown,
+            third_down_converted=third_conv, third_down_failed=third_fail,
+            fourth_down_converted=fourth_conv, fourth_down_failed=fourth_fail,
+            rushing_yards=rushing_yards, passing_yards=passing_yards,
+        ))
+    return plays
+
+
+class GameArchive:
+    """
+    A memory-mapped games file written by `save_games`.
+
+    Opening it reads only the game offset table. `archive[game_id]` decodes
+    just that game's plays; iterating decodes every game in file order.
+    Close it (or use it as a context manager) to release the memory map;
+    games already loaded stay valid.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._source = pa.memory_map(path, 'r')
+        self._reader = pa.ipc.open_file(self._source)
+        metadata = json.loads(self._reader.schema.metadata[GAME_OFFSETS_KEY])
+        if metadata.get('version') != FORMAT_VERSION:
+            raise ValueError(
+                f"Games file '{path}' has format version {metadata.get('version')}, expected {FORMAT_VERSION}."
+            )
+        self._games: Dict[str, Tuple[str, str, int, int]] = {
+            game_id: (home_team, away_team, start, stop)
+            for game_id, home_team, away_team, start, stop in metadata['games']
+        }
+        # First play row of each record batch, to find the batches a game spans.
+        self._batch_starts: List[int] = []
+        row = 0
+        for i in range(self._reader.num_record_batches):
+            self._batch_starts.append(row)
+            row += self._reader.get_batch(i).num_rows
+
+    def close(self) -> None:
+        self._source.close()
+
+    def __enter__(self) -> 'GameArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def game_ids(self) -> List[str]:
+        return list(self._games)
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def _rows(self, start: int, stop: int) -> pa.Table:
+        if stop == start:
+            return self._reader.schema.empty_table()
+        first = bisect.bisect_right(self._batch_starts, start) - 1
+        last = bisect.bisect_left(self._batch_starts, stop)
+        batches = [self._reader.get_batch(i) for i in range(first, last)]
+        return pa.Table.from_batches(batches).slice(start - self._batch_starts[first], stop - start)
+
+    def __getitem__(self, game_id: str) -> Game:
+        if game_id not in self._games:
+            raise KeyError(f"Game '{game_id}' is not in '{self.path}'.")
+        home_team, away_team, start, stop = self._games[game_id]
+        return Game.model_construct(
+            game_id=game_id, home_team=home_team, away_team=away_team,
+            plays=_plays_from_table(self._rows(start, stop))
+        )
+
+    def __iter__(self) -> Iterator[Game]:
+        plays = _plays_from_table(self._reader.read_all())
+        for game_id, (home_team, away_team, start, stop) in self._games.items():
+            yield Game.model_construct(game_id=game_id, home_team=home_team, away_team=away_team, plays=plays[start:stop])
+
+
+def load_games(path: str, game_ids: Optional[List[str]] = None) -> List[Game]:
+    """Loads every game in a games file, or only `game_ids` (KeyError if one is missing)."""
+    with GameArchive(path) as archive:
+        if game_ids is None:
+            return list(archive)
+        return [archive[game_id] for game_id in game_ids]
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# A column function maps the plays frame to one value (or label) per play.
+ColumnFunction = Callable[[pd.DataFrame], pd.Series]
+
+
+class SplitStat(NamedTuple):
+    """
+    A stat that can be computed for any split. Counting stats sum the
+    numerator; rate stats divide the summed numerator by the summed
+    denominator (0.0 when there were no attempts).
+    """
+    numerator: ColumnFunction
+    denominator: Optional[ColumnFunction] = None
+
+
+SPLIT_STATS: Dict[str, SplitStat] = {}
+SPLITS: Dict[str, ColumnFunction] = {}
+
+
+def register_split_stat(name: str, numerator: ColumnFunction, denominator: Optional[ColumnFunction] = None) -> None:
+    SPLIT_STATS[name] = SplitStat(numerator, denominator)
+
+
+def register_split(name: str, labeler: ColumnFunction) -> None:
+    """
+    Registers a situational dimension. The labeler returns a label per play,
+    or NaN for plays that fall outside every bucket of the dimension.
+    """
+    SPLITS[name] = labeler
+
+
+def _offensive_touchdown(plays: pd.DataFrame, flag: str) -> pd.Series:
+    return (plays[flag] == 1) & (plays['td_team'] == plays['posteam'])
+
+
+def _down_attempts(plays: pd.DataFrame, down: int, prefix: str) -> pd.Series:
+    return (plays['down'] == down) * (plays[f'{prefix}_converted'].fillna(0) + plays[f'{prefix}_failed'].fillna(0))
+
+
+register_split_stat('plays', lambda p: pd.Series(1.0, index=p.index))
+register_split_stat('rushing_yards', lambda p: p['rushing_yards'].fillna(0))
+register_split_stat('passing_yards', lambda p: p['passing_yards'].fillna(0))
+register_split_stat('yards', lambda p: p['rushing_yards'].fillna(0) + p['passing_yards'].fillna(0))
+register_split_stat('passing_tds', lambda p: _offensive_touchdown(p, 'pass_touchdown'))
+register_split_stat('rushing_tds', lambda p: _offensive_touchdown(p, 'rush_touchdown'))
+register_split_stat(
+    'td_rate',
+    lambda p: _offensive_touchdown(p, 'pass_touchdown') | _offensive_touchdown(p, 'rush_touchdown'),
+    lambda p: pd.Series(1.0, index=p.index)
+)
+register_split_stat(
+    'third_down_conv_rate',
+    lambda p: (p['down'] == 3) * p['third_down_converted'].fillna(0),
+    lambda p: _down_attempts(p, 3, 'third_down')
+)
+register_split_stat(
+    'fourth_down_conv_rate',
+    lambda p: (p['down'] == 4) * p['fourth_down_converted'].fillna(0),
+    lambda p: _down_attempts(p, 4, 'fourth_down')
+)
+
+_DOWN_NAMES = {1: '1st', 2: '2nd', 3: '3rd', 4: '4th'}
+
+register_split('quarter', lambda p: p['qtr'].map({1: 'q1', 2: 'q2', 3: 'q3', 4: 'q4'}).mask(p['qtr'] >= 5, 'ot'))
+register_split(
+    'red_zone',
+    lambda p: pd.Series(np.where(p['yardline_100'] <= 20, 'inside', 'outside'), index=p.index)
+    .where(p['yardline_100'].notna())
+)
+register_split('down', lambda p: p['down'].map(_DOWN_NAMES))
+register_split('early_down', lambda p: p['down'].map({1: 'early', 2: 'early', 3: 'late', 4: 'late'}))
+register_split(
+    'down_distance',
+    lambda p: p['down'].map(_DOWN_NAMES) + '_'
+    + pd.cut(p['ydstogo'], bins=[0, 3, 7, np.inf], labels=['short', 'medium', 'long']).astype(object)
+)
+
+
+def calculate_split_stats(
+    pbp_df: pd.DataFrame,
+    splits: Optional[List[str]] = None,
+    stats: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Computes registered stats for the possessing team across situational splits.
+
+    Every split dimension only adds a label column: the plays are stacked once
+    per dimension and all (game_id, team, split) groups for all stats are
+    reduced in a single grouped sum.
+
+    Returns:
+        A tidy DataFrame with columns game_id, team, split, stat, value, where
+        split is '<dimension>:<label>' (e.g. 'red_zone:inside').
+    """
+    splits = splits if splits is not None else list(SPLITS)
+    stats = stats if stats is not None else list(SPLIT_STATS)
+    if not splits:
+        raise ValueError("At least one split dimension is required.")
+    unknown = [name for name in splits if name not in SPLITS] + [name for name in stats if name not in SPLIT_STATS]
+    if unknown:
+        raise KeyError(f"Unknown split or stat: {unknown}")
+
+    plays = pbp_df[pbp_df['posteam'].notna()]
+    game_codes, game_ids = pd.factorize(plays['game_id'])
+    team_codes, teams = pd.factorize(plays['posteam'])
+
+    value_columns = {}
+    for name in stats:
+        spec = SPLIT_STATS[name]
+        value_columns[f'{name}__num'] = spec.numerator(plays).to_numpy(dtype=float)
+        if spec.denominator is not None:
+            value_columns[f'{name}__den'] = spec.denominator(plays).to_numpy(dtype=float)
+    values = np.column_stack(list(value_columns.values()))
+
+    # Give every (dimension, label) pair its own code in one shared code space.
+    split_names: List[str] = []
+    split_codes = []
+    for dimension in splits:
+        labels = pd.Categorical(SPLITS[dimension](plays))
+        codes = labels.codes.astype(np.int64)
+        split_codes.append(np.where(codes >= 0, codes + len(split_names), -1))
+        split_names.extend(f'{dimension}:{label}' for label in labels.categories)
+    split_codes = np.concatenate(split_codes)
+    keep = split_codes >= 0
+    rows = np.tile(np.arange(len(plays)), len(splits))[keep]
+
+    stacked = pd.DataFrame(values[rows], columns=list(value_columns))
+    stacked['game'] = game_codes[rows]
+    stacked['team'] = team_codes[rows]
+    stacked['split'] = split_codes[keep]
+    sums = stacked.groupby(['game', 'team', 'split'], sort=True).sum()
+
+    results = {}
+    for name in stats:
+        numerator = sums[f'{name}__num'].to_numpy()
+        if SPLIT_STATS[name].denominator is None:
+            results[name] = numerator
+        else:
+            denominator = sums[f'{name}__den'].to_numpy()
+            results[name] = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+    wide = pd.DataFrame({
+        'game_id': np.asarray(game_ids)[sums.index.get_level_values('game')],
+        'team': np.asarray(teams)[sums.index.get_level_values('team')],
+        'split': np.asarray(split_names, dtype=object)[sums.index.get_level_values('split')],
+        **results
+    })
+    return wide.melt(id_vars=['game_id', 'team', 'split'], value_vars=stats, var_name='stat', value_name='value')
+
+
+def pivot_split_stats(split_stats_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivots the tidy split table to one row per (game_id, team) with a
+    '<stat>__<dimension>_<label>' column per stat and split. Splits a team had
+    no plays in are filled with 0.
+    """
+    wide = split_stats_df.pivot_table(
+        index=['game_id', 'team'], columns=['stat', 'split'], values='value', aggfunc='first', fill_value=0.0
+    )
+    wide.columns = [f"{stat}__{split.replace(':', '_')}" for stat, split in wide.columns]
+    return wide.reset_index()
@@ -1,4 +1,5 @@
 from typing import Callable, Tuple, Union, Dict, Optional
+import pandas as pd
 from .pbp_data_models import Game, Play, TeamSide
 
 def aggregate_game_stats(
@@ -54,10 +55,11 @@ def count_plays_for_team(
     return aggregate_game_stats(game, processor)
 
 def sum_offense_stat_for_team(game: Game, stat_attribute: str) -> Dict[TeamSide, float]:
-    """Sums a given stat attribute for the possessing team (posteam)."""
+    """Sums a given stat attribute for the possessing team (posteam). Missing (None or NaN) values count as 0."""
 
     def processor(play: Play) -> Tuple[float, float]:
-        value = getattr(play, stat_attribute) or 0.0
+        value = getattr(play, stat_attribute)
+        value = 0.0 if pd.isna(value) else value
         if play.posteam == game.home_team:
             return (value, 0.0)
         if play.posteam == game.away_team:
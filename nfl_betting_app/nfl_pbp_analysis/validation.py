@@ -0,0 +1,102 @@
+import pandas as pd
+from pydantic import BaseModel
+from typing import List
+
+from .pbp_data_models_factories import REQUIRED_COLS, DOWN_FLAG_COLS
+
+# Flags only used to classify touchdowns, where a missing value means "no".
+TOUCHDOWN_FLAG_COLS = ['pass_touchdown', 'rush_touchdown', 'return_touchdown', 'interception', 'fumble_lost']
+NUMERIC_COLS = ['down', 'rushing_yards', 'passing_yards'] + DOWN_FLAG_COLS + TOUCHDOWN_FLAG_COLS
+TEAM_COLS = ['home_team', 'away_team', 'posteam', 'td_team']
+
+# Maximum number of offending game_ids kept per violation.
+MAX_SAMPLE_GAME_IDS = 5
+
+
+class Violation(BaseModel):
+    check: str
+    column: str
+    count: int
+    sample_game_ids: List[str] = []
+
+
+class PbpValidationReport(BaseModel):
+    rows: int
+    violations: List[Violation] = []
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.violations
+
+    def summary(self) -> str:
+        if self.is_valid:
+            return f"PBP frame is valid ({self.rows} rows)."
+        lines = [f"PBP frame has {len(self.violations)} violation(s) over {self.rows} rows:"]
+        for v in self.violations:
+            samples = f" e.g. {', '.join(v.sample_game_ids)}" if v.sample_game_ids else ""
+            lines.append(f"  - {v.check} [{v.column}]: {v.count} rows{samples}")
+        return "\n".join(lines)
+
+    def raise_if_invalid(self) -> None:
+        """Raises ValueError with the summary if any check failed."""
+        if not self.is_valid:
+            raise ValueError(self.summary())
+
+
+def _violation(df: pd.DataFrame, mask: pd.Series, check: str, column: str) -> List[Violation]:
+    count = int(mask.sum())
+    if count == 0:
+        return []
+    sample = pd.unique(df.loc[mask, 'game_id'])[:MAX_SAMPLE_GAME_IDS]
+    return [Violation(check=check, column=column, count=count, sample_game_ids=[str(g) for g in sample])]
+
+
+def validate_pbp_frame(df: pd.DataFrame) -> PbpValidationReport:
+    """
+    Validates a whole play-by-play frame at once with vectorized checks.
+
+    Checks column presence, dtypes, the domain of `down` and the 0/1 flags,
+    that each game_id has a single home/away pair, and that `td_team` is one
+    of the two teams. A frame that passes can be turned into Game objects
+    without per-play validation.
+    """
+    report = PbpValidationReport(rows=len(df))
+
+    missing = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing:
+        report.violations.append(Violation(check='missing column', column=', '.join(missing), count=len(df)))
+        # The remaining checks need every column.
+        return report
+
+    for col in NUMERIC_COLS:
+        if not pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            report.violations.append(Violation(check='non-numeric dtype', column=col, count=len(df)))
+    for col in TEAM_COLS:
+        if pd.api.types.is_numeric_dtype(df[col]) and df[col].notna().any():
+            report.violations.append(Violation(check='non-string dtype', column=col, count=len(df)))
+    if not report.is_valid:
+        return report
+
+    has_posteam = df['posteam'].notna()
+
+    report.violations += _violation(df, df['down'].notna() & ~df['down'].isin([1, 2, 3, 4]), 'down not in 1-4', 'down')
+
+    # These become boolean Play fields, so pydantic would reject anything but 0/1.
+    for col in DOWN_FLAG_COLS:
+        report.violations += _violation(df, has_posteam & ~df[col].isin([0, 1]), 'flag not 0/1', col)
+    for col in TOUCHDOWN_FLAG_COLS:
+        report.violations += _violation(df, df[col].notna() & ~df[col].isin([0, 1]), 'flag not 0/1', col)
+
+    pairs = df[['game_id', 'home_team', 'away_team']].drop_duplicates()
+    conflicting_games = pairs.loc[pairs['game_id'].duplicated(), 'game_id']
+    report.violations += _violation(
+        df, df['game_id'].isin(conflicting_games), 'multiple home/away pairs', 'game_id'
+    )
+
+    td_team = df['td_team']
+    report.violations += _violation(
+        df, td_team.notna() & (td_team != df['home_team']) & (td_team != df['away_team']),
+        'td_team not home or away', 'td_team'
+    )
+
+    return report
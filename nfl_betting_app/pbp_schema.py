@@ -0,0 +1,164 @@
+# nfl_betting_app/pbp_schema.py
+# The declared schema of the raw play-by-play partitions. nflverse column
+# sets and dtypes drift between seasons (columns added over the years,
+# all-null columns read as object, numbers stored as strings), so every
+# season is unified against this schema before it is written. All partitions
+# then share one compact schema and reads never fall back to object columns
+# for numeric data.
+#
+# Only the columns the app uses are declared. Every other raw column is kept:
+# it is stored as float64 if its values are numeric and as a string
+# otherwise, and the store remembers that type for later seasons. A column
+# with no values yet is stored as null until a season with values settles it.
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+_STRING_COLUMNS = [
+    'game_id', 'season_type', 'game_date', 'home_team', 'away_team', 'posteam', 'defteam', 'play_type',
+    'td_team', 'td_player_id', 'td_player_name',
+    'passer_player_id', 'passer_player_name', 'rusher_player_id', 'rusher_player_name',
+    'receiver_player_id', 'receiver_player_name',
+    'field_goal_result', 'extra_point_result', 'two_point_conv_result',
+]
+_INT_COLUMNS = ['season', 'week', 'play_id']
+# 0/1 indicators; NaN where nflverse leaves them undefined.
+_FLAG_COLUMNS = [
+    'third_down_converted', 'third_down_failed', 'fourth_down_converted', 'fourth_down_failed',
+    'pass_touchdown', 'rush_touchdown', 'return_touchdown', 'touchdown', 'interception', 'fumble_lost',
+    'pass_attempt', 'rush_attempt', 'sack', 'penalty',
+]
+_FLOAT_COLUMNS = [
+    'qtr', 'drive', 'down', 'ydstogo', 'yardline_100', 'game_seconds_remaining',
+    'rushing_yards', 'passing_yards', 'receiving_yards', 'yards_gained',
+    'posteam_score', 'defteam_score', 'posteam_score_post', 'defteam_score_post',
+    'spread_line', 'total_line', 'result', 'total',
+]
+
+PBP_SCHEMA = pa.schema(
+    [(col, pa.string()) for col in _STRING_COLUMNS]
+    + [(col, pa.int32()) for col in _INT_COLUMNS]
+    + [(col, pa.float32()) for col in _FLAG_COLUMNS]
+    + [(col, pa.float64()) for col in _FLOAT_COLUMNS]
+)
+# Columns a season cannot be stored without.
+PBP_REQUIRED_COLUMNS = ['game_id', 'season', 'week', 'season_type', 'home_team', 'away_team']
+
+# The types a stored column can have, by their name in the manifest.
+_STORED_TYPES = {str(t): t for t in (pa.string(), pa.int32(), pa.float32(), pa.float64(), pa.null())}
+_NUMERIC_KINDS = {'integer', 'floating', 'mixed-integer-float', 'decimal', 'boolean'}
+
+
+def _undeclared_type(values: pd.Series) -> pa.DataType:
+    """The type of a raw column, from its non-null values; null if it has none."""
+    present = values.dropna()
+    if not len(present):
+        return pa.null()
+    if pd.api.types.is_numeric_dtype(present) or pd.api.types.is_bool_dtype(present):
+        return pa.float64()
+    if pd.api.types.infer_dtype(present, skipna=True) in _NUMERIC_KINDS:
+        return pa.float64()
+    return pa.string()
+
+
+def extend_schema(schema: pa.Schema, df: pd.DataFrame) -> pa.Schema:
+    """
+    `schema` plus a field, in frame order, for each column of `df` it does
+    not have. Null fields of `schema` take the type of the column's values
+    in `df`, if it has any.
+    """
+    for col in df.columns:
+        if col not in schema.names:
+            schema = schema.append(pa.field(col, _undeclared_type(df[col])))
+        elif pa.types.is_null(schema.field(col).type):
+            schema = schema.set(schema.get_field_index(col), pa.field(col, _undeclared_type(df[col])))
+    return schema
+
+
+def schema_to_json(schema: pa.Schema) -> List[List[str]]:
+    return [[field.name, str(field.type)] for field in schema]
+
+
+def schema_from_json(fields: List[List[str]]) -> pa.Schema:
+    return pa.schema([(name, _STORED_TYPES[type_name]) for name, type_name in fields])
+
+
+def _to_arrow(values: pd.Series, field: pa.Field) -> Tuple[pa.Array, int]:
+    """
+    Converts a column to the field's type. Values that cannot be converted
+    (e.g. text in a numeric column) become null. Returns the array and the
+    number of values nulled that way.
+    """
+    if pa.types.is_null(field.type):
+        return pa.nulls(len(values)), 0
+    if pa.types.is_string(field.type):
+        present = values.notna()
+        converted = values.astype(object).where(~present, values.astype(str))
+        return pa.array(converted.where(present, None), type=field.type, from_pandas=True), 0
+
+    numeric = pd.to_numeric(values, errors='coerce')
+    coerced = int((numeric.isna() & values.notna()).sum())
+    if pa.types.is_integer(field.type):
+        if numeric.isna().any():
+            raise ValueError(f"Column '{field.name}' has missing or non-numeric values but must be an integer.")
+        return pa.array(numeric.to_numpy(dtype=np.int64), type=field.type), coerced
+    return pa.array(numeric.to_numpy(dtype=np.float64), type=field.type, from_pandas=True), coerced
+
+
+def unify_schema(
+    df: pd.DataFrame, schema: pa.Schema = PBP_SCHEMA, label: Optional[str] = None
+) -> Tuple[pa.Table, Dict[str, Any]]:
+    """
+    Casts a frame of plays to `schema`: columns of the schema missing from
+    the frame are added as nulls, and every column is converted to its type.
+    Columns the schema does not have are kept and appended to it, and null
+    columns of the schema are typed by their values (see `extend_schema`),
+    so no raw column is ever dropped.
+
+    Returns:
+        The unified Arrow table (whose schema starts with the fields of
+        `schema`) and a drift record listing the missing, added, settled
+        (null until now) and retyped columns and any values that had to be
+        nulled. The drift is also printed, prefixed
+        with `label`, when there is any.
+    """
+    missing_required = [col for col in PBP_REQUIRED_COLUMNS if col in schema.names and col not in df.columns]
+    if missing_required:
+        raise ValueError(f"Plays are missing required columns: {missing_required}")
+
+    drift: Dict[str, Any] = {
+        'missing': [field.name for field in schema if field.name not in df.columns],
+        'added': [col for col in df.columns if col not in schema.names],
+        'settled': [],
+        'retyped': {},
+        'coerced': {},
+    }
+    extended = extend_schema(schema, df)
+    drift['settled'] = [
+        field.name for field in schema
+        if pa.types.is_null(field.type) and not pa.types.is_null(extended.field(field.name).type)
+    ]
+    schema = extended
+    arrays = []
+    for field in schema:
+        if field.name not in df.columns:
+            arrays.append(pa.nulls(len(df), type=field.type))
+            continue
+        values = df[field.name]
+        array, coerced = _to_arrow(values, field)
+        if values.dtype != np.dtype(field.type.to_pandas_dtype()):
+            drift['retyped'][field.name] = str(values.dtype)
+        if coerced:
+            drift['coerced'][field.name] = coerced
+        arrays.append(array)
+
+    if drift['missing'] or drift['added'] or drift['coerced']:
+        prefix = f"{label}: " if label else ""
+        print(
+            f"  {prefix}schema drift: {len(drift['missing'])} missing columns filled with nulls, "
+            f"{len(drift['added'])} new columns added, "
+            f"{sum(drift['coerced'].values())} unconvertible values nulled."
+        )
+    return pa.Table.from_arrays(arrays, schema=schema), drift
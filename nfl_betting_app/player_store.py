@@ -0,0 +1,210 @@
+# nfl_betting_app/player_store.py
+# Player x game touchdown and yardage table with point-in-time player form,
+# indexed by (team, season) for fast "who produces for this team" lookups.
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.feature_engineering import ROLLING_WINDOWS
+from nfl_betting_app.nfl_pbp_analysis import TouchdownType
+
+# Touchdowns credited to the scoring player, one column per TouchdownType.
+TOUCHDOWN_STATS = {
+    TouchdownType.PASSING: 'passing_tds',
+    TouchdownType.RUSHING: 'rushing_tds',
+    TouchdownType.DEFENCE: 'defence_tds',
+    TouchdownType.SPECIAL_TEAMS: 'special_teams_tds',
+}
+YARDAGE_STATS = {
+    # stat: (player id column, player name column)
+    'rushing_yards': ('rusher_player_id', 'rusher_player_name'),
+    'passing_yards': ('passer_player_id', 'passer_player_name'),
+    'receiving_yards': ('receiver_player_id', 'receiver_player_name'),
+}
+PLAYER_STATS = list(YARDAGE_STATS) + list(TOUCHDOWN_STATS.values()) + ['tds_thrown', 'total_tds']
+
+PLAYERS_FILENAME = "players.parquet"
+PLAYER_GAMES_FILENAME = "player_games.parquet"
+
+
+def _touchdown_types(plays: pd.DataFrame) -> pd.Series:
+    """
+    Classifies each play's touchdown like `_touchdown_from_values`, or NaN if
+    there was none (or no valid scoring team).
+    """
+    return_td = plays['return_touchdown'] == 1
+    takeaway = (plays['interception'] == 1) | (plays['fumble_lost'] == 1)
+    td_type = pd.Series(
+        np.select(
+            [plays['pass_touchdown'] == 1, plays['rush_touchdown'] == 1, return_td & takeaway, return_td],
+            [TouchdownType.PASSING.value, TouchdownType.RUSHING.value,
+             TouchdownType.DEFENCE.value, TouchdownType.SPECIAL_TEAMS.value],
+            default=None
+        ),
+        index=plays.index
+    )
+    scoring_team_valid = (plays['td_team'] == plays['home_team']) | (plays['td_team'] == plays['away_team'])
+    return td_type.where(scoring_team_valid)
+
+
+def _player_column(plays: pd.DataFrame, id_col: str, name_col: str) -> pd.Series:
+    """Players are keyed by their ID where the data has one, else by name."""
+    return plays[id_col] if id_col in plays.columns else plays[name_col]
+
+
+def _contributions(plays: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stacks every player credit in the plays into one long frame of
+    (player_key, player_name, game_id, season, week, team, stat, value).
+    """
+    game_cols = ['game_id', 'season', 'week']
+    parts = []
+
+    def add(stat: str, id_col: str, name_col: str, team_col: str, values: pd.Series, mask: pd.Series) -> None:
+        key = _player_column(plays, id_col, name_col)
+        mask = mask & key.notna()
+        part = plays.loc[mask, game_cols].copy()
+        part['player_key'] = key[mask]
+        part['player_name'] = plays.loc[mask, name_col] if name_col in plays.columns else key[mask]
+        part['team'] = plays.loc[mask, team_col]
+        part['stat'] = stat
+        part['value'] = values[mask].astype(float)
+        parts.append(part)
+
+    for stat, (id_col, name_col) in YARDAGE_STATS.items():
+        if stat in plays.columns and (id_col in plays.columns or name_col in plays.columns):
+            add(stat, id_col, name_col, 'posteam', plays[stat].fillna(0.0), plays[stat].notna())
+
+    td_type = _touchdown_types(plays)
+    for touchdown_type, stat in TOUCHDOWN_STATS.items():
+        scored = td_type == touchdown_type.value
+        add(stat, 'td_player_id', 'td_player_name', 'td_team', scored, scored)
+        add('total_tds', 'td_player_id', 'td_player_name', 'td_team', scored, scored)
+
+    thrown = (td_type == TouchdownType.PASSING.value) & (plays['td_team'] == plays['posteam'])
+    add('tds_thrown', 'passer_player_id', 'passer_player_name', 'posteam', thrown, thrown)
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def _add_player_form(player_games: pd.DataFrame, windows: List[int]) -> pd.DataFrame:
+    """
+    Adds season-to-date (`avg_<stat>`) and last-N-games (`l<N>_<stat>`)
+    averages over each player's earlier games that season, for all stats in
+    one pass of grouped cumulative sums.
+    """
+    df = player_games.sort_values(['player', 'season', 'week']).reset_index(drop=True)
+    values = df[PLAYER_STATS].to_numpy(dtype=float)
+    group_start = np.r_[True, (df['player'].to_numpy()[1:] != df['player'].to_numpy()[:-1])
+                        | (df['season'].to_numpy()[1:] != df['season'].to_numpy()[:-1])]
+    group_first_row = np.maximum.accumulate(np.where(group_start, np.arange(len(df)), 0))
+    games_before = np.arange(len(df)) - group_first_row
+
+    # before[i] is the sum over all of the player's games before row i that season.
+    totals = np.cumsum(values, axis=0)
+    before = totals - values - np.vstack([np.zeros((1, values.shape[1])), totals])[group_first_row]
+
+    form = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        form.update({f'avg_{stat}': before[:, k] / games_before for k, stat in enumerate(PLAYER_STATS)})
+        for window in windows:
+            # Sum of the `window` games before row i, clipped to the season's first game.
+            lag = np.clip(games_before - window, 0, None)
+            lag_rows = group_first_row + lag
+            window_sum = before - before[lag_rows]
+            count = games_before - lag
+            form.update({f'l{window}_{stat}': window_sum[:, k] / count for k, stat in enumerate(PLAYER_STATS)})
+
+    form_df = pd.DataFrame(form, index=df.index).fillna(0.0)
+    return pd.concat([df, form_df], axis=1)
+
+
+class PlayerStore:
+    """
+    A compact player x game table with integer player codes.
+
+    `players` maps each code to the raw player_id and latest display name.
+    `player_games` holds one row per player per game (stats summed over the
+    game's plays plus leak-free form columns), sorted by team, season and
+    week so each (team, season) is a contiguous slice.
+    """
+
+    def __init__(self, players: pd.DataFrame, player_games: pd.DataFrame):
+        self.players = players
+        self.player_games = player_games.sort_values(['team', 'season', 'week', 'player']).reset_index(drop=True)
+        self._slices = self._team_season_slices(self.player_games)
+
+    @staticmethod
+    def _team_season_slices(player_games: pd.DataFrame) -> Dict[Tuple[str, int], Tuple[int, int]]:
+        teams = player_games['team'].to_numpy()
+        seasons = player_games['season'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, (teams[1:] != teams[:-1]) | (seasons[1:] != seasons[:-1])])
+        stops = np.r_[starts[1:], len(player_games)]
+        return {(teams[start], int(seasons[start])): (start, stop) for start, stop in zip(starts, stops)}
+
+    @classmethod
+    def from_pbp(
+        cls, pbp_df: pd.DataFrame, season_type: str = 'REG', windows: Optional[List[int]] = None
+    ) -> 'PlayerStore':
+        """
+        Builds the store from play-by-play data in a single grouped reduction.
+        """
+        plays = pbp_df[pbp_df['season_type'] == season_type]
+        credits = _contributions(plays).sort_values(['season', 'week'], kind='stable')
+
+        codes, keys = pd.factorize(credits['player_key'], sort=True)
+        credits['player'] = codes
+        names = credits.groupby('player')['player_name'].last().reindex(np.arange(len(keys)))
+        players = pd.DataFrame({'player': np.arange(len(keys)), 'player_id': keys, 'player_name': names.values})
+
+        player_games = credits.pivot_table(
+            index=['player', 'game_id', 'season', 'week', 'team'], columns='stat', values='value',
+            aggfunc='sum', fill_value=0.0
+        ).reindex(columns=PLAYER_STATS, fill_value=0.0).reset_index()
+        player_games.columns.name = None
+
+        return cls(players, _add_player_form(player_games, windows if windows is not None else ROLLING_WINDOWS))
+
+    def team_season(self, team: str, season: int) -> pd.DataFrame:
+        """All player-game rows for a team's season (empty if unknown)."""
+        start, stop = self._slices.get((team, season), (0, 0))
+        return self.player_games.iloc[start:stop]
+
+    def top_contributors(
+        self, team: str, season: int, week: int, stat: str = 'total_tds', n: int = 5
+    ) -> pd.DataFrame:
+        """
+        Returns a team's top `n` players by season-to-date `stat` over games
+        before `week`, with their games played and latest game week.
+        """
+        if stat not in PLAYER_STATS:
+            raise KeyError(f"Unknown player stat '{stat}'. Expected one of {PLAYER_STATS}.")
+        rows = self.team_season(team, season)
+        rows = rows[rows['week'] < week]
+        totals = rows.groupby('player').agg(
+            games=('game_id', 'size'), last_week=('week', 'max'), **{stat: (stat, 'sum')}
+        )
+        top = totals.sort_values([stat, 'games'], ascending=False).head(n).reset_index()
+        return top.merge(self.players, on='player', how='left')[
+            ['player', 'player_id', 'player_name', 'games', 'last_week', stat]
+        ]
+
+    def save(self, store_dir: str = config.PLAYER_STORE_DIR) -> None:
+        os.makedirs(store_dir, exist_ok=True)
+        self.players.to_parquet(os.path.join(store_dir, PLAYERS_FILENAME), index=False)
+        self.player_games.to_parquet(
+            os.path.join(store_dir, PLAYER_GAMES_FILENAME), index=False, compression=config.PARQUET_COMPRESSION
+        )
+
+    @classmethod
+    def load(cls, store_dir: str = config.PLAYER_STORE_DIR) -> 'PlayerStore':
+        """
+        Loads a saved store. Raises FileNotFoundError if it does not exist.
+        """
+        return cls(
+            pd.read_parquet(os.path.join(store_dir, PLAYERS_FILENAME)),
+            pd.read_parquet(os.path.join(store_dir, PLAYER_GAMES_FILENAME))
+        )
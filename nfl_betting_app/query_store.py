@@ -0,0 +1,166 @@
+# nfl_betting_app/query_store.py
+# An indexed DuckDB file holding the team-game stats, the point-in-time team
+# features and the game-level feature set, with point and range lookups that
+# read only the rows they need.
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+
+import nfl_betting_app.config as config
+
+WeekRange = Tuple[int, int]
+
+# table: (key columns, indexed column groups). Rows are stored sorted by the
+# first index, so range scans over a team's weeks touch contiguous blocks.
+QUERY_TABLES = {
+    'team_game_stats': (['game_id', 'team', 'season', 'week'], [['team', 'season', 'week'], ['game_id']]),
+    'team_features': (['game_id', 'team', 'season', 'week'], [['team', 'season', 'week'], ['game_id']]),
+    'game_features': (['game_id', 'season', 'week', 'home_team', 'away_team'], [['season', 'week'], ['game_id']]),
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class QueryStore:
+    """
+    Read-only access to a query store file built with `QueryStore.build`.
+
+    Raises FileNotFoundError if the store does not exist. Unknown column
+    names raise KeyError.
+    """
+
+    def __init__(self, path: str = config.QUERY_STORE_PATH):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Query store '{path}' does not exist.")
+        self.path = path
+        self.con = duckdb.connect(path, read_only=True)
+        self._columns = {
+            table: [row[0] for row in self.con.execute(f"DESCRIBE {table}").fetchall()]
+            for table in QUERY_TABLES
+        }
+
+    @classmethod
+    def build(
+        cls,
+        team_game_stats_df: pd.DataFrame,
+        team_features_df: pd.DataFrame,
+        game_features_df: Optional[pd.DataFrame] = None,
+        path: str = config.QUERY_STORE_PATH
+    ) -> 'QueryStore':
+        """
+        Writes the frames into a fresh store and indexes them. The store is
+        built next to `path` and renamed into place, so readers never see a
+        half-written file.
+        """
+        if game_features_df is None:
+            game_features_df = pd.DataFrame(columns=QUERY_TABLES['game_features'][0])
+        frames = {
+            'team_game_stats': team_game_stats_df,
+            'team_features': team_features_df,
+            'game_features': game_features_df,
+        }
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        con = duckdb.connect(tmp_path)
+        try:
+            for table, (_, indexes) in QUERY_TABLES.items():
+                con.register('frame', frames[table])
+                order = ', '.join(_quote(col) for col in indexes[0])
+                con.execute(f"CREATE TABLE {table} AS SELECT * FROM frame ORDER BY {order}")
+                con.unregister('frame')
+                for columns in indexes:
+                    con.execute(
+                        f"CREATE INDEX idx_{table}_{'_'.join(columns)} ON {table} "
+                        f"({', '.join(_quote(col) for col in columns)})"
+                    )
+        finally:
+            con.close()
+        os.replace(tmp_path, path)
+        print(f"Query store saved to: {path}")
+        return cls(path)
+
+    def close(self) -> None:
+        self.con.close()
+
+    def columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            raise KeyError(f"Unknown query store table '{table}'. Expected one of {list(QUERY_TABLES)}.")
+        return list(self._columns[table])
+
+    def _select(
+        self,
+        table: str,
+        columns: Optional[List[str]],
+        equals: Dict[str, Any],
+        weeks: Optional[WeekRange] = None
+    ) -> pd.DataFrame:
+        available = self.columns(table)
+        unknown = [col for col in columns or [] if col not in available]
+        if unknown:
+            raise KeyError(f"Unknown columns {unknown} in '{table}'.")
+        keys = QUERY_TABLES[table][0]
+        selected = available if columns is None else keys + [col for col in columns if col not in keys]
+
+        conditions = [f"{_quote(col)} = ?" for col in equals]
+        params = list(equals.values())
+        if weeks is not None:
+            conditions.append("week BETWEEN ? AND ?")
+            params += [int(weeks[0]), int(weeks[1])]
+        query = (
+            f"SELECT {', '.join(_quote(col) for col in selected)} FROM {table} "
+            f"WHERE {' AND '.join(conditions)} ORDER BY season, week"
+        )
+        return self.con.execute(query, params).df()
+
+    @staticmethod
+    def _one(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        return df.iloc[0].to_dict() if len(df) else None
+
+    def team_stats(
+        self, team: str, season: int, weeks: Optional[WeekRange] = None, stats: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        A team's per-game stats for a season, optionally limited to an
+        inclusive (first, last) week range and a subset of stat columns.
+        """
+        return self._select('team_game_stats', stats, {'team': team, 'season': int(season)}, weeks)
+
+    def team_features(
+        self, team: str, season: int, weeks: Optional[WeekRange] = None, features: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """A team's pre-game (point-in-time) features for a season, like `team_stats`."""
+        return self._select('team_features', features, {'team': team, 'season': int(season)}, weeks)
+
+    def team_game(self, game_id: str, team: str, stats: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """One team's stats for one game, or None if there is no such row."""
+        return self._one(self._select('team_game_stats', stats, {'game_id': game_id, 'team': team}))
+
+    def games(
+        self, season: int, weeks: Optional[WeekRange] = None, features: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """Rows of the game-level feature set for a season and optional week range."""
+        return self._select('game_features', features, {'season': int(season)}, weeks)
+
+    def game(self, game_id: str, features: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """One game's row of the feature set, or None if it is not stored."""
+        return self._one(self._select('game_features', features, {'game_id': game_id}))
+
+
+def build_query_store(
+    team_tables: Dict[str, pd.DataFrame],
+    feature_df: Optional[pd.DataFrame] = None,
+    path: str = config.QUERY_STORE_PATH
+) -> QueryStore:
+    """
+    Stores the team-level tables the feature pipeline built (see the
+    `team_tables` argument of `create_final_feature_set`), with the
+    game-level `feature_df`, in a query store.
+    """
+    return QueryStore.build(team_tables['team_game_stats'], team_tables['team_features'], feature_df, path=path)
@@ -0,0 +1,152 @@
+# nfl_betting_app/ratings.py
+# Opponent-adjusted team ratings, refit before every week of the schedule.
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import cg
+
+# Team-game stats rated by default. The '_allowed' stats are not rated
+# separately: they are the opponent's offensive stats, so a team's defensive
+# rating for e.g. 'passing_yards' already covers 'passing_yards_allowed'.
+RATING_STATS = ['passing_yards', 'rushing_yards', 'passing_tds', 'rushing_tds', 'third_down_conv_rate']
+# Ridge penalty on every team rating, in units of games.
+RIDGE_LAMBDA = 5.0
+# The league-average intercept is left (almost) unpenalised.
+INTERCEPT_PENALTY = 1e-6
+
+
+def rating_columns(stats: List[str]) -> List[str]:
+    return [f'rtg_off_{stat}' for stat in stats] + [f'rtg_def_{stat}' for stat in stats]
+
+
+def _design_matrix(team: np.ndarray, opponent: np.ndarray, n_teams: int) -> sparse.csr_matrix:
+    """
+    One row per team-game with three non-zeros: the team's offence, the
+    opponent's defence and the league intercept.
+    """
+    n_rows = len(team)
+    columns = np.column_stack([team, n_teams + opponent, np.full(n_rows, 2 * n_teams)]).ravel()
+    return sparse.csr_matrix(
+        (np.ones(3 * n_rows), (np.repeat(np.arange(n_rows), 3), columns)), shape=(n_rows, 2 * n_teams + 1)
+    )
+
+
+def _fit_weekly(
+    df: pd.DataFrame, stats: List[str], ridge_lambda: float, season_decay: float, refit_last: bool
+) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+    """
+    Runs the week-by-week fits over `df` (sorted by season, week, game_id and
+    team). Returns the pre-game ratings of every row, the coefficients fitted
+    on the whole of `df` (only when `refit_last`; otherwise those before the
+    last week) and the teams in coefficient order.
+    """
+    codes, teams = pd.factorize(pd.concat([df['team'], df['opponent']], ignore_index=True))
+    n_teams = len(teams)
+    team, opponent = codes[:len(df)], codes[len(df):]
+    design = _design_matrix(team, opponent, n_teams)
+    penalty = sparse.diags(np.r_[np.full(2 * n_teams, ridge_lambda), INTERCEPT_PENALTY]).tocsr()
+
+    values = df[stats].to_numpy(dtype=float)
+    # Games missing a stat (NaN) are left out of that stat's fit.
+    observed = ~np.isnan(values)
+    values = np.where(observed, values, 0.0)
+    for stat, any_observed in zip(stats, observed.any(axis=0)):
+        if len(df) and not any_observed:
+            print(f"Warning: '{stat}' is missing in every game; its ratings will all be zero.")
+
+    grams = [sparse.csr_matrix((2 * n_teams + 1, 2 * n_teams + 1)) for _ in stats]
+    rhs = np.zeros((2 * n_teams + 1, len(stats)))
+    coef = np.zeros((2 * n_teams + 1, len(stats)))
+    ratings = np.zeros((len(df), 2 * len(stats)))
+
+    def solve() -> None:
+        for k in range(len(stats)):
+            coef[:, k], _ = cg(grams[k] + penalty, rhs[:, k], x0=coef[:, k])
+
+    week_keys = df['season'].to_numpy() * 100 + df['week'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, week_keys[1:] != week_keys[:-1]])
+    stops = np.r_[starts[1:], len(df)]
+    seasons = df['season'].to_numpy()
+
+    for start, stop in zip(starts, stops):
+        if start > 0 and seasons[start] != seasons[start - 1] and season_decay != 1.0:
+            grams = [gram * season_decay for gram in grams]
+            rhs *= season_decay
+
+        # Solve on every game before this week, warm-started from last week.
+        if start > 0:
+            solve()
+
+        ratings[start:stop, :len(stats)] = coef[team[start:stop]]
+        ratings[start:stop, len(stats):] = coef[n_teams + team[start:stop]]
+
+        block = design[start:stop]
+        for k in range(len(stats)):
+            weighted = block.multiply(observed[start:stop, k][:, None]).tocsr()
+            grams[k] = grams[k] + weighted.T @ weighted
+            rhs[:, k] += weighted.T @ values[start:stop, k]
+
+    if refit_last and len(df):
+        solve()
+    return ratings, coef, teams
+
+
+def calculate_weekly_ratings(
+    team_game_stats_df: pd.DataFrame,
+    stats: Optional[List[str]] = None,
+    ridge_lambda: float = RIDGE_LAMBDA,
+    season_decay: float = 1.0
+) -> pd.DataFrame:
+    """
+    Fits ridge-regularised offensive and defensive ratings before every week.
+
+    Each team-game is modelled as `stat = league + off[team] + def[opponent]`,
+    so `rtg_def_<stat>` is how much a defence adds to what its opponents
+    produce (negative is good). The ratings attached to a team-game row are
+    fitted on all games from earlier weeks only, so they are leak-free.
+
+    The normal equations are accumulated week by week, and each week's
+    conjugate gradient solve starts from the previous week's ratings, so
+    only a few iterations are needed per snapshot.
+
+    Args:
+        team_game_stats_df: The output of `_calculate_team_game_stats`.
+        stats: The stat columns to rate. Defaults to RATING_STATS.
+        ridge_lambda: Ridge penalty on each team rating.
+        season_decay: Weight kept by earlier games at each new season
+                      (1.0 keeps the whole history at full weight).
+
+    Returns:
+        A DataFrame with game_id, team, season, week and the rating columns.
+    """
+    stats = stats if stats is not None else RATING_STATS
+    df = team_game_stats_df.sort_values(['season', 'week', 'game_id', 'team']).reset_index(drop=True)
+    ratings, _, _ = _fit_weekly(df, stats, ridge_lambda, season_decay, refit_last=False)
+
+    result = df[['game_id', 'team', 'season', 'week']].copy()
+    result[rating_columns(stats)] = ratings
+    return result
+
+
+def calculate_current_ratings(
+    team_game_stats_df: pd.DataFrame,
+    stats: Optional[List[str]] = None,
+    ridge_lambda: float = RIDGE_LAMBDA,
+    season_decay: float = 1.0
+) -> pd.DataFrame:
+    """
+    The ratings every team carries into its next game: the same fit as
+    `calculate_weekly_ratings`, on all of `team_game_stats_df`.
+
+    Returns:
+        A DataFrame with one row per team and the rating columns.
+    """
+    stats = stats if stats is not None else RATING_STATS
+    df = team_game_stats_df.sort_values(['season', 'week', 'game_id', 'team']).reset_index(drop=True)
+    _, coef, teams = _fit_weekly(df, stats, ridge_lambda, season_decay, refit_last=True)
+
+    result = pd.DataFrame({'team': teams})
+    result[rating_columns(stats)] = np.hstack([coef[:len(teams)], coef[len(teams):2 * len(teams)]])
+    return result
@@ -0,0 +1,166 @@
+# nfl_betting_app/simulation.py
+# Monte Carlo game scores from the point-in-time features: each team's
+# touchdowns (every TouchdownType), extra points and field goals are drawn
+# for many simulated games at once, giving cover and total probabilities
+# against spread_line and total_line instead of a single point estimate.
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SIM_N_SIMULATIONS = 100_000
+# League field goals per team-game, scaled for each side by its expected
+# yards and third-down rate relative to the league.
+SIM_FIELD_GOALS_PER_GAME = 1.6
+SIM_EXTRA_POINT_RATE = 0.94
+
+GAME_COLUMNS = ['game_id', 'season', 'week', 'home_team', 'away_team', 'spread_line', 'total_line']
+# Per-team stats the rates are built from; offensive stats are averaged with
+# the opponent's '_allowed' twin where the feature set has one.
+_MATCHUP_STATS = ['passing_tds', 'rushing_tds', 'passing_yards', 'rushing_yards', 'third_down_conv_rate']
+_TEAM_STATS = ['defence_tds', 'special_teams_tds']
+
+
+def _feature(df: pd.DataFrame, side: str, window: str, stat: str) -> np.ndarray:
+    return df[f'{side}_{window}_{stat}'].to_numpy(dtype=np.float64)
+
+
+def _relative(values: np.ndarray, league: np.ndarray) -> np.ndarray:
+    """Values as a multiple of the league mean, which must be positive."""
+    mean = np.nanmean(league) if np.isfinite(league).any() else np.nan
+    if not mean > 0:
+        raise ValueError(f"League mean must be positive to scale field goals, got {mean}")
+    return values / mean
+
+
+def scoring_rates(feature_df: pd.DataFrame, window: str = 'avg') -> Dict[str, np.ndarray]:
+    """
+    Expected touchdowns and field goals for each side of each game, from the
+    `window` features ('avg', 'l3', ...) of the game-level feature set.
+    League means for the field goal scaling are taken over `feature_df`.
+
+    Returns:
+        Arrays 'home_tds', 'away_tds', 'home_fgs' and 'away_fgs', one value
+        per row of `feature_df` (NaN where a feature is missing).
+    """
+    required = [
+        f'{side}_{window}_{stat}{suffix}'
+        for side in ('home', 'away')
+        for stat in _MATCHUP_STATS for suffix in ('', '_allowed')
+    ] + [f'{side}_{window}_{stat}' for side in ('home', 'away') for stat in _TEAM_STATS]
+    missing = [col for col in required if col not in feature_df.columns]
+    if missing:
+        raise ValueError(f"Feature set is missing columns needed for simulation: {missing}")
+
+    def matchup(side: str, opponent: str, stat: str) -> np.ndarray:
+        return 0.5 * (_feature(feature_df, side, window, stat)
+                      + _feature(feature_df, opponent, window, f'{stat}_allowed'))
+
+    sides = (('home', 'away'), ('away', 'home'))
+    yards = {
+        side: matchup(side, opponent, 'passing_yards') + matchup(side, opponent, 'rushing_yards')
+        for side, opponent in sides
+    }
+    conv_rate = {side: matchup(side, opponent, 'third_down_conv_rate') for side, opponent in sides}
+    league_yards = np.concatenate(list(yards.values()))
+    league_conv_rate = np.concatenate(list(conv_rate.values()))
+
+    rates = {}
+    for side, opponent in sides:
+        tds = (matchup(side, opponent, 'passing_tds') + matchup(side, opponent, 'rushing_tds')
+               + _feature(feature_df, side, window, 'defence_tds')
+               + _feature(feature_df, side, window, 'special_teams_tds'))
+        fgs = (SIM_FIELD_GOALS_PER_GAME * _relative(yards[side], league_yards)
+               * _relative(conv_rate[side], league_conv_rate))
+        rates[f'{side}_tds'] = np.maximum(tds, 0.0)
+        rates[f'{side}_fgs'] = np.maximum(fgs, 0.0)
+    return rates
+
+
+def simulate_scores(
+    rates: Dict[str, np.ndarray], n_sims: int = SIM_N_SIMULATIONS, rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws `n_sims` scores for every game in `rates` at once: Poisson
+    touchdowns and field goals, and a binomial extra point per touchdown.
+    All rates must be finite.
+
+    Returns:
+        (home_points, away_points), each an int32 array of shape (games, n_sims).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    points = []
+    for side in ('home', 'away'):
+        size = (len(rates[f'{side}_tds']), n_sims)
+        tds = rng.poisson(rates[f'{side}_tds'][:, None], size=size).astype(np.int32)
+        extra_points = rng.binomial(tds, SIM_EXTRA_POINT_RATE).astype(np.int32)
+        fgs = rng.poisson(rates[f'{side}_fgs'][:, None], size=size).astype(np.int32)
+        points.append(6 * tds + extra_points + 3 * fgs)
+    return points[0], points[1]
+
+
+def _line_probabilities(values: np.ndarray, line: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per game: P(value > line), P(value == line), P(value < line); NaN without a line."""
+    above = (values > line[:, None]).mean(axis=1)
+    push = (values == line[:, None]).mean(axis=1)
+    no_line = np.isnan(line)
+    above[no_line] = push[no_line] = np.nan
+    return above, push, np.where(no_line, np.nan, 1.0 - above - push)
+
+
+def simulate_games(
+    feature_df: pd.DataFrame,
+    n_sims: int = SIM_N_SIMULATIONS,
+    window: str = 'avg',
+    seed: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Simulates every game of the feature set, one week at a time (all of a
+    week's games in a single batch of draws). The same `seed` always gives
+    the same probabilities. Games with missing features are not simulated
+    and get NaN results.
+
+    Returns:
+        One row per game with the GAME_COLUMNS, the expected points of each
+        side, the simulated margin (home minus away) and total mean and
+        standard deviation, home_win_prob, home_cover_prob / spread_push_prob
+        / away_cover_prob against spread_line, and over_prob /
+        total_push_prob / under_prob against total_line.
+    """
+    rng = np.random.default_rng(seed)
+    games = feature_df.sort_values(['season', 'week', 'game_id'], kind='stable').reset_index(drop=True)
+    rates = scoring_rates(games, window)
+    expected = {
+        side: rates[f'{side}_tds'] * (6 + SIM_EXTRA_POINT_RATE) + 3 * rates[f'{side}_fgs']
+        for side in ('home', 'away')
+    }
+
+    columns = ['margin_mean', 'margin_std', 'total_mean', 'total_std', 'home_win_prob',
+               'home_cover_prob', 'spread_push_prob', 'away_cover_prob',
+               'over_prob', 'total_push_prob', 'under_prob']
+    results = np.full((len(games), len(columns)), np.nan)
+    simulated_rows = np.isfinite(np.column_stack(list(rates.values()))).all(axis=1)
+    spread_line = games['spread_line'].to_numpy(dtype=np.float64)
+    total_line = games['total_line'].to_numpy(dtype=np.float64)
+    week_keys = games['season'].to_numpy(dtype=np.int64) * 100 + games['week'].to_numpy(dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, week_keys[1:] != week_keys[:-1], True])
+    for start, stop in zip(starts[:-1], starts[1:]):
+        rows = start + np.flatnonzero(simulated_rows[start:stop])
+        if not len(rows):
+            continue
+        home_points, away_points = simulate_scores(
+            {name: values[rows] for name, values in rates.items()}, n_sims, rng
+        )
+        margin, total = home_points - away_points, home_points + away_points
+        results[rows] = np.column_stack([
+            margin.mean(axis=1), margin.std(axis=1), total.mean(axis=1), total.std(axis=1),
+            (margin > 0).mean(axis=1),
+            *_line_probabilities(margin, spread_line[rows]),
+            *_line_probabilities(total, total_line[rows]),
+        ])
+
+    simulated = games[GAME_COLUMNS].copy()
+    simulated['home_exp_points'] = expected['home']
+    simulated['away_exp_points'] = expected['away']
+    simulated[columns] = results
+    return simulated
@@ -0,0 +1,374 @@
+# nfl_betting_app/team_state.py
+# This module maintains the latest point-in-time state for every team so that
+# feature rows for upcoming matchups can be built without re-running the full
+# feature engineering pipeline.
+import json
+import math
+import os
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.feature_engineering import (
+    STATS_TO_CALCULATE,
+    ROLLING_WINDOWS,
+    _get_all_stats_for_accumulator,
+    _get_all_stats_for_game,
+)
+from nfl_betting_app.nfl_pbp_analysis import Game, GameAccumulator, TeamSide
+from nfl_betting_app.ratings import calculate_current_ratings, rating_columns
+
+
+def _feature_names(stats: List[str]) -> List[str]:
+    """
+    Returns the point-in-time feature names in the same order that
+    `_calculate_rolling_averages` creates them.
+    """
+    names = []
+    for col in stats:
+        names.append(f'avg_{col}')
+        names.extend(f'l{window}_{col}' for window in ROLLING_WINDOWS)
+    return names
+
+
+class TeamState:
+    """
+    Running season-to-date state for a single team.
+
+    Holds the stat sums for the expanding averages and a bounded buffer per
+    rolling window, so each completed game is folded in with a constant
+    amount of work. Missing (NaN) stats are skipped, as pandas averages do.
+    """
+    __slots__ = ('team', 'season', 'week', 'games_played', 'stats', 'sums', 'counts', 'buffers')
+
+    def __init__(self, team: str, season: int, stats: Optional[List[str]] = None):
+        self.team = team
+        self.season = season
+        self.week = 0
+        self.games_played = 0
+        self.stats: List[str] = stats if stats is not None else list(STATS_TO_CALCULATE)
+        self.sums: Dict[str, float] = {stat: 0.0 for stat in self.stats}
+        self.counts: Dict[str, int] = {stat: 0 for stat in self.stats}
+        self.buffers: Dict[int, Dict[str, Deque[float]]] = {
+            window: {stat: deque(maxlen=window) for stat in self.stats}
+            for window in ROLLING_WINDOWS
+        }
+
+    def add_game(self, week: int, stats: Dict[str, float]) -> None:
+        """Folds the stats of one completed game into the state."""
+        for stat in self.stats:
+            value = float(stats[stat])
+            if not math.isnan(value):
+                self.sums[stat] += value
+                self.counts[stat] += 1
+            for window in ROLLING_WINDOWS:
+                self.buffers[window][stat].append(value)
+        self.games_played += 1
+        self.week = int(week)
+
+    def features(self) -> Dict[str, float]:
+        """
+        Returns the averages a team carries into its next game. A team with no
+        games yet this season gets zeros, matching the pipeline's fill value.
+        """
+        features = {}
+        for stat in self.stats:
+            features[f'avg_{stat}'] = (
+                self.sums[stat] / self.counts[stat] if self.counts[stat] else 0.0
+            )
+            for window in ROLLING_WINDOWS:
+                values = [value for value in self.buffers[window][stat] if not math.isnan(value)]
+                features[f'l{window}_{stat}'] = sum(values) / len(values) if values else 0.0
+        return features
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'team': self.team,
+            'season': self.season,
+            'week': self.week,
+            'games_played': self.games_played,
+            'sums': self.sums,
+            'counts': self.counts,
+            'buffers': {
+                str(window): {stat: list(values) for stat, values in stats.items()}
+                for window, stats in self.buffers.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], stats: Optional[List[str]] = None) -> 'TeamState':
+        state = cls(data['team'], int(data['season']), stats)
+        state.week = int(data['week'])
+        state.games_played = int(data['games_played'])
+        state.sums.update(data['sums'])
+        state.counts.update(data['counts'])
+        for window in ROLLING_WINDOWS:
+            for stat, values in data['buffers'].get(str(window), {}).items():
+                state.buffers[window][stat].extend(values)
+        return state
+
+
+class TeamStateTable:
+    """
+    The latest `TeamState` for every team, keyed by team abbreviation, plus
+    the opponent-adjusted ratings each team carries into its next game.
+
+    Args:
+        stats: The team-game stats to average. Defaults to STATS_TO_CALCULATE.
+        rating_stats: The stats rated in the feature set (see
+                      ratings.RATING_STATS); their rtg_ columns are part of
+                      the team features. Ratings are refit on the whole
+                      history, so they are only set by `set_ratings` and
+                      `from_team_game_stats`, not by the per-game updates.
+    """
+
+    def __init__(self, stats: Optional[List[str]] = None, rating_stats: Optional[List[str]] = None):
+        self.stats: List[str] = list(stats) if stats is not None else list(STATS_TO_CALCULATE)
+        self.rating_stats: List[str] = list(rating_stats) if rating_stats is not None else []
+        self._states: Dict[str, TeamState] = {}
+        self._ratings: Dict[str, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, team: str) -> bool:
+        return team in self._states
+
+    @property
+    def teams(self) -> List[str]:
+        return sorted(self._states)
+
+    def feature_names(self) -> List[str]:
+        """The team feature names, in the order of `team_features`."""
+        return _feature_names(self.stats) + rating_columns(self.rating_stats)
+
+    def set_ratings(self, ratings_df: pd.DataFrame) -> None:
+        """Replaces the ratings with those of `ratings.calculate_current_ratings`."""
+        columns = rating_columns(self.rating_stats)
+        self._ratings = {
+            row[0]: dict(zip(columns, map(float, row[1:])))
+            for row in ratings_df[['team'] + columns].itertuples(index=False, name=None)
+        }
+
+    def update(self, team: str, season: int, week: int, stats: Dict[str, float]) -> None:
+        """
+        Adds one completed game for a team. Games must be fed in chronological
+        order per team; a new season starts a fresh state.
+        """
+        state = self._states.get(team)
+        if state is None or state.season != season:
+            state = TeamState(team, season, self.stats)
+            self._states[team] = state
+        elif week <= state.week:
+            raise ValueError(
+                f"Game for {team} in week {week} is not after the last ingested week {state.week}."
+            )
+        state.add_game(week, stats)
+
+    def _update_both_teams(
+        self, home_team: str, away_team: str, season: int, week: int, all_stats: Dict[str, Dict[TeamSide, float]]
+    ) -> None:
+        for team, side in [(home_team, TeamSide.HOME), (away_team, TeamSide.AWAY)]:
+            stats = {stat_name: stats[side] for stat_name, stats in all_stats.items()}
+            self.update(team, season, week, stats)
+
+    def update_from_game(self, game: Game, season: int, week: int) -> None:
+        """Runs the analysis library on a completed game and ingests both teams."""
+        self._update_both_teams(game.home_team, game.away_team, season, week, _get_all_stats_for_game(game))
+
+    def update_from_accumulator(self, accumulator: GameAccumulator, season: int, week: int) -> None:
+        """
+        Ingests a game followed live with a GameAccumulator once it is over,
+        using its running totals instead of rescanning the plays.
+        """
+        self._update_both_teams(
+            accumulator.home_team, accumulator.away_team, season, week, _get_all_stats_for_accumulator(accumulator)
+        )
+
+    def update_from_team_game_stats(self, team_game_stats_df: pd.DataFrame) -> None:
+        """
+        Ingests rows shaped like the output of `_calculate_team_game_stats`.
+        """
+        df = team_game_stats_df.sort_values(by=['season', 'week'], kind='stable')
+        columns = ['team', 'season', 'week'] + self.stats
+        for row in df[columns].itertuples(index=False, name=None):
+            team, season, week = row[0], int(row[1]), int(row[2])
+            self.update(team, season, week, dict(zip(self.stats, row[3:])))
+
+    @classmethod
+    def from_team_game_stats(
+        cls,
+        team_game_stats_df: pd.DataFrame,
+        stats: Optional[List[str]] = None,
+        rating_stats: Optional[List[str]] = None
+    ) -> 'TeamStateTable':
+        """
+        Builds the table from the complete team-game history, fitting the
+        current ratings when `rating_stats` are given.
+        """
+        table = cls(stats, rating_stats)
+        table.update_from_team_game_stats(team_game_stats_df)
+        if table.rating_stats:
+            table.set_ratings(calculate_current_ratings(team_game_stats_df, table.rating_stats))
+        return table
+
+    @classmethod
+    def from_team_tables(cls, team_tables: Dict[str, pd.DataFrame]) -> 'TeamStateTable':
+        """
+        Builds the table from the team tables the feature pipeline filled (see
+        the `team_tables` argument of `create_final_feature_set`), tracking
+        the same averaged stats and ratings as the feature set.
+        """
+        team_features = team_tables['team_features'].columns
+        stats = [col[len('avg_'):] for col in team_features if col.startswith('avg_')]
+        rating_stats = [col[len('rtg_off_'):] for col in team_features if col.startswith('rtg_off_')]
+        return cls.from_team_game_stats(team_tables['team_game_stats'], stats, rating_stats)
+
+    def team_features(self, team: str, season: int) -> Dict[str, float]:
+        """
+        Returns the point-in-time features a team carries into its next game
+        of the given season.
+        """
+        state = self._states.get(team)
+        if state is None or state.season != season:
+            state = TeamState(team, season, self.stats)
+        ratings = self._ratings.get(team, {})
+        return {**state.features(), **{col: ratings.get(col, 0.0) for col in rating_columns(self.rating_stats)}}
+
+    def matchup_features(self, home_team: str, away_team: str, season: int) -> Dict[str, float]:
+        """Builds the home_/away_ feature columns for a single scheduled game."""
+        home = self.team_features(home_team, season)
+        away = self.team_features(away_team, season)
+        return {
+            **{f'home_{name}': value for name, value in home.items()},
+            **{f'away_{name}': value for name, value in away.items()},
+        }
+
+    def build_week_features(self, schedule_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Builds feature rows for scheduled matchups.
+
+        Args:
+            schedule_df: One row per game with at least 'season', 'home_team'
+                         and 'away_team'. Any other columns (game_id, week,
+                         spread_line, ...) are carried through.
+        """
+        rows = [
+            self.matchup_features(home, away, int(season))
+            for home, away, season in zip(
+                schedule_df['home_team'], schedule_df['away_team'], schedule_df['season']
+            )
+        ]
+        columns = [f'home_{name}' for name in self.feature_names()] + [
+            f'away_{name}' for name in self.feature_names()
+        ]
+        features_df = pd.DataFrame(rows, columns=columns, index=schedule_df.index)
+        return pd.concat([schedule_df, features_df], axis=1)
+
+    def save(self, path: str = config.TEAM_STATE_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'stats': self.stats,
+                'rating_stats': self.rating_stats,
+                'ratings': self._ratings,
+                'states': [state.to_dict() for state in self._states.values()],
+            }, f)
+
+    @classmethod
+    def load(cls, path: str = config.TEAM_STATE_PATH) -> 'TeamStateTable':
+        """
+        Loads a saved table. Raises FileNotFoundError if it does not exist.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        table = cls(data['stats'], data['rating_stats'])
+        table._ratings = data['ratings']
+        for state_data in data['states']:
+            state = TeamState.from_dict(state_data, table.stats)
+            table._states[state.team] = state
+        return table
+
+
+def _make_request_handler(table: TeamStateTable):
+    """
+    Creates a request handler class bound to a team state table.
+
+    Routes:
+        GET /teams                                  -> list of known teams
+        GET /teams/<team>?season=S                  -> team features
+        GET /matchup?home=H&away=A&season=S         -> home_/away_ features
+
+    Teams the table has never seen get a 404.
+    """
+
+    class TeamStateRequestHandler(BaseHTTPRequestHandler):
+
+        def _send_json(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            parts = [part for part in url.path.split('/') if part]
+            try:
+                if parts == ['teams']:
+                    return self._send_json(200, table.teams)
+                if len(parts) == 2 and parts[0] == 'teams':
+                    if parts[1] not in table:
+                        return self._send_json(404, {'error': f"Unknown team '{parts[1]}'"})
+                    return self._send_json(200, table.team_features(parts[1], int(params['season'])))
+                if parts == ['matchup']:
+                    unknown = [team for team in (params['home'], params['away']) if team not in table]
+                    if unknown:
+                        return self._send_json(404, {'error': f"Unknown teams {unknown}"})
+                    return self._send_json(200, table.matchup_features(
+                        params['home'], params['away'], int(params['season'])
+                    ))
+            except (KeyError, ValueError) as e:
+                return self._send_json(400, {'error': f"Bad request: {e}"})
+            return self._send_json(404, {'error': f"Unknown route '{url.path}'"})
+
+        def log_message(self, format, *args):
+            # Keep the console quiet; the pipeline prints its own progress.
+            pass
+
+    return TeamStateRequestHandler
+
+
+def create_team_state_server(
+    table: TeamStateTable, host: str = '127.0.0.1', port: int = config.TEAM_STATE_SERVER_PORT
+) -> ThreadingHTTPServer:
+    """Creates (but does not start) a local HTTP server over the table."""
+    return ThreadingHTTPServer((host, port), _make_request_handler(table))
+
+
+def serve_team_state(
+    table: Optional[TeamStateTable] = None,
+    host: str = '127.0.0.1',
+    port: int = config.TEAM_STATE_SERVER_PORT,
+) -> None:
+    """Serves team state features over HTTP until interrupted."""
+    if table is None:
+        table = TeamStateTable.load()
+    server = create_team_state_server(table, host, port)
+    print(f"Serving team state for {len(table)} teams on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve_team_state()
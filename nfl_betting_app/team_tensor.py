@@ -0,0 +1,169 @@
+# nfl_betting_app/team_tensor.py
+# A dense, model-ready export of the team-game stats and point-in-time
+# features: a float32 array indexed by (season, week, team code, feature),
+# memory-mapped from disk, with a validity mask for byes and missing weeks.
+# Any team's history or any week's league state is a slice of the array.
+import json
+import os
+import re
+import shutil
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import nfl_betting_app.config as config
+
+TENSOR_VALUES_FILENAME = "values.npy"
+TENSOR_MASK_FILENAME = "mask.npy"
+TENSOR_OPPONENT_FILENAME = "opponent.npy"
+TENSOR_METADATA_FILENAME = "metadata.json"
+TENSOR_FORMAT_VERSION = 1
+
+_KEY_COLUMNS = ['game_id', 'team', 'opponent', 'season', 'week']
+# Columns known before kickoff: the expanding and last-n averages and the ratings.
+_POINT_IN_TIME_PATTERN = re.compile(r'^(avg|l\d+|rtg_off|rtg_def)_')
+
+
+def export_team_tensor(team_features_df: pd.DataFrame, path: str = config.TEAM_TENSOR_DIR) -> 'TeamTensor':
+    """
+    Writes the team-game frame from the rolling-averages step (one row per
+    team and game, with the raw stats, their point-in-time averages and any
+    ratings) as a
+    dense tensor directory at `path`:
+
+        values.npy    float32 (season, week, team, feature); NaN where invalid
+        mask.npy      bool (season, week, team); False on byes
+        opponent.npy  int16 (season, week, team) team code; -1 on byes
+        metadata.json seasons, weeks, teams (the team code order) and features
+
+    The directory is built next to `path` and renamed into place. Raises
+    ValueError if a team has more than one game in a week.
+    """
+    if team_features_df.duplicated(['season', 'week', 'team']).any():
+        raise ValueError("Team features have more than one row for a team in a week; export one season type.")
+    features = [
+        col for col in team_features_df.columns
+        if col not in _KEY_COLUMNS and pd.api.types.is_numeric_dtype(team_features_df[col])
+    ]
+    seasons = sorted(int(season) for season in team_features_df['season'].unique())
+    weeks = list(range(int(team_features_df['week'].min()), int(team_features_df['week'].max()) + 1))
+    teams = sorted(set(team_features_df['team']) | set(team_features_df['opponent'].dropna()))
+    team_codes = {team: code for code, team in enumerate(teams)}
+
+    season_idx = np.searchsorted(seasons, team_features_df['season'].to_numpy(dtype=np.int64))
+    week_idx = team_features_df['week'].to_numpy(dtype=np.int64) - weeks[0]
+    team_idx = team_features_df['team'].map(team_codes).to_numpy(dtype=np.int64)
+    shape = (len(seasons), len(weeks), len(teams))
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    values = np.lib.format.open_memmap(
+        os.path.join(tmp_path, TENSOR_VALUES_FILENAME), mode='w+', dtype=np.float32, shape=shape + (len(features),)
+    )
+    values[...] = np.nan
+    values[season_idx, week_idx, team_idx] = team_features_df[features].to_numpy(dtype=np.float32)
+    values.flush()
+    del values
+
+    mask = np.zeros(shape, dtype=bool)
+    mask[season_idx, week_idx, team_idx] = True
+    np.save(os.path.join(tmp_path, TENSOR_MASK_FILENAME), mask)
+    opponent = np.full(shape, -1, dtype=np.int16)
+    opponent[season_idx, week_idx, team_idx] = team_features_df['opponent'].map(team_codes).fillna(-1).to_numpy()
+    np.save(os.path.join(tmp_path, TENSOR_OPPONENT_FILENAME), opponent)
+
+    metadata = {
+        'format_version': TENSOR_FORMAT_VERSION,
+        'seasons': seasons,
+        'weeks': weeks,
+        'teams': teams,
+        'features': features,
+        'point_in_time_features': [col for col in features if _POINT_IN_TIME_PATTERN.match(col)],
+    }
+    with open(os.path.join(tmp_path, TENSOR_METADATA_FILENAME), 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    dims = ' x '.join(str(size) for size in shape + (len(features),))
+    print(f"Team tensor ({dims}) saved to: {path}")
+    return TeamTensor(path)
+
+
+def build_team_tensor(team_tables: Dict[str, pd.DataFrame], path: str = config.TEAM_TENSOR_DIR) -> 'TeamTensor':
+    """
+    Exports the point-in-time team features the feature pipeline built (see
+    the `team_tables` argument of `create_final_feature_set`) with
+    `export_team_tensor`.
+    """
+    return export_team_tensor(team_tables['team_features'], path)
+
+
+class TeamTensor:
+    """
+    Read-only access to a tensor directory written by `export_team_tensor`.
+    The values are memory-mapped, so opening the tensor reads only the
+    metadata and slices read only the pages they touch.
+
+    Raises FileNotFoundError if the tensor does not exist. Unknown seasons,
+    weeks, teams and features raise KeyError.
+    """
+
+    def __init__(self, path: str = config.TEAM_TENSOR_DIR):
+        metadata_path = os.path.join(path, TENSOR_METADATA_FILENAME)
+        if not os.path.exists(metadata_path):
+            raise FileNotFoundError(f"Team tensor '{path}' does not exist.")
+        with open(metadata_path) as f:
+            self.metadata: Dict[str, Any] = json.load(f)
+        if self.metadata.get('format_version') != TENSOR_FORMAT_VERSION:
+            raise ValueError(
+                f"Team tensor format version {self.metadata.get('format_version')} does not match "
+                f"expected version {TENSOR_FORMAT_VERSION}."
+            )
+        self.path = path
+        self.values: np.ndarray = np.load(os.path.join(path, TENSOR_VALUES_FILENAME), mmap_mode='r')
+        self.mask: np.ndarray = np.load(os.path.join(path, TENSOR_MASK_FILENAME), mmap_mode='r')
+        self.opponent: np.ndarray = np.load(os.path.join(path, TENSOR_OPPONENT_FILENAME), mmap_mode='r')
+        self.seasons: List[int] = self.metadata['seasons']
+        self.weeks: List[int] = self.metadata['weeks']
+        self.teams: List[str] = self.metadata['teams']
+        self.features: List[str] = self.metadata['features']
+        self._season_idx = {season: i for i, season in enumerate(self.seasons)}
+        self._week_idx = {week: i for i, week in enumerate(self.weeks)}
+        self._team_idx = {team: i for i, team in enumerate(self.teams)}
+        self._feature_idx = {feature: i for i, feature in enumerate(self.features)}
+
+    @staticmethod
+    def _lookup(index: Dict[Any, int], key: Any, kind: str) -> int:
+        if key not in index:
+            raise KeyError(f"Unknown {kind} {key!r} in team tensor.")
+        return index[key]
+
+    def team_code(self, team: str) -> int:
+        return self._lookup(self._team_idx, team, 'team')
+
+    def feature_index(self, features: List[str]) -> List[int]:
+        return [self._lookup(self._feature_idx, feature, 'feature') for feature in features]
+
+    def _select(self, array: np.ndarray, features: Optional[List[str]]) -> np.ndarray:
+        return array if features is None else array[..., self.feature_index(features)]
+
+    def team_history(self, team: str, features: Optional[List[str]] = None) -> np.ndarray:
+        """A team's (season, week, feature) history; use `mask[:, :, code]` for the weeks it played."""
+        return self._select(self.values[:, :, self.team_code(team)], features)
+
+    def week_state(self, season: int, week: int, features: Optional[List[str]] = None) -> np.ndarray:
+        """The (team, feature) state of the league in one week, rows in team code order."""
+        season_i = self._lookup(self._season_idx, int(season), 'season')
+        week_i = self._lookup(self._week_idx, int(week), 'week')
+        return self._select(self.values[season_i, week_i], features)
+
+    def cell(self, season: int, week: int, team: str, features: Optional[List[str]] = None) -> np.ndarray:
+        """One team's feature vector in one week (NaN on a bye)."""
+        return self.week_state(season, week, features)[self.team_code(team)]
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+TEAMS = ['KC', 'SF', 'BUF', 'MIA']
+# Round-robin pairings (home, away) for each regular season week.
+WEEKLY_PAIRINGS = [
+    [('KC', 'SF'), ('BUF', 'MIA')],
+    [('MIA', 'KC'), ('SF', 'BUF')],
+    [('KC', 'BUF'), ('SF', 'MIA')],
+    [('SF', 'KC'), ('MIA', 'BUF')],
+]
+
+
+def _player_names(player_ids: np.ndarray) -> np.ndarray:
+    """Display names for the synthetic player IDs, e.g. 'KC-QB' -> 'KC.QB'."""
+    return np.array([pid.replace('-', '.') if pid is not None else None for pid in player_ids], dtype=object)
+
+
+def _synthetic_game(rng: np.random.Generator, season: int, week: int, season_type: str,
+                    home: str, away: str, n_plays: int = 24) -> pd.DataFrame:
+    game_id = f'{season}_{week:02d}_{away}_{home}'
+    posteam = np.where(np.arange(n_plays) % 6 < 3, home, away).astype(object)
+    posteam[0] = None  # Game-start play without possession
+    down = np.tile([1, 2, 3, 4, 1, 2], n_plays // 6 + 1)[:n_plays].astype(float)
+    down[0] = np.nan
+    is_third, is_fourth = down == 3, down == 4
+    third_conv = (is_third & (rng.random(n_plays) < 0.4)).astype(float)
+    fourth_conv = (is_fourth & (rng.random(n_plays) < 0.5)).astype(float)
+    pass_td = (rng.random(n_plays) < 0.08).astype(float)
+    rush_td = ((rng.random(n_plays) < 0.05) & (pass_td == 0)).astype(float)
+    return_td = ((rng.random(n_plays) < 0.03) & (pass_td == 0) & (rush_td == 0)).astype(float)
+    interception = ((return_td == 1) & (rng.random(n_plays) < 0.5)).astype(float)
+    td_any = (pass_td + rush_td + return_td) > 0
+    defending = np.where(posteam == home, away, home)
+    td_team = np.where(td_any, np.where(return_td == 1, defending, posteam), None)
+    td_team[0] = None
+    rushing_yards = np.where(rng.random(n_plays) < 0.5, rng.integers(-3, 20, n_plays), np.nan)
+    passing_yards = np.where(rng.random(n_plays) < 0.5, rng.integers(-8, 40, n_plays), np.nan)
+    # Each team has one quarterback, one running back and three receivers.
+    has_team = posteam != None  # noqa: E711 (elementwise comparison)
+    rusher = np.where(has_team & ~np.isnan(rushing_yards), np.char.add(posteam.astype(str), '-RB'), None)
+    passer = np.where(has_team & ~np.isnan(passing_yards), np.char.add(posteam.astype(str), '-QB'), None)
+    receiver_ids = np.char.add(np.char.add(posteam.astype(str), '-WR'), (np.arange(n_plays) % 3 + 1).astype(str))
+    receiver = np.where(passer != None, receiver_ids, None)  # noqa: E711
+    scorer = np.where(pass_td == 1, receiver_ids, np.where(rush_td == 1, np.char.add(posteam.astype(str), '-RB'), None))
+    scorer = np.where(return_td == 1, np.char.add(defending.astype(str), '-DB'), scorer)
+    scorer = np.where(td_team != None, scorer, None)  # noqa: E711
+    result = float(rng.integers(-14, 15))
+    return pd.DataFrame({
+        'game_id': game_id,
+        'season': season,
+        'week': week,
+        'season_type': season_type,
+        'play_id': np.arange(1, n_plays + 1) * 25,
+        'home_team': home,
+        'away_team': away,
+        'posteam': posteam,
+        'qtr': np.minimum(np.arange(n_plays) * 4 // n_plays + 1, 4),
+        'drive': np.arange(n_plays) // 3 + 1,
+        'down': down,
+        'ydstogo': rng.integers(1, 15, n_plays).astype(float),
+        'yardline_100': rng.integers(1, 99, n_plays).astype(float),
+        'third_down_converted': third_conv,
+        'third_down_failed': (is_third & (third_conv == 0)).astype(float),
+        'fourth_down_converted': fourth_conv,
+        'fourth_down_failed': (is_fourth & (fourth_conv == 0)).astype(float),
+        'rushing_yards': rushing_yards,
+        'passing_yards': passing_yards,
+        'receiving_yards': np.where(receiver != None, passing_yards, np.nan),  # noqa: E711
+        'rusher_player_id': rusher,
+        'rusher_player_name': _player_names(rusher),
+        'passer_player_id': passer,
+        'passer_player_name': _player_names(passer),
+        'receiver_player_id': receiver,
+        'receiver_player_name': _player_names(receiver),
+        'pass_touchdown': pass_td,
+        'rush_touchdown': rush_td,
+        'return_touchdown': return_td,
+        'interception': interception,
+        'fumble_lost': ((return_td == 1) & (interception == 0) & (rng.random(n_plays) < 0.5)).astype(float),
+        'td_team': td_team,
+        'td_player_id': scorer,
+        'td_player_name': _player_names(scorer),
+        'spread_line': float(rng.integers(-7, 8)) + 0.5,
+        'total_line': float(rng.integers(38, 52)) + 0.5,
+        'result': result,
+    })
+
+
+def make_synthetic_pbp(seasons=(2022, 2023), seed: int = 7) -> pd.DataFrame:
+    """
+    Builds a small but realistic play-by-play frame: four teams playing a
+    four-week regular season and one playoff game per season.
+    """
+    rng = np.random.default_rng(seed)
+    games = []
+    for season in seasons:
+        for week, pairings in enumerate(WEEKLY_PAIRINGS, start=1):
+            for home, away in pairings:
+                games.append(_synthetic_game(rng, season, week, 'REG', home, away))
+        games.append(_synthetic_game(rng, season, 5, 'POST', 'KC', 'BUF'))
+    return pd.concat(games, ignore_index=True)
+
+
+@pytest.fixture
+def synthetic_pbp_df() -> pd.DataFrame:
+    return make_synthetic_pbp()
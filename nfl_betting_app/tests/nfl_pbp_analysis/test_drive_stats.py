@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.nfl_pbp_analysis import DRIVE_STATS, calculate_drive_stats, calculate_drives, segment_drives
+
+
+@pytest.fixture
+def plays() -> pd.DataFrame:
+    """
+    Game G1 (KC home, SF away): a KC touchdown drive, an SF field goal drive
+    with a timeout (no posteam) inside it, then two KC drives told apart only
+    by the raw drive column. Game G2 starts with BUF, as G1 ended with KC.
+    """
+    return pd.DataFrame({
+        'game_id': ['G1'] * 8 + ['G2'] * 2,
+        'play_id': [1, 2, 3, 4, 5, 6, 7, 8, 1, 2],
+        'home_team': ['KC'] * 8 + ['BUF'] * 2,
+        'away_team': ['SF'] * 8 + ['MIA'] * 2,
+        'posteam': ['KC', 'KC', 'SF', None, 'SF', 'KC', 'KC', 'KC', 'BUF', 'BUF'],
+        'drive': [1, 1, 2, 2, 2, 3, 4, 4, 1, 1],
+        'rushing_yards': [5.0, np.nan, 3.0, np.nan, np.nan, 2.0, 1.0, np.nan, 4.0, 6.0],
+        'passing_yards': [np.nan, 70.0, np.nan, np.nan, 20.0, np.nan, np.nan, 9.0, np.nan, np.nan],
+        'pass_touchdown': [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+        'rush_touchdown': [0] * 10,
+        'return_touchdown': [0] * 10,
+        'td_team': [None, 'KC'] + [None] * 8,
+        'field_goal_result': [None] * 4 + ['made'] + [None] * 5,
+    })
+
+
+def test_segment_drives_run_length_encodes_possession(plays: pd.DataFrame):
+    assert list(segment_drives(plays)) == [0, 0, 1, -1, 1, 2, 3, 3, 4, 4]
+    # Without the raw drive column, KC's consecutive drives merge.
+    assert list(segment_drives(plays, use_drive_column=False)) == [0, 0, 1, -1, 1, 2, 2, 2, 3, 3]
+
+
+def test_calculate_drives(plays: pd.DataFrame):
+    drives = calculate_drives(plays.iloc[::-1])  # Sorted back into game order by play_id.
+
+    assert list(drives['team']) == ['KC', 'SF', 'KC', 'KC', 'BUF']
+    assert list(drives['defteam']) == ['SF', 'KC', 'SF', 'SF', 'MIA']
+    assert list(drives['drive']) == [1, 2, 3, 4, 1]
+    assert list(drives['plays']) == [2, 2, 1, 2, 2]
+    assert list(drives['yards']) == [75.0, 23.0, 2.0, 10.0, 10.0]
+    assert list(drives['points']) == [6.0, 3.0, 0.0, 0.0, 0.0]
+    assert list(drives['touchdown']) == [True, False, False, False, False]
+
+
+def test_calculate_drive_stats_mirrors_the_opponent(plays: pd.DataFrame):
+    stats = calculate_drive_stats(plays).set_index(['game_id', 'team'])
+
+    assert list(stats.columns) == ['drives'] + DRIVE_STATS
+    assert stats.loc[('G1', 'KC'), 'drives'] == 3
+    assert stats.loc[('G1', 'KC'), 'points_per_drive'] == pytest.approx(2.0)
+    assert stats.loc[('G1', 'KC'), 'td_drive_rate'] == pytest.approx(1 / 3)
+    assert stats.loc[('G1', 'SF'), 'points_per_drive_allowed'] == pytest.approx(2.0)
+    assert stats.loc[('G1', 'KC'), 'yards_per_drive_allowed'] == pytest.approx(23.0)
+    # MIA had no drives: zero offence, BUF's drive as defence.
+    assert stats.loc[('G2', 'MIA'), 'drives'] == 0
+    assert stats.loc[('G2', 'MIA'), 'plays_per_drive_allowed'] == pytest.approx(2.0)
+
+
+def test_drives_follow_the_raw_drive_column(synthetic_pbp_df: pd.DataFrame):
+    drives = calculate_drives(synthetic_pbp_df)
+    with_posteam = synthetic_pbp_df[synthetic_pbp_df['posteam'].notna()]
+
+    assert len(drives) == len(with_posteam[['game_id', 'drive']].drop_duplicates())
+    assert drives['plays'].sum() == len(with_posteam)
@@ -71,4 +71,14 @@ def test_calculate_passing_yards_per_game(sample_game_stats: Game):
     # KC: 25 + 15 = 40
     # SF: 30 + 10 - 5 = 35
     assert yards[TeamSide.HOME] == 40.0
-    assert yards[TeamSide.AWAY] == 35.0
\ No newline at end of file
+    assert yards[TeamSide.AWAY] == 35.0
+def test_nan_yards_count_as_zero():
+    plays = [
+        Play(posteam='KC', rushing_yards=float('nan'), passing_yards=12),
+        Play(posteam='KC', rushing_yards=7, passing_yards=float('nan')),
+        Play(posteam='SF', rushing_yards=float('nan'), passing_yards=float('nan')),
+    ]
+    game = Game(game_id='nan_yards_game', home_team='KC', away_team='SF', plays=plays)
+
+    assert calculate_rushing_yards_per_game(game) == {TeamSide.HOME: 7.0, TeamSide.AWAY: 0.0}
+    assert calculate_passing_yards_per_game(game) == {TeamSide.HOME: 12.0, TeamSide.AWAY: 0.0}
@@ -0,0 +1,37 @@
+import math
+
+import pandas as pd
+import pytest
+
+import nfl_betting_app.nfl_pbp_analysis as analysis
+from nfl_betting_app.nfl_pbp_analysis import ACCUMULATED_STATS, Game, GameAccumulator, game_from_single_game_dataframe
+
+
+def _assert_same_stats(actual, expected):
+    # The synthetic plays have NaN yardage, which both sides skip.
+    assert actual == expected
+    assert not any(math.isnan(value) for value in actual.values())
+
+
+@pytest.fixture
+def games(synthetic_pbp_df: pd.DataFrame):
+    plays = synthetic_pbp_df[synthetic_pbp_df['posteam'].notna()]
+    return [game_from_single_game_dataframe(game_df) for _, game_df in plays.groupby('game_id')]
+
+
+def test_snapshot_matches_batch_functions_after_every_play(games):
+    for game in games[:4]:
+        accumulator = GameAccumulator(game.game_id, game.home_team, game.away_team)
+        for n, play in enumerate(game.plays, start=1):
+            accumulator.append(play)
+            prefix = Game(game_id=game.game_id, home_team=game.home_team, away_team=game.away_team, plays=game.plays[:n])
+            snapshot = accumulator.snapshot()
+            for name in ACCUMULATED_STATS:
+                _assert_same_stats(snapshot[name], getattr(analysis, name)(prefix))
+
+
+def test_from_game_and_to_game_round_trip(games):
+    accumulator = GameAccumulator.from_game(games[0])
+
+    assert len(accumulator) == len(games[0])
+    assert accumulator.to_game().model_dump_json() == games[0].model_dump_json()
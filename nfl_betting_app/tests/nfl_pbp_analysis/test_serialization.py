@@ -0,0 +1,85 @@
+import math
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import nfl_betting_app.nfl_pbp_analysis.serialization as serialization
+from nfl_betting_app.nfl_pbp_analysis import Game, GameArchive, Play, game_from_single_game_dataframe, load_games, save_games
+
+
+def _play_values(game: Game) -> list:
+    values = []
+    for play in game.plays:
+        dumped = play.model_dump()
+        for stat in ['rushing_yards', 'passing_yards']:
+            # Missing yardage is stored as null, so NaN is read back as None.
+            if isinstance(dumped[stat], float) and math.isnan(dumped[stat]):
+                dumped[stat] = None
+        values.append(dumped)
+    return values
+
+
+def _assert_same_game(actual: Game, expected: Game) -> None:
+    assert (actual.game_id, actual.home_team, actual.away_team) == (expected.game_id, expected.home_team, expected.away_team)
+    assert _play_values(actual) == _play_values(expected)
+
+
+@pytest.fixture
+def games(synthetic_pbp_df: pd.DataFrame):
+    plays = synthetic_pbp_df[synthetic_pbp_df['posteam'].notna()]
+    return [game_from_single_game_dataframe(game_df) for _, game_df in plays.groupby('game_id')]
+
+
+def test_round_trip_preserves_every_play(games, tmp_path, monkeypatch):
+    # Small batches so games span record batch boundaries.
+    monkeypatch.setattr(serialization, 'GAMES_PER_BATCH', 3)
+    path = str(tmp_path / 'games_2022.arrow')
+    save_games(games, path)
+
+    loaded = load_games(path)
+
+    assert len(loaded) == len(games)
+    for actual, expected in zip(loaded, games):
+        _assert_same_game(actual, expected)
+    assert any(math.isnan(play.rushing_yards) for game in games for play in game.plays
+               if play.rushing_yards is not None)
+    assert not any(math.isnan(play.rushing_yards) for game in loaded for play in game.plays
+                   if play.rushing_yards is not None)
+    assert any(play.rushing_yards is None for game in loaded for play in game.plays)
+
+
+def test_random_access_by_game_id(games, tmp_path, monkeypatch):
+    monkeypatch.setattr(serialization, 'GAMES_PER_BATCH', 3)
+    path = str(tmp_path / 'games.arrow')
+    save_games(games, path)
+    archive = GameArchive(path)
+
+    assert archive.game_ids == [game.game_id for game in games]
+    for expected in [games[0], games[4], games[-1]]:
+        _assert_same_game(archive[expected.game_id], expected)
+    with pytest.raises(KeyError, match="not in"):
+        archive['no-such-game']
+
+
+def test_loading_reads_the_memory_map_without_validating_plays(games, tmp_path, monkeypatch):
+    path = str(tmp_path / 'games.arrow')
+    save_games(games, path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("plays must not be validated on load")
+
+    # Loading builds models with model_construct, never through validation.
+    monkeypatch.setattr(Play, '__init__', fail)
+    monkeypatch.setattr(Game, '__init__', fail)
+    with GameArchive(path) as archive:
+        # Record batches are zero-copy views of the mapped file.
+        allocated = pa.total_allocated_bytes()
+        batches = [archive._reader.get_batch(i) for i in range(archive._reader.num_record_batches)]
+        assert pa.total_allocated_bytes() == allocated
+        assert sum(batch.num_rows for batch in batches) == sum(len(game.plays) for game in games)
+
+        loaded = list(archive)
+    assert archive._source.closed
+    assert [game.game_id for game in loaded] == [game.game_id for game in games]
+    _assert_same_game(loaded[-1], games[-1])
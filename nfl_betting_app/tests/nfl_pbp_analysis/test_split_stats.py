@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.nfl_pbp_analysis import (
+    calculate_split_stats, pivot_split_stats, register_split, SPLITS
+)
+
+
+@pytest.fixture
+def split_pbp_df() -> pd.DataFrame:
+    """
+    One game: KC has two red-zone plays (one TD) in Q1 and a third down in Q2;
+    SF has a single outside-the-red-zone play in Q4.
+    """
+    return pd.DataFrame({
+        'game_id': ['2023_01_SF_KC'] * 5,
+        'home_team': ['KC'] * 5,
+        'away_team': ['SF'] * 5,
+        'posteam': [None, 'KC', 'KC', 'KC', 'SF'],
+        'qtr': [1, 1, 1, 2, 4],
+        'down': [np.nan, 1, 2, 3, 1],
+        'ydstogo': [np.nan, 10, 5, 2, 10],
+        'yardline_100': [np.nan, 15, 8, 40, 60],
+        'third_down_converted': [0, 0, 0, 1, 0],
+        'third_down_failed': [0, 0, 0, 0, 0],
+        'fourth_down_converted': [0, 0, 0, 0, 0],
+        'fourth_down_failed': [0, 0, 0, 0, 0],
+        'rushing_yards': [np.nan, 7, 8, np.nan, 3],
+        'passing_yards': [np.nan, np.nan, np.nan, 12, np.nan],
+        'pass_touchdown': [0, 0, 0, 0, 0],
+        'rush_touchdown': [0, 0, 1, 0, 0],
+        'td_team': [None, None, 'KC', None, None],
+    })
+
+
+def _lookup(tidy: pd.DataFrame, team: str, split: str, stat: str) -> float:
+    row = tidy[(tidy['team'] == team) & (tidy['split'] == split) & (tidy['stat'] == stat)]
+    assert len(row) == 1
+    return row['value'].iloc[0]
+
+
+def test_calculate_split_stats_values(split_pbp_df: pd.DataFrame):
+    tidy = calculate_split_stats(split_pbp_df, splits=['quarter', 'red_zone', 'down_distance'])
+
+    assert list(tidy.columns) == ['game_id', 'team', 'split', 'stat', 'value']
+    assert _lookup(tidy, 'KC', 'quarter:q1', 'rushing_yards') == 15
+    assert _lookup(tidy, 'KC', 'quarter:q2', 'passing_yards') == 12
+    assert _lookup(tidy, 'KC', 'red_zone:inside', 'td_rate') == 0.5
+    assert _lookup(tidy, 'KC', 'down_distance:3rd_short', 'third_down_conv_rate') == 1.0
+    assert _lookup(tidy, 'SF', 'quarter:q4', 'yards') == 3
+    # The play without a posteam is not attributed to anyone.
+    assert _lookup(tidy, 'KC', 'quarter:q1', 'plays') == 2
+
+
+def test_split_totals_match_whole_game_groupby(synthetic_pbp_df: pd.DataFrame):
+    tidy = calculate_split_stats(synthetic_pbp_df, splits=['quarter', 'early_down'], stats=['passing_yards'])
+    quarter_totals = tidy[tidy['split'].str.startswith('quarter:')].groupby(['game_id', 'team'])['value'].sum()
+
+    plays = synthetic_pbp_df[synthetic_pbp_df['posteam'].notna()]
+    expected = plays.groupby(['game_id', 'posteam'])['passing_yards'].sum()
+
+    np.testing.assert_allclose(quarter_totals.sort_index().to_numpy(), expected.sort_index().to_numpy())
+
+
+def test_registered_split_is_picked_up(split_pbp_df: pd.DataFrame):
+    register_split('half', lambda p: p['qtr'].map({1: 'first', 2: 'first', 3: 'second', 4: 'second'}))
+    try:
+        tidy = calculate_split_stats(split_pbp_df, splits=['half'], stats=['plays'])
+    finally:
+        del SPLITS['half']
+
+    assert _lookup(tidy, 'KC', 'half:first', 'plays') == 3
+    assert _lookup(tidy, 'SF', 'half:second', 'plays') == 1
+
+
+def test_pivot_split_stats_fills_missing_splits(split_pbp_df: pd.DataFrame):
+    wide = pivot_split_stats(calculate_split_stats(split_pbp_df, splits=['red_zone'], stats=['yards']))
+
+    sf = wide[wide['team'] == 'SF'].iloc[0]
+    assert sf['yards__red_zone_outside'] == 3
+    assert sf['yards__red_zone_inside'] == 0
+
+
+def test_unknown_split_raises(split_pbp_df: pd.DataFrame):
+    with pytest.raises(KeyError, match="Unknown split or stat"):
+        calculate_split_stats(split_pbp_df, splits=['weather'])
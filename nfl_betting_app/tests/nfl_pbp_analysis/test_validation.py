@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.nfl_pbp_analysis import game_from_single_game_dataframe, validate_pbp_frame
+
+
+@pytest.fixture
+def valid_pbp_df() -> pd.DataFrame:
+    """Two games worth of plays that satisfy every frame-level check."""
+    return pd.DataFrame({
+        'game_id': ['2023_01_BAL_CIN'] * 3 + ['2023_01_KC_SF'] * 2,
+        'home_team': ['CIN'] * 3 + ['SF'] * 2,
+        'away_team': ['BAL'] * 3 + ['KC'] * 2,
+        'posteam': [None, 'BAL', 'CIN', 'KC', 'SF'],
+        'down': [np.nan, 3, 4, 1, 3],
+        'third_down_converted': [np.nan, 1, 0, 0, 0],
+        'third_down_failed': [np.nan, 0, 0, 0, 1],
+        'fourth_down_converted': [np.nan, 0, 1, 0, 0],
+        'fourth_down_failed': [np.nan, 0, 0, 0, 0],
+        'rushing_yards': [np.nan, 0, 3, 12, np.nan],
+        'passing_yards': [np.nan, 8, np.nan, np.nan, 4],
+        'pass_touchdown': [0, 0, 0, 0, 1],
+        'rush_touchdown': [0, 0, 1, 0, 0],
+        'return_touchdown': [0, 0, 0, 0, 0],
+        'interception': [0, 0, 0, 0, 0],
+        'fumble_lost': [0, 0, 0, 0, np.nan],
+        'td_team': [None, None, 'CIN', None, 'SF'],
+        'td_player_name': [None, None, 'J.Mixon', None, 'G.Kittle'],
+    })
+
+
+def test_valid_frame_passes(valid_pbp_df: pd.DataFrame):
+    report = validate_pbp_frame(valid_pbp_df)
+
+    assert report.is_valid
+    report.raise_if_invalid()
+
+
+def test_missing_columns_are_reported(valid_pbp_df: pd.DataFrame):
+    report = validate_pbp_frame(valid_pbp_df.drop(columns=['down', 'td_team']))
+
+    assert [v.check for v in report.violations] == ['missing column']
+    assert report.violations[0].column == 'down, td_team'
+
+
+def test_domain_violations_are_reported(valid_pbp_df: pd.DataFrame):
+    df = valid_pbp_df.copy()
+    df.loc[1, 'down'] = 5
+    df.loc[3, 'third_down_converted'] = np.nan  # A play with posteam needs a 0/1 flag
+    df.loc[4, 'td_team'] = 'LV'
+    df.loc[4, 'away_team'] = 'LV'
+
+    report = validate_pbp_frame(df)
+    checks = {(v.check, v.column): v for v in report.violations}
+
+    assert checks[('down not in 1-4', 'down')].sample_game_ids == ['2023_01_BAL_CIN']
+    assert checks[('flag not 0/1', 'third_down_converted')].count == 1
+    assert checks[('multiple home/away pairs', 'game_id')].count == 2
+    assert ('td_team not home or away', 'td_team') not in checks  # LV is now the away team in that row
+    with pytest.raises(ValueError, match="down not in 1-4"):
+        report.raise_if_invalid()
+
+
+def test_td_team_must_be_home_or_away(valid_pbp_df: pd.DataFrame):
+    df = valid_pbp_df.copy()
+    df.loc[2, 'td_team'] = 'LV'
+
+    report = validate_pbp_frame(df)
+
+    assert [(v.check, v.count) for v in report.violations] == [('td_team not home or away', 1)]
+
+
+def test_non_numeric_dtype_is_reported(valid_pbp_df: pd.DataFrame):
+    df = valid_pbp_df.astype({'passing_yards': str})
+
+    report = validate_pbp_frame(df)
+
+    assert [(v.check, v.column) for v in report.violations] == [('non-numeric dtype', 'passing_yards')]
+
+
+def test_unvalidated_game_construction_matches_validated(valid_pbp_df: pd.DataFrame):
+    plays = valid_pbp_df[valid_pbp_df['posteam'].notna()]
+    for _, game_df in plays.groupby('game_id'):
+        validated = game_from_single_game_dataframe(game_df)
+        unvalidated = game_from_single_game_dataframe(game_df, validate=False)
+        assert unvalidated.model_dump_json() == validated.model_dump_json()
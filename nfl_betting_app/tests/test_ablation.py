@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.ablation import feature_groups, run_ablation
+
+
+@pytest.fixture
+def feature_df() -> pd.DataFrame:
+    """Five seasons where only the passing_yards features carry ATS signal."""
+    rng = np.random.default_rng(3)
+    n = 1500
+    df = pd.DataFrame({
+        'game_id': [f'G{i}' for i in range(n)],
+        'season': np.repeat(np.arange(2015, 2020), n // 5),
+        'week': np.tile(np.repeat(np.arange(2, 17), 20), 5),
+        'spread_line': rng.choice([-3.5, 2.5, 6.5], n),
+    })
+    for stat in ['passing_yards', 'rushing_tds', 'third_down_conv_rate']:
+        for window in ['avg', 'l1', 'l3']:
+            for side in ['home', 'away']:
+                df[f'{side}_{window}_{stat}'] = rng.normal(size=n)
+    signal = df['home_avg_passing_yards'] - df['away_avg_passing_yards'] + df['home_l3_passing_yards']
+    df['result'] = df['spread_line'] + 6 * signal + rng.normal(scale=4, size=n)
+    return df
+
+
+def test_feature_groups_by_stat_and_window(feature_df: pd.DataFrame):
+    by_stat = feature_groups(list(feature_df.columns))
+    assert set(by_stat) == {'passing_yards', 'rushing_tds', 'third_down_conv_rate'}
+    assert len(by_stat['passing_yards']) == 6
+
+    by_window = feature_groups(list(feature_df.columns), by='window')
+    assert set(by_window) == {'avg', 'l1', 'l3'}
+    with pytest.raises(ValueError, match="Unknown feature grouping"):
+        feature_groups([], by='side')
+
+
+def test_ablation_finds_the_informative_group(feature_df: pd.DataFrame):
+    results = run_ablation(feature_df, n_jobs=2).set_index(['kind', 'group'])
+
+    assert len(results) == 2 + 2 * 3
+    assert results.loc[('baseline', 'all'), 'n_features'] == 18
+    # Dropping passing yards hurts far more than dropping a noise group.
+    drop = results.loc['drop', 'log_loss_delta']
+    assert drop['passing_yards'] > 0.05
+    assert drop['passing_yards'] > 10 * abs(drop['rushing_tds'])
+    add = results.loc['add']
+    assert add.loc['passing_yards', 'ats_accuracy_delta'] > 0.1
+    assert add.loc['passing_yards', 'log_loss_delta'] < 0
+
+
+def test_ablation_needs_enough_seasons(feature_df: pd.DataFrame):
+    with pytest.raises(ValueError, match="seasons of graded games"):
+        run_ablation(feature_df, min_train_seasons=5, n_jobs=1)
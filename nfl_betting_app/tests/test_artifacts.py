@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+
+from nfl_betting_app.artifacts import (
+    load_manifest, manifest_seasons, partitions_to_fetch, read_partitions,
+    save_manifest, write_partitions
+)
+
+
+@pytest.fixture
+def pbp_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        'game_id': ['2022_01_KC_SF', '2022_01_KC_SF', '2023_01_BAL_CIN'],
+        'season': [2022, 2022, 2023],
+        'week': [1, 1, 1],
+        'passing_yards': [10.0, 20.0, 5.0],
+    })
+
+
+def test_write_and_read_partitions(tmp_path, pbp_df: pd.DataFrame):
+    manifest = write_partitions(pbp_df, str(tmp_path))
+    save_manifest(manifest, str(tmp_path / 'manifest.json'))
+
+    manifest = load_manifest(str(tmp_path / 'manifest.json'))
+    assert manifest_seasons(manifest) == [2022, 2023]
+    assert manifest['partitions']['pbp_2022.parquet']['rows'] == 2
+
+    df = read_partitions(str(tmp_path), manifest)
+    pd.testing.assert_frame_equal(df, pbp_df)
+
+    only_2023 = read_partitions(str(tmp_path), manifest, seasons=[2023], columns=['game_id'])
+    assert only_2023['game_id'].tolist() == ['2023_01_BAL_CIN']
+
+
+def test_write_partitions_keeps_other_seasons(tmp_path, pbp_df: pd.DataFrame):
+    manifest = write_partitions(pbp_df, str(tmp_path))
+    new_season = pbp_df[pbp_df['season'] == 2023].assign(season=2024)
+    manifest = write_partitions(new_season, str(tmp_path), manifest)
+
+    assert manifest_seasons(manifest) == [2022, 2023, 2024]
+
+
+def test_partitions_to_fetch_detects_missing_and_changed(tmp_path, pbp_df: pd.DataFrame):
+    manifest = write_partitions(pbp_df, str(tmp_path))
+    assert partitions_to_fetch(manifest, str(tmp_path)) == []
+
+    (tmp_path / 'pbp_2022.parquet').unlink()
+    entry = manifest['partitions']['pbp_2023.parquet']
+    (tmp_path / 'pbp_2023.parquet').write_bytes(b'x' * entry['bytes'])
+
+    assert partitions_to_fetch(manifest, str(tmp_path)) == ['pbp_2022.parquet', 'pbp_2023.parquet']
+
+
+def test_load_manifest_rejects_other_schema_version(tmp_path):
+    (tmp_path / 'manifest.json').write_text('{"schema_version": 0, "partitions": {}}')
+
+    with pytest.raises(ValueError, match="does not match expected version"):
+        load_manifest(str(tmp_path / 'manifest.json'))
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from nfl_betting_app.artifacts import write_partitions
+from nfl_betting_app.feature_engineering import (
+    FEATURE_BACKENDS, benchmark_backends, create_final_feature_set, get_backend
+)
+from nfl_betting_app.game_index import build_game_index, sort_plays
+from nfl_betting_app.ratings import RATING_STATS
+
+
+def _sorted(df: pd.DataFrame, keys) -> pd.DataFrame:
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('season_type', ['REG', 'POST'])
+def test_team_game_stats_match_across_backends(synthetic_pbp_df: pd.DataFrame, season_type: str):
+    expected = get_backend('pandas').team_game_stats(synthetic_pbp_df, season_type)
+    actual = get_backend('duckdb').team_game_stats(synthetic_pbp_df, season_type)
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(
+        _sorted(actual, ['game_id', 'team']), _sorted(expected, ['game_id', 'team']), check_dtype=False
+    )
+    # Plays with missing yardage count as 0 rather than making the game's total NaN.
+    assert expected[['passing_yards', 'rushing_yards']].notna().all().all()
+    assert (expected['passing_yards'] != 0).any()
+
+
+def test_rolling_averages_match_across_backends(synthetic_pbp_df: pd.DataFrame):
+    team_game_stats_df = get_backend('pandas').team_game_stats(synthetic_pbp_df, 'REG')
+
+    expected = get_backend('pandas').rolling_averages(team_game_stats_df)
+    actual = get_backend('duckdb').rolling_averages(team_game_stats_df)
+
+    keys = ['team', 'season', 'week']
+    pd.testing.assert_frame_equal(
+        _sorted(actual, keys)[expected.columns], _sorted(expected, keys), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize('arrow_backed', [False, True])
+def test_rolling_averages_skip_nan_like_pandas(synthetic_pbp_df: pd.DataFrame, arrow_backed: bool):
+    team_game_stats_df = get_backend('pandas').team_game_stats(synthetic_pbp_df, 'REG')
+    # Make yardage missing in every other team-game.
+    for col in ['passing_yards', 'rushing_yards']:
+        team_game_stats_df[col] = np.where(np.arange(len(team_game_stats_df)) % 2 == 0, 100.0, np.nan)
+    assert team_game_stats_df['passing_yards'].isna().any() and team_game_stats_df['passing_yards'].notna().any()
+
+    expected = get_backend('pandas').rolling_averages(team_game_stats_df)
+    source = team_game_stats_df
+    if arrow_backed:
+        # Arrow-backed frames keep NaN as a value rather than a missing entry.
+        source = pa.table({
+            col: pa.array(team_game_stats_df[col].to_numpy(), from_pandas=False) for col in team_game_stats_df.columns
+        }).to_pandas(types_mapper=pd.ArrowDtype)
+    actual = get_backend('duckdb').rolling_averages(source)
+
+    keys = ['team', 'season', 'week']
+    assert expected['avg_passing_yards'].gt(0).any()
+    pd.testing.assert_frame_equal(
+        _sorted(actual, keys)[expected.columns].astype({col: float for col in expected.columns if col.endswith('_yards')}),
+        _sorted(expected, keys), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize('with_index', [False, True])
+def test_feature_set_matches_across_backends(synthetic_pbp_df: pd.DataFrame, with_index: bool):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(pbp_df) if with_index else None
+
+    results = [
+        create_final_feature_set(
+            pbp_df, game_index=game_index, splits=['red_zone'], rating_stats=RATING_STATS, backend=name
+        )
+        for name in FEATURE_BACKENDS
+    ]
+
+    for actual in results[1:]:
+        assert list(actual.columns) == list(results[0].columns)
+        pd.testing.assert_frame_equal(
+            _sorted(actual, 'game_id'), _sorted(results[0], 'game_id'), check_dtype=False
+        )
+
+
+def test_duckdb_reads_partition_directory(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    partition_dir = str(tmp_path / 'partitions')
+    write_partitions(synthetic_pbp_df, partition_dir)
+
+    expected = get_backend('pandas').team_game_stats(synthetic_pbp_df, 'REG')
+    actual = get_backend('duckdb').team_game_stats(partition_dir, 'REG')
+
+    pd.testing.assert_frame_equal(
+        _sorted(actual, ['game_id', 'team']), _sorted(expected, ['game_id', 'team']), check_dtype=False
+    )
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Unknown feature backend"):
+        get_backend('spark')
+
+
+def test_benchmark_reports_every_stage(synthetic_pbp_df: pd.DataFrame):
+    report = benchmark_backends(synthetic_pbp_df)
+
+    assert list(report['backend']) == FEATURE_BACKENDS
+    assert (report[['team_game_stats', 'rolling_averages', 'merge_features']] > 0).all().all()
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.elo import EloRatings, ELO_INITIAL_RATING, sweep_elo
+from nfl_betting_app.game_index import build_game_index, sort_plays
+
+
+@pytest.fixture
+def games_df(synthetic_pbp_df: pd.DataFrame) -> pd.DataFrame:
+    return build_game_index(sort_plays(synthetic_pbp_df))
+
+
+def test_pre_game_ratings_are_leak_free(games_df: pd.DataFrame):
+    rated = EloRatings().process_games(games_df)
+
+    first_week = rated[(rated['season'] == 2022) & (rated['week'] == 1)]
+    assert (first_week[['home_elo', 'away_elo']] == ELO_INITIAL_RATING).all().all()
+
+    # Changing a later result must not change any earlier pre-game rating.
+    altered = games_df.copy()
+    altered.loc[altered['season'].eq(2023) & altered['week'].eq(3), 'result'] += 21
+    rerated = EloRatings().process_games(altered)
+    earlier = (rated['season'] == 2022) | (rated['week'] <= 3)
+    pd.testing.assert_frame_equal(rerated[earlier], rated[earlier])
+
+
+def test_incremental_append_matches_full_run(games_df: pd.DataFrame, tmp_path):
+    full = EloRatings().process_games(games_df)
+
+    elo = EloRatings()
+    first = elo.process_games(games_df[games_df['season'] == 2022])
+    path = str(tmp_path / 'elo_state.json')
+    elo.save(path)
+    second = EloRatings.load(path).process_games(games_df[games_df['season'] == 2023])
+
+    pd.testing.assert_frame_equal(pd.concat([first, second], ignore_index=True), full)
+
+
+def test_week_fed_in_two_calls_matches_full_run(games_df: pd.DataFrame, tmp_path):
+    full = EloRatings().process_games(games_df).set_index('game_id')
+    games = games_df.sort_values(['season', 'week', 'game_id'])
+    week = games[(games['season'] == 2023) & (games['week'] == 3)]
+    late_game = week['game_id'].iloc[-1]
+    through_week = games[(games['season'] == 2022) | (games['week'] <= 3)]
+
+    elo = EloRatings()
+    elo.process_games(through_week.assign(result=through_week['result'].where(through_week['game_id'] != late_game)))
+    path = str(tmp_path / 'elo_state.json')
+    elo.save(path)
+    elo = EloRatings.load(path)
+    with pytest.raises(ValueError, match="already have their results applied"):
+        elo.process_games(week)
+    late = elo.process_games(week[week['game_id'] == late_game])
+    rest = elo.process_games(games[(games['season'] == 2023) & (games['week'] > 3)])
+
+    rerated = pd.concat([late, rest]).set_index('game_id')
+    pd.testing.assert_frame_equal(rerated, full.loc[rerated.index])
+
+
+def test_appending_processed_weeks_raises(games_df: pd.DataFrame):
+    elo = EloRatings()
+    elo.process_games(games_df)
+
+    with pytest.raises(ValueError, match="not after the last processed week"):
+        elo.process_games(games_df[games_df['season'] == 2023])
+
+
+def test_team_playing_twice_in_a_week_raises(games_df: pd.DataFrame):
+    doubled = games_df.copy()
+    doubled.loc[doubled.index[1], 'week'] = doubled.loc[doubled.index[0], 'week']
+    doubled.loc[doubled.index[1], 'home_team'] = doubled.loc[doubled.index[0], 'home_team']
+
+    with pytest.raises(ValueError, match="play more than once"):
+        EloRatings().process_games(doubled)
+
+
+def test_sweep_matches_single_setting_runs(games_df: pd.DataFrame):
+    k_factors, home_advantages = [10.0, 20.0, 40.0], [0.0, 48.0]
+
+    sweep = sweep_elo(games_df, k_factors, home_advantages)
+
+    assert sweep['log_loss'].shape == (3, 2)
+    for i, k in enumerate(k_factors):
+        for j, advantage in enumerate(home_advantages):
+            rated = EloRatings(k_factor=k, home_advantage=advantage).process_games(games_df)
+            margin = games_df.sort_values(['season', 'week', 'game_id'])['result'].to_numpy()
+            actual = np.where(margin > 0, 1.0, np.where(margin < 0, 0.0, 0.5))
+            p = rated['elo_home_win_prob'].to_numpy()
+            log_loss = -np.mean(actual * np.log(p) + (1 - actual) * np.log(1 - p))
+            assert sweep['log_loss'][i, j] == pytest.approx(log_loss)
+            assert sweep['brier'][i, j] == pytest.approx(np.mean((p - actual) ** 2))
+    assert ((sweep['ats_accuracy'] >= 0) & (sweep['ats_accuracy'] <= 1)).all()
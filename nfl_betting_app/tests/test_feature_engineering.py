@@ -1,7 +1,9 @@
+import pandas as pd
 import pytest
 from nfl_betting_app.nfl_pbp_analysis import (
     Game, Play, TeamSide, Touchdown, TouchdownType
 )
+from nfl_betting_app.feature_engineering import FeatureSetSpec, create_feature_sets, create_final_feature_set
 # Import the private helper function for testing
 from nfl_betting_app.feature_engineering import _get_all_stats_for_game
 
@@ -60,4 +62,72 @@ def test_get_all_stats_for_game(sample_game_for_fe: Game):
     assert all_stats['third_down_conv_rate'][TeamSide.HOME] == 1.0
     assert all_stats['third_down_conv_rate'][TeamSide.AWAY] == 0.0
     assert all_stats['fourth_down_conv_rate'][TeamSide.HOME] == 0.0
-    assert all_stats['fourth_down_conv_rate'][TeamSide.AWAY] == 1.0
\ No newline at end of file
+    assert all_stats['fourth_down_conv_rate'][TeamSide.AWAY] == 1.0
+
+def test_create_final_feature_set_with_splits(synthetic_pbp_df):
+    """
+    Split stats are rolled up alongside the base stats and merged as home/away features.
+    """
+    base = create_final_feature_set(synthetic_pbp_df, season_type='REG')
+    with_splits = create_final_feature_set(synthetic_pbp_df, season_type='REG', splits=['red_zone'])
+
+    assert 'home_avg_td_rate__red_zone_inside' in with_splits.columns
+    assert 'away_l3_yards__red_zone_outside' in with_splits.columns
+    assert len(with_splits) == len(base)
+    pd.testing.assert_frame_equal(with_splits[base.columns], base)
+
+def test_create_feature_sets_matches_single_configurations(synthetic_pbp_df, monkeypatch):
+    """
+    Several feature sets come from one per-game pass per season type and
+    equal the single-configuration pipeline.
+    """
+    import nfl_betting_app.feature_engineering as fe
+
+    calls = []
+    calculate = fe._calculate_team_game_stats
+
+    def counting_calculate(pbp_df, season_type, game_index=None):
+        calls.append(season_type)
+        return calculate(pbp_df, season_type, game_index)
+
+    monkeypatch.setattr(fe, '_calculate_team_game_stats', counting_calculate)
+    specs = [
+        FeatureSetSpec('reg'),
+        FeatureSetSpec('reg_long', windows=(1, 3, 5), rating_stats=('passing_yards',)),
+        FeatureSetSpec('reg_red_zone', splits=('red_zone',), rating_stats=('passing_yards__red_zone_inside',)),
+        FeatureSetSpec('post', season_type='POST'),
+    ]
+    feature_sets = create_feature_sets(synthetic_pbp_df, specs)
+    assert calls == ['REG', 'POST']
+
+    for spec in specs:
+        with monkeypatch.context() as patch:
+            if spec.windows is not None:
+                patch.setattr(fe, 'ROLLING_WINDOWS', list(spec.windows))
+            expected = create_final_feature_set(
+                synthetic_pbp_df, season_type=spec.season_type, splits=list(spec.splits) if spec.splits else None,
+                rating_stats=list(spec.rating_stats) if spec.rating_stats else None
+            )
+        pd.testing.assert_frame_equal(feature_sets[spec.name], expected.reset_index(drop=True))
+
+    assert 'home_rtg_off_passing_yards__red_zone_inside' in feature_sets['reg_red_zone'].columns
+    reg_long = feature_sets['reg_long']
+    assert 'home_l5_passing_yards' in reg_long.columns
+    assert 'home_rtg_off_passing_yards' in reg_long.columns
+    pd.testing.assert_frame_equal(reg_long[feature_sets['reg'].columns], feature_sets['reg'])
+
+
+def test_create_feature_sets_rejects_duplicate_names(synthetic_pbp_df):
+    with pytest.raises(ValueError, match="must be unique"):
+        create_feature_sets(synthetic_pbp_df, [FeatureSetSpec('a'), FeatureSetSpec('a', season_type='POST')])
+
+
+def test_create_final_feature_set_with_drive_stats(synthetic_pbp_df):
+    base = create_final_feature_set(synthetic_pbp_df, season_type='REG')
+    with_drives = create_final_feature_set(synthetic_pbp_df, season_type='REG', drive_stats=True)
+
+    assert 'home_avg_points_per_drive' in with_drives.columns
+    assert 'away_l3_yards_per_drive_allowed' in with_drives.columns
+    pd.testing.assert_frame_equal(with_drives[base.columns], base)
+    batched = create_final_feature_set(synthetic_pbp_df, season_type='REG', drive_stats=True, memory_budget=1)
+    pd.testing.assert_frame_equal(batched, with_drives.reset_index(drop=True), check_dtype=False)
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.feature_snapshots import list_feature_snapshots, load_feature_snapshot, save_feature_snapshot
+
+
+def _by_game(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values('game_id').reset_index(drop=True)
+
+
+@pytest.fixture
+def weekly_feature_sets(synthetic_pbp_df: pd.DataFrame):
+    """The feature set as it would have been built after weeks 2, 3 and 4 of 2023."""
+    features = create_final_feature_set(synthetic_pbp_df)
+    return [
+        features[(features['season'] < 2023) | (features['week'] <= week)].reset_index(drop=True)
+        for week in [2, 3, 4]
+    ]
+
+
+def test_every_version_is_reconstructed_exactly(weekly_feature_sets, tmp_path):
+    snapshot_dir = str(tmp_path)
+    for features in weekly_feature_sets:
+        save_feature_snapshot(features, snapshot_dir)
+
+    for version, features in enumerate(weekly_feature_sets, start=1):
+        pd.testing.assert_frame_equal(
+            load_feature_snapshot(snapshot_dir, version=version), _by_game(features), check_dtype=False
+        )
+    pd.testing.assert_frame_equal(
+        load_feature_snapshot(snapshot_dir, as_of=(2023, 3)), _by_game(weekly_feature_sets[1]), check_dtype=False
+    )
+    assert list(list_feature_snapshots(snapshot_dir)['as_of_week']) == [2, 3, 4]
+
+
+def test_deltas_store_only_changes(weekly_feature_sets, tmp_path):
+    snapshot_dir = str(tmp_path)
+    save_feature_snapshot(weekly_feature_sets[0], snapshot_dir)
+    entry = save_feature_snapshot(weekly_feature_sets[1], snapshot_dir)
+
+    added = pd.read_parquet(os.path.join(snapshot_dir, entry['files']['added']))
+    assert entry['rows_changed'] == 0 and 'changed' not in entry['files']
+    assert len(added) == len(weekly_feature_sets[1]) - len(weekly_feature_sets[0])
+
+    # A restated line for one game only stores that game and that column.
+    restated = weekly_feature_sets[1].copy()
+    restated.loc[0, 'spread_line'] += 1.0
+    entry = save_feature_snapshot(restated, snapshot_dir)
+    changed = pd.read_parquet(os.path.join(snapshot_dir, entry['files']['changed']))
+    assert list(changed.columns) == ['game_id', 'spread_line']
+    assert list(changed['game_id']) == [restated.loc[0, 'game_id']]
+
+    assert save_feature_snapshot(restated, snapshot_dir) is None
+
+
+def test_deleted_rows_and_new_columns(weekly_feature_sets, tmp_path):
+    snapshot_dir = str(tmp_path)
+    save_feature_snapshot(weekly_feature_sets[2], snapshot_dir)
+
+    updated = weekly_feature_sets[2].iloc[1:].copy()
+    updated['home_elo'] = np.where(updated['week'] > 3, 1500.0, np.nan)
+    updated = updated.drop(columns=['total_line'])
+    entry = save_feature_snapshot(updated, snapshot_dir)
+
+    assert entry['deleted'] == [weekly_feature_sets[2].loc[0, 'game_id']]
+    pd.testing.assert_frame_equal(load_feature_snapshot(snapshot_dir), _by_game(updated), check_dtype=False)
+    pd.testing.assert_frame_equal(
+        load_feature_snapshot(snapshot_dir, version=1), _by_game(weekly_feature_sets[2]), check_dtype=False
+    )
+
+
+def test_all_missing_new_column_is_stored(weekly_feature_sets, tmp_path):
+    snapshot_dir = str(tmp_path)
+    save_feature_snapshot(weekly_feature_sets[2], snapshot_dir)
+
+    widened = weekly_feature_sets[2].assign(home_elo=np.nan)
+    entry = save_feature_snapshot(widened, snapshot_dir)
+
+    assert entry is not None and entry['rows_changed'] == 0 and entry['files'] == {}
+    assert 'home_elo' in load_feature_snapshot(snapshot_dir).columns
+    pd.testing.assert_frame_equal(load_feature_snapshot(snapshot_dir), _by_game(widened), check_dtype=False)
+    assert save_feature_snapshot(widened, snapshot_dir) is None
+
+
+def test_missing_snapshots_raise(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_feature_snapshot(str(tmp_path))
+
+
+def test_snapshots_have_their_own_schema_version(weekly_feature_sets, tmp_path, monkeypatch):
+    import nfl_betting_app.config as config
+    from nfl_betting_app.artifacts import load_manifest
+
+    monkeypatch.setattr(config, 'FEATURE_SNAPSHOT_SCHEMA_VERSION', config.ARTIFACT_SCHEMA_VERSION + 1)
+    save_feature_snapshot(weekly_feature_sets[0], str(tmp_path))
+
+    assert len(load_feature_snapshot(str(tmp_path))) == len(weekly_feature_sets[0])
+    with pytest.raises(ValueError, match="does not match expected version"):
+        load_manifest(str(tmp_path / 'manifest.json'))
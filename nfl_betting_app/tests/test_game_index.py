@@ -0,0 +1,186 @@
+import urllib.error
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import nfl_betting_app.config as config
+from nfl_betting_app import data_retriever
+from nfl_betting_app.data_handler import load_game_table
+from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.game_index import (
+    GAME_LEVEL_COLUMNS, build_game_index, build_game_table, check_game_index, game_slice, iter_game_columns,
+    measure_game_iteration, sort_plays, write_game_table
+)
+from nfl_betting_app.nfl_pbp_analysis import game_from_columns, game_from_single_game_dataframe
+from nfl_betting_app.nfl_pbp_analysis.pbp_data_models_factories import REQUIRED_COLS
+
+
+def test_build_game_index_offsets(synthetic_pbp_df: pd.DataFrame):
+    shuffled = synthetic_pbp_df.sample(frac=1.0, random_state=3)
+    sorted_df = sort_plays(shuffled)
+    game_index = build_game_index(sorted_df)
+
+    assert len(game_index) == synthetic_pbp_df['game_id'].nunique()
+    assert game_index['play_start'].iloc[0] == 0
+    assert game_index['play_stop'].iloc[-1] == len(sorted_df)
+
+    for game_row in game_index.itertuples(index=False):
+        plays = game_slice(sorted_df, game_row)
+        assert (plays['game_id'] == game_row.game_id).all()
+        assert plays['play_id'].is_monotonic_increasing
+        assert len(plays) == (synthetic_pbp_df['game_id'] == game_row.game_id).sum()
+
+
+def test_build_game_index_requires_grouped_games(synthetic_pbp_df: pd.DataFrame):
+    interleaved = synthetic_pbp_df.sample(frac=1.0, random_state=3).reset_index(drop=True)
+
+    with pytest.raises(ValueError, match="not grouped by game_id"):
+        build_game_index(interleaved)
+
+
+def test_check_game_index_rejects_other_frame(synthetic_pbp_df: pd.DataFrame):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+
+    with pytest.raises(ValueError, match="does not match"):
+        check_game_index(sorted_df[sorted_df['posteam'].notna()].reset_index(drop=True), game_index)
+
+
+@pytest.mark.parametrize('season_type', ['REG', 'POST'])
+def test_feature_set_matches_with_and_without_index(synthetic_pbp_df: pd.DataFrame, season_type: str):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+
+    expected = create_final_feature_set(sorted_df, season_type=season_type)
+    actual = create_final_feature_set(sorted_df, season_type=season_type, game_index=game_index)
+
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_iter_game_columns_yields_views(synthetic_pbp_df: pd.DataFrame):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+    columns = ['posteam', 'down', 'passing_yards']
+
+    for game_row, views in iter_game_columns(sorted_df, game_index, columns):
+        assert len(views['down']) == game_row.play_stop - game_row.play_start
+        assert np.shares_memory(views['down'], sorted_df['down'].to_numpy())
+
+
+def test_game_from_columns_matches_dataframe_factory(synthetic_pbp_df: pd.DataFrame):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+    play_columns = [col for col in REQUIRED_COLS if col not in ('game_id', 'home_team', 'away_team')]
+
+    for game_row, views in iter_game_columns(sorted_df, game_index, play_columns):
+        rows = np.flatnonzero(pd.notna(views['posteam']))
+        from_columns = game_from_columns(game_row.game_id, game_row.home_team, game_row.away_team, views, rows)
+        game_df = game_slice(sorted_df, game_row)
+        from_frame = game_from_single_game_dataframe(game_df[game_df['posteam'].notna()])
+        # Compare serialised forms because the NaN yardage values never compare equal.
+        assert from_columns.model_dump_json() == from_frame.model_dump_json()
+
+
+def test_measure_game_iteration_reports_no_copies_for_views(synthetic_pbp_df: pd.DataFrame):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+
+    report = measure_game_iteration(sorted_df, game_index, season_type='REG')
+
+    assert report['games'] == 16
+    assert report['views_copied_arrays'] == 0
+    assert report['groupby_copied_arrays'] > 0
+    assert report['groupby_copied_bytes'] > 0
+    assert report['views_seconds'] > 0
+    # Holding every game's arrays costs the views path less memory.
+    assert report['views_allocations'] > 0
+    assert report['views_allocated_bytes'] < report['groupby_allocated_bytes']
+    assert report['views_peak_bytes'] < report['groupby_peak_bytes']
+
+
+def test_filtered_game_columns_are_slices_of_the_kept_plays(synthetic_pbp_df: pd.DataFrame):
+    sorted_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(sorted_df)
+    keep = sorted_df['posteam'].notna().to_numpy()
+
+    bases = set()
+    for game_row, views in iter_game_columns(sorted_df, game_index, ['down'], keep=keep):
+        game_df = game_slice(sorted_df, game_row)
+        expected = game_df.loc[game_df['posteam'].notna(), 'down'].to_numpy()
+        np.testing.assert_array_equal(views['down'], expected)
+        bases.add(id(views['down'].base))
+    # Every game is a view into the one filtered array.
+    assert len(bases) == 1
+
+
+def test_game_table_adds_scheduled_games_and_missing_lines(synthetic_pbp_df: pd.DataFrame):
+    game_index = build_game_index(sort_plays(synthetic_pbp_df))
+    game_index.loc[0, 'spread_line'] = np.nan
+    schedules = pd.DataFrame({
+        'game_id': [game_index.loc[0, 'game_id'], '2023_06_SF_KC'],
+        'season': [game_index.loc[0, 'season'], 2023],
+        'game_type': ['REG', 'WC'],
+        'week': [game_index.loc[0, 'week'], 6],
+        'home_team': [game_index.loc[0, 'home_team'], 'KC'],
+        'away_team': [game_index.loc[0, 'away_team'], 'SF'],
+        'spread_line': [3.5, -1.5],
+        'total_line': [99.5, 47.5],
+        'result': [99.0, np.nan],
+    })
+
+    games = build_game_table(game_index, schedules)
+
+    assert list(games.columns) == GAME_LEVEL_COLUMNS
+    assert len(games) == len(game_index) + 1
+    by_id = games.set_index('game_id')
+    first = game_index.loc[0]
+    assert by_id.loc[first['game_id'], 'spread_line'] == 3.5
+    # Values from the plays take precedence over the schedule.
+    assert by_id.loc[first['game_id'], 'total_line'] == first['total_line']
+    assert by_id.loc[first['game_id'], 'result'] == first['result']
+    assert by_id.loc['2023_06_SF_KC', 'season_type'] == 'POST'
+    assert np.isnan(by_id.loc['2023_06_SF_KC', 'result'])
+    assert games.iloc[-1]['game_id'] == '2023_06_SF_KC'
+
+
+def test_load_game_table_filters_without_reading_plays(synthetic_pbp_df: pd.DataFrame, tmp_path, monkeypatch):
+    games_path = str(tmp_path / 'games.parquet')
+    monkeypatch.setattr(config, 'GAMES_PATH', games_path)
+    with pytest.raises(FileNotFoundError):
+        load_game_table()
+
+    write_game_table(build_game_table(build_game_index(sort_plays(synthetic_pbp_df))), games_path)
+
+    assert len(load_game_table()) == synthetic_pbp_df['game_id'].nunique()
+    post_2023 = load_game_table(seasons=[2023], season_type='POST')
+    assert list(post_2023['game_id']) == ['2023_05_BUF_KC']
+
+
+def test_schedules_are_cached_with_the_partitions(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(config, 'RAW_PBP_PARTITION_DIR', str(tmp_path))
+    fetched = []
+
+    def import_schedules(years):
+        fetched.append(list(years))
+        return pd.DataFrame({'game_id': [f'{year}_01_SF_KC' for year in years], 'season': years})
+    monkeypatch.setattr(data_retriever.nfl, 'import_schedules', import_schedules)
+
+    assert len(data_retriever._update_schedules([2022, 2023])) == 2
+    assert len(data_retriever._update_schedules([2022, 2023])) == 2
+    # Completed seasons come from the cache; only the latest one is refreshed.
+    assert fetched == [[2022, 2023], [2023]]
+
+    def offline(years):
+        raise urllib.error.URLError('no network')
+    monkeypatch.setattr(data_retriever.nfl, 'import_schedules', offline)
+    assert len(data_retriever._update_schedules([2022, 2023])) == 2
+    assert "could not fetch schedules for [2023] (URLError" in capsys.readouterr().out
+
+    def broken(years):
+        raise KeyError('season')
+    monkeypatch.setattr(data_retriever.nfl, 'import_schedules', broken)
+    with pytest.raises(KeyError):
+        data_retriever._update_schedules([2022, 2023])
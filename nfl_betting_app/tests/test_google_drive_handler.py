@@ -0,0 +1,127 @@
+import hashlib
+import os
+import shutil
+import threading
+
+import pandas as pd
+import pytest
+
+from nfl_betting_app.artifacts import save_manifest, write_partitions
+from nfl_betting_app.google_drive_handler import DriveSync
+
+
+class FakeDriveBackend:
+    """
+    Stores 'Drive' files in a local directory and records every call,
+    so tests can assert how many listings and transfers happened.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.list_calls = 0
+        self.uploads = []
+        self.downloads = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _metadata(self, folder_id: str, file_id: str, title: str):
+        path = os.path.join(self.root, folder_id, title)
+        with open(path, 'rb') as f:
+            md5 = hashlib.md5(f.read()).hexdigest()
+        return {'id': file_id, 'title': title, 'md5Checksum': md5, 'fileSize': str(os.path.getsize(path))}
+
+    def list_folder(self, folder_id):
+        self.list_calls += 1
+        folder = os.path.join(self.root, folder_id)
+        os.makedirs(folder, exist_ok=True)
+        return [self._metadata(folder_id, f'{folder_id}/{title}', title) for title in sorted(os.listdir(folder))]
+
+    def upload(self, local_file_path, folder_id, file_id=None):
+        title = os.path.basename(local_file_path)
+        with self._lock:
+            self.uploads.append(title)
+        shutil.copyfile(local_file_path, os.path.join(self.root, folder_id, title))
+        return self._metadata(folder_id, file_id or f'{folder_id}/{title}', title)
+
+    def download(self, file_id, local_save_path):
+        self.downloads.append(file_id)
+        shutil.copyfile(os.path.join(self.root, file_id), local_save_path)
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    folder = tmp_path / 'local'
+    folder.mkdir()
+    for season in [2021, 2022, 2023]:
+        (folder / f'season={season}.parquet').write_bytes(f'plays for {season}'.encode())
+    return folder
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return FakeDriveBackend(str(tmp_path / 'drive'))
+
+
+def test_sync_folder_only_transfers_changed_files(local_dir, backend):
+    sync = DriveSync(backend=backend)
+
+    first = sync.sync_folder(str(local_dir), 'raw')
+    assert sorted(first) == ['season=2021.parquet', 'season=2022.parquet', 'season=2023.parquet']
+
+    # A weekly update only touches the latest season.
+    (local_dir / 'season=2023.parquet').write_bytes(b'plays for 2023 plus week 7')
+    second = sync.sync_folder(str(local_dir), 'raw')
+
+    assert second == ['season=2023.parquet']
+    # The folder was listed once for the whole session.
+    assert backend.list_calls == 1
+    assert len(backend.uploads) == 4
+
+
+def test_sync_skips_unchanged_files_in_a_new_session(local_dir, backend):
+    DriveSync(backend=backend).sync_folder(str(local_dir), 'raw')
+
+    assert DriveSync(backend=backend).sync_folder(str(local_dir), 'raw') == []
+
+
+def test_download_file_skips_identical_local_copy(local_dir, backend, tmp_path):
+    sync = DriveSync(backend=backend)
+    sync.sync_folder(str(local_dir), 'raw')
+    target = tmp_path / 'restore' / 'season=2022.parquet'
+
+    assert sync.download_file('raw', 'season=2022.parquet', str(target))
+    assert target.read_bytes() == b'plays for 2022'
+    assert sync.download_file('raw', 'season=2022.parquet', str(target))
+    assert len(backend.downloads) == 1
+
+
+def test_download_missing_file_returns_false(backend, tmp_path):
+    sync = DriveSync(backend=backend)
+
+    assert not sync.download_file('raw', 'missing.parquet', str(tmp_path / 'missing.parquet'))
+
+
+def test_push_and_restore_partitions_fetches_only_changed(tmp_path, backend):
+    local = tmp_path / 'partitions'
+    df = pd.DataFrame({'season': [2022, 2023], 'passing_yards': [10.0, 20.0]})
+    manifest = write_partitions(df, str(local))
+    save_manifest(manifest, str(local / 'manifest.json'))
+    sync = DriveSync(backend=backend)
+    assert sorted(sync.push_partitions('raw', str(local))) == [
+        'manifest.json', 'pbp_2022.parquet', 'pbp_2023.parquet'
+    ]
+
+    # Cold start on a new machine downloads everything once...
+    restore_dir = tmp_path / 'restore'
+    assert DriveSync(backend=backend).restore_partitions('raw', str(restore_dir)) == [
+        'pbp_2022.parquet', 'pbp_2023.parquet'
+    ]
+
+    # ...and after a weekly update only the changed partition is pushed and pulled.
+    manifest = write_partitions(df.assign(passing_yards=[10.0, 25.0]), str(local), manifest)
+    save_manifest(manifest, str(local / 'manifest.json'))
+    assert sorted(DriveSync(backend=backend).push_partitions('raw', str(local))) == [
+        'manifest.json', 'pbp_2023.parquet'
+    ]
+    assert DriveSync(backend=backend).restore_partitions('raw', str(restore_dir)) == ['pbp_2023.parquet']
+    assert (restore_dir / 'manifest.json').read_bytes() == (local / 'manifest.json').read_bytes()
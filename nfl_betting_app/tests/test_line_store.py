@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.line_store import attach_lines_as_of, ingest_quotes, line_movement, load_quotes
+
+
+@pytest.fixture
+def quote_files(tmp_path):
+    first = pd.DataFrame({
+        'game_id': ['G1', 'G1', 'G2', 'G1'],
+        'timestamp': ['2023-09-01 12:00', '2023-09-05 12:00', '2023-09-02 09:00', '2023-09-07 18:00'],
+        'spread_line': [3.0, 3.5, -1.0, 4.0],
+        'total_line': [47.0, 47.5, 41.0, 48.0],
+        'book': ['a', 'a', 'b', 'a'],
+    })
+    second = pd.DataFrame({
+        'game_id': ['G2', 'G1'],
+        'timestamp': pd.to_datetime(['2023-09-06 09:00', '2023-09-05 12:00'], utc=True),
+        'spread_line': [-2.5, 3.0],
+        'total_line': [40.5, 47.0],
+    })
+    first_path, second_path = str(tmp_path / 'quotes_a.csv'), str(tmp_path / 'quotes_b.parquet')
+    first.to_csv(first_path, index=False)
+    second.to_parquet(second_path, index=False)
+    return [first_path, second_path]
+
+
+def test_ingest_sorts_and_deduplicates(quote_files, tmp_path):
+    store_path = str(tmp_path / 'line_quotes.parquet')
+    assert ingest_quotes(quote_files, store_path) == 5
+
+    quotes = load_quotes(store_path=store_path)
+    assert list(quotes['game_id']) == ['G1', 'G1', 'G1', 'G2', 'G2']
+    assert quotes.groupby('game_id')['timestamp'].apply(lambda t: t.is_monotonic_increasing).all()
+    # The later file's quote for the same moment wins.
+    assert quotes.loc[1, 'spread_line'] == 3.0
+    assert list(load_quotes(['G2'], store_path=store_path)['game_id']) == ['G2', 'G2']
+
+    movement = line_movement(quotes).set_index('game_id')
+    assert movement.loc['G1', 'opening_spread_line'] == 3.0
+    assert movement.loc['G1', 'closing_spread_line'] == 4.0
+    assert movement.loc['G2', 'n_quotes'] == 2
+
+
+def test_as_of_join_uses_the_line_available_at_decision_time(quote_files, tmp_path):
+    store_path = str(tmp_path / 'line_quotes.parquet')
+    ingest_quotes(quote_files, store_path)
+    games = pd.DataFrame({
+        'game_id': ['G2', 'G1', 'G1', 'G3', 'G1'],
+        'decision': ['2023-09-06 10:00', '2023-09-06 00:00', '2023-08-01', '2023-09-06', None],
+    })
+
+    result = attach_lines_as_of(games, load_quotes(store_path=store_path), 'decision')
+
+    assert list(result['game_id']) == list(games['game_id'])
+    np.testing.assert_array_equal(result['spread_line_asof'].to_numpy(), [-2.5, 3.0, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(result['total_line_asof'].to_numpy(), [40.5, 47.0, np.nan, np.nan, np.nan])
+    assert result.loc[1, 'line_timestamp_asof'] == pd.Timestamp('2023-09-05 12:00', tz='UTC')
+
+
+def test_missing_store_and_columns(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_quotes(store_path=str(tmp_path / 'missing.parquet'))
+    bad = str(tmp_path / 'bad.csv')
+    pd.DataFrame({'game_id': ['G1'], 'timestamp': ['2023-09-01']}).to_csv(bad, index=False)
+    with pytest.raises(ValueError, match="missing columns"):
+        ingest_quotes([bad], str(tmp_path / 'store.parquet'))
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from nfl_betting_app.artifacts import save_manifest, write_partitions
+from nfl_betting_app.feature_engineering import create_final_feature_set, create_final_feature_set_from_partitions
+from nfl_betting_app.game_index import build_game_index, sort_plays
+from nfl_betting_app.memory_budget import StageMemoryTracker, frame_season_bytes, plan_season_batches
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values('game_id').reset_index(drop=True)
+
+
+def test_plan_season_batches_fits_budget():
+    season_bytes = {2021: 100, 2022: 100, 2023: 300, 2024: 100}
+
+    assert plan_season_batches(season_bytes, memory_budget=800, factor=4) == [[2021, 2022], [2023], [2024]]
+    assert plan_season_batches(season_bytes, memory_budget=10_000, factor=4) == [[2021, 2022, 2023, 2024]]
+
+
+def test_frame_season_bytes_estimates_deep_size_from_a_sample(synthetic_pbp_df: pd.DataFrame):
+    estimate = frame_season_bytes(synthetic_pbp_df, sample_rows=200)
+    deep_bytes = synthetic_pbp_df.memory_usage(index=False, deep=True).sum()
+
+    assert sorted(estimate) == sorted(synthetic_pbp_df['season'].unique())
+    assert sum(estimate.values()) == pytest.approx(deep_bytes, rel=0.1)
+
+
+@pytest.mark.parametrize('backend', ['pandas', 'duckdb'])
+def test_batched_feature_set_matches_single_pass(synthetic_pbp_df: pd.DataFrame, backend: str):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    game_index = build_game_index(pbp_df)
+    options = dict(splits=['quarter'], rating_stats=['passing_tds'], backend=backend)
+
+    expected_tables, actual_tables = {}, {}
+    expected = create_final_feature_set(pbp_df, game_index=game_index, team_tables=expected_tables, **options)
+    tracker = StageMemoryTracker()
+    actual = create_final_feature_set(
+        pbp_df, game_index=game_index, memory_budget=1, memory_tracker=tracker, team_tables=actual_tables, **options
+    )
+
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False, check_like=True)
+    pd.testing.assert_index_equal(actual.index, expected.index)
+    for table in ('team_game_stats', 'team_features'):
+        pd.testing.assert_frame_equal(
+            actual_tables[table].sort_values(['game_id', 'team']).reset_index(drop=True),
+            expected_tables[table].sort_values(['game_id', 'team']).reset_index(drop=True),
+            check_dtype=False, check_like=True
+        )
+    summary = tracker.summary().set_index('stage')
+    assert summary.loc['team_game_stats', 'batches'] == 2
+    assert summary.loc['merge_features', 'batches'] == 2
+
+
+def test_feature_set_from_partitions_matches_in_memory(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    partition_dir = str(tmp_path / 'partitions')
+    save_manifest(write_partitions(pbp_df, partition_dir), str(tmp_path / 'partitions' / 'manifest.json'))
+
+    expected = create_final_feature_set(pbp_df, game_index=build_game_index(pbp_df))
+    tracker = StageMemoryTracker()
+    actual = create_final_feature_set_from_partitions(partition_dir, memory_budget=1, memory_tracker=tracker)
+
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False)
+    assert tracker.summary()['peak_rss_mb'].notna().all()
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from nfl_betting_app.artifacts import (
+    file_md5, load_manifest, manifest_seasons, new_manifest, read_partitions, save_manifest, write_partitions
+)
+from nfl_betting_app.pbp_schema import PBP_SCHEMA, unify_schema
+
+
+@pytest.fixture
+def season_2009() -> pd.DataFrame:
+    """An early season: no receiving_yards, an all-null td_player_id read as object, yards as text."""
+    return pd.DataFrame({
+        'game_id': ['2009_01_PIT_TEN'] * 3,
+        'season': [2009] * 3,
+        'week': [1] * 3,
+        'season_type': ['REG'] * 3,
+        'home_team': ['PIT'] * 3,
+        'away_team': ['TEN'] * 3,
+        'posteam': ['PIT', 'TEN', None],
+        'passing_yards': ['12', 'n/a', None],
+        'td_player_id': pd.Series([None, None, None], dtype=object),
+        'pass_touchdown': [0, 0, 0],
+    })
+
+
+@pytest.fixture
+def season_2023() -> pd.DataFrame:
+    """A recent season with an extra column and float flags."""
+    return pd.DataFrame({
+        'game_id': ['2023_01_DET_KC'] * 2,
+        'season': np.array([2023, 2023], dtype=np.int64),
+        'week': [1, 1],
+        'season_type': ['REG'] * 2,
+        'home_team': ['KC'] * 2,
+        'away_team': ['DET'] * 2,
+        'posteam': ['KC', 'DET'],
+        'passing_yards': [np.nan, 30.0],
+        'receiving_yards': [np.nan, 30.0],
+        'td_player_id': [None, '00-0036'],
+        'pass_touchdown': [0.0, 1.0],
+        'nfl_api_id': ['a', 'b'],
+    })
+
+
+def test_unify_schema_fills_casts_and_reports_drift(season_2009: pd.DataFrame):
+    table, drift = unify_schema(season_2009)
+
+    assert table.schema.equals(PBP_SCHEMA)
+    assert 'receiving_yards' in drift['missing']
+    assert drift['coerced'] == {'passing_yards': 1}
+    assert drift['retyped']['passing_yards'] == 'object'
+    df = table.to_pandas()
+    assert df['passing_yards'].tolist()[0] == 12.0
+    assert df['passing_yards'].isna().tolist() == [False, True, True]
+    assert df['receiving_yards'].isna().all()
+
+
+def test_unify_schema_keeps_undeclared_columns(season_2023: pd.DataFrame):
+    table, drift = unify_schema(season_2023.assign(air_yards=[3.0, np.nan]))
+
+    assert drift['added'] == ['nfl_api_id', 'air_yards']
+    assert table.schema.names[:len(PBP_SCHEMA)] == PBP_SCHEMA.names
+    assert table.schema.field('nfl_api_id').type == pa.string()
+    assert table.schema.field('air_yards').type == pa.float64()
+    assert table.column('nfl_api_id').to_pylist() == ['a', 'b']
+
+
+def test_undeclared_types_come_from_non_null_values(season_2023: pd.DataFrame):
+    table, _ = unify_schema(season_2023.assign(
+        air_yards=pd.Series([3, None], dtype=object), drive_end=pd.Series([None, None], dtype=object)
+    ))
+
+    assert table.schema.field('air_yards').type == pa.float64()
+    assert table.schema.field('drive_end').type == pa.null()
+
+
+def test_unify_schema_requires_identifying_columns(season_2023: pd.DataFrame):
+    with pytest.raises(ValueError, match="missing required columns"):
+        unify_schema(season_2023.drop(columns=['home_team']))
+    with pytest.raises(ValueError, match="must be an integer"):
+        unify_schema(season_2023.assign(week=[1, None]))
+
+
+def test_partitions_share_one_schema(tmp_path, season_2009: pd.DataFrame, season_2023: pd.DataFrame):
+    manifest = write_partitions(season_2009, str(tmp_path), schema=PBP_SCHEMA)
+    manifest = write_partitions(season_2023, str(tmp_path), manifest, schema=PBP_SCHEMA)
+
+    schemas = [pq.read_schema(str(tmp_path / name)).remove_metadata() for name in manifest['partitions']]
+    assert schemas[0].equals(schemas[1])
+    assert schemas[0].names == PBP_SCHEMA.names + ['nfl_api_id']
+    assert manifest['partitions']['pbp_2023.parquet']['schema_drift']['added'] == ['nfl_api_id']
+    assert manifest['partitions']['pbp_2009.parquet']['md5'] == file_md5(str(tmp_path / 'pbp_2009.parquet'))
+
+    df = read_partitions(str(tmp_path), manifest)
+    assert df['passing_yards'].dtype == np.float64
+    assert df['pass_touchdown'].dtype == np.float32
+    assert df['season'].tolist() == [2009] * 3 + [2023] * 2
+    assert df['nfl_api_id'].tolist() == [None] * 3 + ['a', 'b']
+
+    other = pa.schema([('game_id', pa.string()), ('season', pa.int32())])
+    with pytest.raises(ValueError, match="different schema"):
+        write_partitions(season_2023, str(tmp_path), manifest, schema=other)
+
+
+def test_a_later_season_settles_an_all_null_column(tmp_path, season_2009: pd.DataFrame, season_2023: pd.DataFrame):
+    early = season_2009.assign(nfl_api_id=pd.Series([None] * 3, dtype=object))
+    manifest = write_partitions(early, str(tmp_path), schema=PBP_SCHEMA)
+    assert pq.read_schema(str(tmp_path / 'pbp_2009.parquet')).field('nfl_api_id').type == pa.null()
+
+    manifest = write_partitions(season_2023, str(tmp_path), manifest, schema=PBP_SCHEMA)
+
+    assert manifest['partitions']['pbp_2023.parquet']['schema_drift']['settled'] == ['nfl_api_id']
+    for name in manifest['partitions']:
+        assert pq.read_schema(str(tmp_path / name)).field('nfl_api_id').type == pa.string()
+    df = read_partitions(str(tmp_path), manifest)
+    assert df['nfl_api_id'].tolist() == [None] * 3 + ['a', 'b']
+    assert manifest['partitions']['pbp_2009.parquet']['md5'] == file_md5(str(tmp_path / 'pbp_2009.parquet'))
+
+
+def test_partitions_without_a_unified_schema_are_not_mixed(tmp_path, season_2009, season_2023):
+    manifest = write_partitions(season_2009, str(tmp_path))
+
+    with pytest.raises(ValueError, match="without a unified schema"):
+        write_partitions(season_2023, str(tmp_path), manifest, schema=PBP_SCHEMA)
+    unified = write_partitions(season_2009, str(tmp_path / 'unified'), schema=PBP_SCHEMA)
+    with pytest.raises(ValueError, match="have a unified schema"):
+        write_partitions(season_2023, str(tmp_path / 'unified'), unified)
+
+
+def test_old_partition_stores_are_upgraded_in_place(tmp_path, monkeypatch, season_2009, season_2023):
+    from nfl_betting_app import config, data_retriever
+
+    partition_dir = str(tmp_path / 'partitions')
+    monkeypatch.setattr(config, 'RAW_PBP_PARTITION_DIR', partition_dir)
+    monkeypatch.setattr(config, 'RAW_PBP_MANIFEST_PATH', str(tmp_path / 'partitions' / 'manifest.json'))
+    old = write_partitions(pd.concat([season_2009, season_2023]), partition_dir, new_manifest(schema_version=1))
+    save_manifest(old, config.RAW_PBP_MANIFEST_PATH)
+
+    manifest = data_retriever._upgrade_partition_store()
+
+    assert load_manifest(config.RAW_PBP_MANIFEST_PATH)['schema_version'] == config.ARTIFACT_SCHEMA_VERSION
+    assert manifest_seasons(manifest) == [2009, 2023]
+    df = read_partitions(partition_dir, manifest)
+    assert 'nfl_api_id' in df.columns and df['receiving_yards'].dtype == np.float64
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.player_store import PLAYER_STATS, PlayerStore
+
+
+@pytest.fixture
+def store(synthetic_pbp_df: pd.DataFrame) -> PlayerStore:
+    return PlayerStore.from_pbp(synthetic_pbp_df)
+
+
+def test_player_games_sum_play_level_stats(synthetic_pbp_df: pd.DataFrame, store: PlayerStore):
+    reg = synthetic_pbp_df[synthetic_pbp_df['season_type'] == 'REG']
+    qb = store.players.set_index('player_id').loc['KC-QB', 'player']
+    kc_qb = store.player_games[store.player_games['player'] == qb]
+
+    expected_yards = reg.loc[reg['passer_player_id'] == 'KC-QB', 'passing_yards'].sum()
+    assert kc_qb['passing_yards'].sum() == pytest.approx(expected_yards)
+
+    scored = reg['td_player_id'].notna()
+    assert store.player_games['total_tds'].sum() == scored.sum()
+    assert store.player_games[['passing_tds', 'rushing_tds', 'defence_tds', 'special_teams_tds']].sum().sum() == scored.sum()
+    thrown = (reg['pass_touchdown'] == 1) & (reg['td_team'] == reg['posteam']) & reg['passer_player_id'].notna()
+    assert store.player_games['tds_thrown'].sum() == thrown.sum()
+
+
+def test_player_codes_are_compact_integers(store: PlayerStore):
+    assert list(store.players['player']) == list(range(len(store.players)))
+    assert store.player_games['player'].isin(store.players['player']).all()
+    assert store.players.set_index('player_id').loc['KC-WR1', 'player_name'] == 'KC.WR1'
+
+
+def test_form_is_leak_free_and_matches_rolling_means(store: PlayerStore):
+    df = store.player_games.sort_values(['player', 'season', 'week'])
+    grouped = df.groupby(['player', 'season'])['receiving_yards']
+
+    expected_avg = grouped.transform(lambda s: s.expanding().mean().shift(1)).fillna(0.0)
+    expected_l3 = grouped.transform(lambda s: s.rolling(3, min_periods=1).mean().shift(1)).fillna(0.0)
+
+    np.testing.assert_allclose(df['avg_receiving_yards'], expected_avg)
+    np.testing.assert_allclose(df['l3_receiving_yards'], expected_l3)
+
+
+def test_top_contributors_as_of_week(store: PlayerStore):
+    top = store.top_contributors('KC', 2023, week=4, stat='receiving_yards', n=2)
+
+    rows = store.team_season('KC', 2023)
+    rows = rows[rows['week'] < 4]
+    expected = rows.groupby('player')['receiving_yards'].sum().nlargest(2)
+    assert list(top['receiving_yards']) == pytest.approx(list(expected.values))
+    assert (top['last_week'] < 4).all()
+    assert store.top_contributors('KC', 2023, week=1).empty
+
+
+def test_unknown_stat_raises(store: PlayerStore):
+    with pytest.raises(KeyError, match="Unknown player stat"):
+        store.top_contributors('KC', 2023, week=4, stat='sacks')
+
+
+def test_save_and_load_round_trip(store: PlayerStore, tmp_path):
+    store.save(str(tmp_path))
+    loaded = PlayerStore.load(str(tmp_path))
+
+    pd.testing.assert_frame_equal(loaded.player_games, store.player_games)
+    pd.testing.assert_frame_equal(
+        loaded.top_contributors('BUF', 2022, 5, 'rushing_yards'), store.top_contributors('BUF', 2022, 5, 'rushing_yards')
+    )
+    assert set(PLAYER_STATS) <= set(loaded.player_games.columns)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.feature_engineering import (
+    _calculate_rolling_averages, _calculate_team_game_stats, create_final_feature_set
+)
+from nfl_betting_app.query_store import QueryStore, build_query_store
+
+
+@pytest.fixture
+def store(synthetic_pbp_df: pd.DataFrame, tmp_path) -> QueryStore:
+    team_tables = {}
+    feature_df = create_final_feature_set(
+        synthetic_pbp_df, splits=['quarter'], rating_stats=['passing_tds'], team_tables=team_tables
+    )
+    store = build_query_store(team_tables, feature_df, path=str(tmp_path / 'query_store.duckdb'))
+    yield store
+    store.close()
+
+
+def test_team_week_range_matches_pandas_filter(synthetic_pbp_df: pd.DataFrame, store: QueryStore):
+    team_game_stats = _calculate_team_game_stats(synthetic_pbp_df, 'REG')
+    team, season = team_game_stats['team'].iloc[0], int(team_game_stats['season'].iloc[0])
+    stats = ['third_down_conv_rate', 'passing_yards_allowed']
+
+    actual = store.team_stats(team, season, weeks=(2, 3), stats=stats)
+
+    expected = team_game_stats[
+        (team_game_stats['team'] == team) & (team_game_stats['season'] == season)
+        & team_game_stats['week'].between(2, 3)
+    ].sort_values('week')
+    assert list(actual.columns) == ['game_id', 'team', 'season', 'week'] + stats
+    assert list(actual['game_id']) == list(expected['game_id'])
+    np.testing.assert_allclose(actual[stats].to_numpy(), expected[stats].to_numpy())
+
+
+def test_point_lookups(synthetic_pbp_df: pd.DataFrame, store: QueryStore):
+    team_game_stats = _calculate_team_game_stats(synthetic_pbp_df, 'REG')
+    rolling = _calculate_rolling_averages(team_game_stats)
+    row = rolling.iloc[5]
+    stats = ['avg_passing_tds', 'avg_third_down_conv_rate', 'avg_passing_yards']
+    # A second team and week whose features all differ from the first's.
+    other = rolling[(rolling['team'] != row['team']) & (rolling['week'] != row['week'])
+                    & rolling[stats].notna().all(axis=1) & (rolling[stats] != row[stats]).all(axis=1)].iloc[0]
+    stats_row = team_game_stats.set_index(['game_id', 'team']).loc[(row['game_id'], row['team'])]
+
+    for expected in (row, other):
+        features = store.team_features(expected['team'], int(expected['season']),
+                                       weeks=(expected['week'], expected['week']))
+        assert len(features) == 1
+        np.testing.assert_allclose(features[stats].iloc[0].to_numpy(dtype=float),
+                                   expected[stats].to_numpy(dtype=float))
+    game_stats = store.team_game(row['game_id'], row['team'], stats=['rushing_tds'])
+    assert game_stats['rushing_tds'] == stats_row['rushing_tds']
+    assert store.team_game('no-such-game', row['team']) is None
+
+    feature_row = store.games(int(row['season']))
+    game = store.game(feature_row['game_id'].iloc[0])
+    assert game['home_team'] == feature_row['home_team'].iloc[0]
+
+
+def test_team_features_include_ratings_and_splits(store: QueryStore):
+    columns = store.columns('team_features')
+    assert 'rtg_off_passing_tds' in columns
+    assert any(col.startswith('avg_') and 'quarter' in col for col in columns)
+
+
+def test_unknown_column_and_missing_store(store: QueryStore, tmp_path):
+    with pytest.raises(KeyError, match="Unknown columns"):
+        store.team_stats('KC', 2019, stats=['not_a_stat'])
+    with pytest.raises(FileNotFoundError):
+        QueryStore(str(tmp_path / 'missing.duckdb'))
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.ratings import RATING_STATS, calculate_weekly_ratings, rating_columns
+
+TEAMS = ['KC', 'SF', 'BUF', 'MIA', 'DAL', 'PHI']
+TRUE_OFFENCE = {'KC': 30.0, 'SF': 10.0, 'BUF': 0.0, 'MIA': -5.0, 'DAL': -15.0, 'PHI': -20.0}
+TRUE_DEFENCE = {'KC': -10.0, 'SF': -20.0, 'BUF': 5.0, 'MIA': 10.0, 'DAL': 0.0, 'PHI': 15.0}
+
+
+def _round_robin_team_games(seasons=(2022, 2023), weeks: int = 10) -> pd.DataFrame:
+    """Noise-free team-game rows where passing_yards = 220 + offence + opponent defence."""
+    rows = []
+    for season in seasons:
+        for week in range(1, weeks + 1):
+            order = TEAMS[:1] + list(np.roll(TEAMS[1:], week))
+            for home, away in zip(order[:3], order[:2:-1]):
+                game_id = f'{season}_{week:02d}_{away}_{home}'
+                for team, opponent in [(home, away), (away, home)]:
+                    rows.append({
+                        'game_id': game_id, 'season': season, 'week': week, 'team': team, 'opponent': opponent,
+                        'passing_yards': 220.0 + TRUE_OFFENCE[team] + TRUE_DEFENCE[opponent],
+                    })
+    return pd.DataFrame(rows)
+
+
+def test_ratings_recover_opponent_adjusted_strengths():
+    team_games = _round_robin_team_games()
+
+    ratings = calculate_weekly_ratings(team_games, ['passing_yards'], ridge_lambda=0.01)
+    last_week = ratings[(ratings['season'] == 2023) & (ratings['week'] == 10)].set_index('team')
+
+    for team in TEAMS:
+        assert abs(last_week.loc[team, 'rtg_off_passing_yards'] - TRUE_OFFENCE[team]) < 0.5
+        assert abs(last_week.loc[team, 'rtg_def_passing_yards'] - TRUE_DEFENCE[team]) < 0.5
+
+
+def test_ratings_are_leak_free():
+    team_games = _round_robin_team_games()
+    altered = team_games.copy()
+    later = altered['season'].eq(2023) & altered['week'].ge(5)
+    altered.loc[later, 'passing_yards'] += 100.0
+
+    original = calculate_weekly_ratings(team_games, ['passing_yards'])
+    changed = calculate_weekly_ratings(altered, ['passing_yards'])
+
+    cols = rating_columns(['passing_yards'])
+    before = original['season'].eq(2022) | original['week'].le(5)
+    np.testing.assert_allclose(changed.loc[before, cols], original.loc[before, cols])
+    assert (original.loc[original['season'].eq(2022) & original['week'].eq(1), cols] == 0.0).all().all()
+
+
+def test_warm_started_solves_match_direct_solve():
+    team_games = _round_robin_team_games(seasons=(2022,), weeks=6)
+    ratings = calculate_weekly_ratings(team_games, ['passing_yards'], ridge_lambda=2.0)
+
+    # Solve the same ridge problem directly on weeks 1-5 for the week 6 snapshot.
+    prior = team_games[team_games['week'] < 6]
+    teams = list(pd.unique(pd.concat([team_games['team'], team_games['opponent']])))
+    design = np.zeros((len(prior), 2 * len(teams) + 1))
+    design[np.arange(len(prior)), prior['team'].map(teams.index)] = 1.0
+    design[np.arange(len(prior)), len(teams) + prior['opponent'].map(teams.index)] = 1.0
+    design[:, -1] = 1.0
+    penalty = np.diag(np.r_[np.full(2 * len(teams), 2.0), 1e-6])
+    coef = np.linalg.solve(design.T @ design + penalty, design.T @ prior['passing_yards'].to_numpy())
+
+    week_six = ratings[ratings['week'] == 6].set_index('team')
+    for i, team in enumerate(teams):
+        assert abs(week_six.loc[team, 'rtg_off_passing_yards'] - coef[i]) < 1e-3
+        assert abs(week_six.loc[team, 'rtg_def_passing_yards'] - coef[len(teams) + i]) < 1e-3
+
+
+def test_feature_set_includes_home_and_away_ratings(synthetic_pbp_df: pd.DataFrame):
+    features = create_final_feature_set(synthetic_pbp_df, rating_stats=['passing_tds', 'third_down_conv_rate'])
+    reg_games = synthetic_pbp_df.loc[synthetic_pbp_df['season_type'] == 'REG', 'game_id']
+    features = features[features['game_id'].isin(reg_games)]
+
+    for side in ['home', 'away']:
+        for col in rating_columns(['passing_tds', 'third_down_conv_rate']):
+            assert f'{side}_{col}' in features.columns
+            assert features[f'{side}_{col}'].notna().all()
+
+
+def test_default_rating_stats_are_populated(synthetic_pbp_df: pd.DataFrame, capsys):
+    team_tables = {}
+    create_final_feature_set(synthetic_pbp_df, rating_stats=RATING_STATS, team_tables=team_tables)
+
+    assert team_tables['team_game_stats'][RATING_STATS].notna().any().all()
+    ratings = team_tables['team_features'][rating_columns(RATING_STATS)]
+    assert (ratings != 0.0).any().all()
+    assert "missing in every game" not in capsys.readouterr().out
+
+
+def test_unobserved_rating_stat_warns(capsys):
+    team_games = _round_robin_team_games(seasons=(2022,), weeks=3).assign(rushing_yards=np.nan)
+
+    ratings = calculate_weekly_ratings(team_games, ['rushing_yards'])
+
+    assert (ratings[rating_columns(['rushing_yards'])] == 0.0).all().all()
+    assert "'rushing_yards' is missing in every game" in capsys.readouterr().out
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.simulation import SIM_EXTRA_POINT_RATE, scoring_rates, simulate_games, simulate_scores
+
+_BASE = {
+    'passing_tds': 1.5, 'rushing_tds': 0.9, 'passing_yards': 230.0, 'rushing_yards': 115.0,
+    'third_down_conv_rate': 0.4, 'defence_tds': 0.1, 'special_teams_tds': 0.05,
+}
+_ALLOWED = ['passing_tds', 'rushing_tds', 'passing_yards', 'rushing_yards', 'third_down_conv_rate']
+
+
+@pytest.fixture
+def feature_df() -> pd.DataFrame:
+    """Two weeks of games; G0 is a strong home offence, G1 an even matchup, G3 has no features."""
+    df = pd.DataFrame({
+        'game_id': ['G0', 'G1', 'G2', 'G3'],
+        'season': 2023,
+        'week': [5, 5, 6, 6],
+        'home_team': ['KC', 'BUF', 'SF', 'DAL'],
+        'away_team': ['LV', 'MIA', 'SEA', 'NYG'],
+        'spread_line': [7.0, 0.0, 3.0, np.nan],
+        'total_line': [45.5, 44.0, 41.5, 40.0],
+    })
+    for side in ('home', 'away'):
+        for stat, value in _BASE.items():
+            df[f'{side}_avg_{stat}'] = value
+            if stat in _ALLOWED:
+                df[f'{side}_avg_{stat}_allowed'] = value
+    df.loc[0, 'home_avg_passing_tds'] = 3.0
+    df.loc[3, 'away_avg_rushing_tds'] = np.nan
+    return df
+
+
+def test_simulation_is_reproducible_and_probabilities_add_up(feature_df: pd.DataFrame):
+    simulated = simulate_games(feature_df, n_sims=20_000, seed=11)
+
+    pd.testing.assert_frame_equal(simulated, simulate_games(feature_df, n_sims=20_000, seed=11))
+    graded = simulated.dropna(subset=['home_cover_prob'])
+    np.testing.assert_allclose(
+        graded[['home_cover_prob', 'spread_push_prob', 'away_cover_prob']].sum(axis=1), 1.0
+    )
+    np.testing.assert_allclose(simulated[['over_prob', 'total_push_prob', 'under_prob']].iloc[:3].sum(axis=1), 1.0)
+
+
+def test_simulated_scores_follow_the_rates(feature_df: pd.DataFrame):
+    simulated = simulate_games(feature_df, n_sims=50_000, seed=3).set_index('game_id')
+
+    expected_margin = simulated['home_exp_points'] - simulated['away_exp_points']
+    np.testing.assert_allclose(simulated['margin_mean'].iloc[:3], expected_margin.iloc[:3], atol=0.2)
+    # G0's home offence scores 1.5 more expected touchdowns than in the even matchup.
+    assert simulated.loc['G0', 'margin_mean'] - simulated.loc['G1', 'margin_mean'] == pytest.approx(
+        0.75 * (6 + SIM_EXTRA_POINT_RATE), abs=0.3
+    )
+    assert simulated.loc['G0', 'home_win_prob'] > 0.6
+    assert simulated.loc['G1', 'home_cover_prob'] == pytest.approx(simulated.loc['G1', 'away_cover_prob'], abs=0.02)
+    # No spread line, and missing features: nothing to grade or simulate.
+    assert np.isnan(simulated.loc['G3', ['margin_mean', 'home_cover_prob', 'over_prob']].astype(float)).all()
+
+
+def test_scoring_rates_scale_field_goals_by_yards(feature_df: pd.DataFrame):
+    rates = scoring_rates(feature_df)
+    np.testing.assert_allclose(rates['home_fgs'][:3], 1.6)
+
+    feature_df.loc[0, 'home_avg_passing_yards'] = 330.0
+    assert scoring_rates(feature_df)['home_fgs'][0] > rates['home_fgs'][0]
+
+    yard_cols = [col for col in feature_df.columns if 'yards' in col]
+    with pytest.raises(ValueError, match="League mean"):
+        scoring_rates(feature_df.assign(**{col: 0.0 for col in yard_cols}))
+    with pytest.raises(ValueError, match="missing columns"):
+        scoring_rates(feature_df.drop(columns=['away_avg_passing_tds_allowed']))
+
+
+def test_simulate_scores_shapes():
+    rates = {'home_tds': np.array([2.0, 3.0]), 'away_tds': np.array([2.0, 1.0]),
+             'home_fgs': np.array([1.5, 1.5]), 'away_fgs': np.array([1.5, 1.5])}
+    home, away = simulate_scores(rates, n_sims=1000, rng=np.random.default_rng(0))
+
+    assert home.shape == away.shape == (2, 1000)
+    assert (home >= 0).all() and home.dtype == np.int32
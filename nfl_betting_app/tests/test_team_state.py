@@ -0,0 +1,147 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from nfl_betting_app.feature_engineering import (
+    STAT_FUNCTION_NAMES, STATS_TO_CALCULATE, _calculate_rolling_averages, create_final_feature_set
+)
+from nfl_betting_app.nfl_pbp_analysis import GameAccumulator, game_from_single_game_dataframe
+from nfl_betting_app.team_state import TeamStateTable, create_team_state_server
+
+
+@pytest.fixture
+def team_game_stats_df() -> pd.DataFrame:
+    """
+    Four weeks of KC vs SF style games plus the start of a second season.
+    Each stat value is derived from the week so the averages are easy to check.
+    """
+    rows = []
+    for season, weeks in [(2022, [1, 2, 3, 5]), (2023, [1])]:
+        for week in weeks:
+            for team, opponent, offset in [('KC', 'SF', 0), ('SF', 'KC', 10)]:
+                rows.append({
+                    'team': team, 'opponent': opponent,
+                    'game_id': f'{season}_{week:02d}_SF_KC',
+                    'season': season, 'week': week,
+                    **{stat: float(week + offset + i) for i, stat in enumerate(STATS_TO_CALCULATE)},
+                })
+    return pd.DataFrame(rows)
+
+
+def test_team_state_matches_pipeline_rolling_averages(team_game_stats_df: pd.DataFrame):
+    """
+    The state after ingesting every game before a given week must equal the
+    shifted averages the batch pipeline produces for that week.
+    """
+    point_in_time = _calculate_rolling_averages(team_game_stats_df)
+    target = point_in_time[(point_in_time['season'] == 2022) & (point_in_time['week'] == 5)]
+
+    history = team_game_stats_df[
+        (team_game_stats_df['season'] == 2022) & (team_game_stats_df['week'] < 5)
+    ]
+    table = TeamStateTable.from_team_game_stats(history)
+
+    for _, row in target.iterrows():
+        features = table.team_features(row['team'], 2022)
+        for name, value in features.items():
+            assert value == pytest.approx(row[name])
+
+
+def test_team_state_resets_for_new_season(team_game_stats_df: pd.DataFrame):
+    table = TeamStateTable.from_team_game_stats(team_game_stats_df)
+
+    # Only one 2023 game has been ingested, so the averages come from it alone.
+    assert table.team_features('KC', 2023)['avg_passing_tds'] == 1.0
+    # A season with no games yet produces the zero fill used by the pipeline.
+    assert all(value == 0.0 for value in table.team_features('KC', 2024).values())
+
+
+def test_team_state_rejects_out_of_order_games(team_game_stats_df: pd.DataFrame):
+    table = TeamStateTable.from_team_game_stats(team_game_stats_df)
+    stats = {stat: 0.0 for stat in STATS_TO_CALCULATE}
+
+    with pytest.raises(ValueError, match="is not after the last ingested week"):
+        table.update('KC', 2023, 1, stats)
+
+
+def test_build_week_features_and_round_trip(tmp_path, team_game_stats_df: pd.DataFrame):
+    table = TeamStateTable.from_team_game_stats(team_game_stats_df)
+    path = tmp_path / 'team_state.json'
+    table.save(str(path))
+    loaded = TeamStateTable.load(str(path))
+
+    schedule = pd.DataFrame({
+        'game_id': ['2023_02_SF_KC'], 'season': [2023], 'week': [2],
+        'home_team': ['KC'], 'away_team': ['SF'],
+    })
+    features = loaded.build_week_features(schedule)
+
+    assert features.loc[0, 'home_avg_passing_tds'] == 1.0
+    assert features.loc[0, 'away_avg_passing_tds'] == 11.0
+    assert features.loc[0, 'game_id'] == '2023_02_SF_KC'
+
+
+def test_team_state_from_pipeline_matches_its_team_features(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    team_tables = {}
+    create_final_feature_set(synthetic_pbp_df, rating_stats=['passing_tds', 'passing_yards'], team_tables=team_tables)
+    team_game_stats, team_features = team_tables['team_game_stats'], team_tables['team_features']
+    season = int(team_features['season'].max())
+    week = int(team_features.loc[team_features['season'] == season, 'week'].max())
+
+    table = TeamStateTable.from_team_tables({
+        'team_game_stats': team_game_stats[
+            (team_game_stats['season'] < season) | (team_game_stats['week'] < week)
+        ],
+        'team_features': team_features,
+    })
+    table.save(str(tmp_path / 'team_state.json'))
+    table = TeamStateTable.load(str(tmp_path / 'team_state.json'))
+
+    assert 'rtg_off_passing_tds' in table.feature_names()
+    assert set(table.feature_names()) <= set(team_features.columns)
+    for _, row in team_features[(team_features['season'] == season) & (team_features['week'] == week)].iterrows():
+        features = table.team_features(row['team'], season)
+        for name in table.feature_names():
+            assert features[name] == pytest.approx(row[name], abs=1e-6), name
+
+
+def test_team_state_http_endpoint(team_game_stats_df: pd.DataFrame):
+    table = TeamStateTable.from_team_game_stats(team_game_stats_df)
+    server = create_team_state_server(table, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f'http://127.0.0.1:{server.server_port}/matchup?home=KC&away=SF&season=2023'
+        with urllib.request.urlopen(url) as response:
+            payload = json.loads(response.read())
+        with pytest.raises(urllib.error.HTTPError) as unknown:
+            urllib.request.urlopen(f'http://127.0.0.1:{server.server_port}/teams/XXX?season=2023')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert payload['home_avg_passing_tds'] == 1.0
+    assert payload['away_l1_passing_tds'] == 11.0
+    assert unknown.value.code == 404
+
+
+def test_update_from_accumulator_matches_update_from_game(synthetic_pbp_df: pd.DataFrame):
+    plays = synthetic_pbp_df[synthetic_pbp_df['posteam'].notna() & (synthetic_pbp_df['season_type'] == 'REG')]
+    from_games, from_accumulators = TeamStateTable(), TeamStateTable()
+
+    for _, game_df in plays.groupby('game_id'):
+        game = game_from_single_game_dataframe(game_df)
+        season, week = int(game_df['season'].iloc[0]), int(game_df['week'].iloc[0])
+        accumulator = GameAccumulator(game.game_id, game.home_team, game.away_team)
+        for play in game:
+            accumulator.append(play)
+        from_games.update_from_game(game, season, week)
+        from_accumulators.update_from_accumulator(accumulator, season, week)
+
+    assert set(STAT_FUNCTION_NAMES) == set(STATS_TO_CALCULATE)
+    for team in from_games.teams:
+        assert json.dumps(from_accumulators.team_features(team, 2023)) == json.dumps(from_games.team_features(team, 2023))
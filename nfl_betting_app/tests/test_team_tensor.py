@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.team_tensor import TeamTensor, build_team_tensor, export_team_tensor
+
+
+@pytest.fixture
+def team_tables(synthetic_pbp_df: pd.DataFrame) -> dict:
+    team_tables = {}
+    create_final_feature_set(synthetic_pbp_df, rating_stats=['passing_tds'], team_tables=team_tables)
+    return team_tables
+
+
+@pytest.fixture
+def team_features(team_tables: dict) -> pd.DataFrame:
+    return team_tables['team_features']
+
+
+@pytest.fixture
+def tensor(team_features: pd.DataFrame, tmp_path) -> TeamTensor:
+    return export_team_tensor(team_features, str(tmp_path / 'team_tensor'))
+
+
+def test_tensor_cells_match_the_team_game_rows(team_features: pd.DataFrame, tensor: TeamTensor):
+    assert tensor.values.dtype == np.float32
+    assert isinstance(tensor.values, np.memmap)
+    assert tensor.values.shape == (len(tensor.seasons), len(tensor.weeks), len(tensor.teams), len(tensor.features))
+    assert int(tensor.mask.sum()) == len(team_features)
+    assert 'avg_passing_yards' in tensor.metadata['point_in_time_features']
+    assert 'rtg_off_passing_tds' in tensor.metadata['point_in_time_features']
+    assert 'passing_yards' not in tensor.metadata['point_in_time_features']
+
+    features = ['passing_yards', 'avg_passing_yards', 'rushing_tds_allowed']
+    for row in team_features.sample(10, random_state=0).itertuples():
+        np.testing.assert_allclose(
+            tensor.cell(row.season, row.week, row.team, features),
+            team_features.loc[row.Index, features].to_numpy(dtype=np.float32),
+        )
+        assert tensor.teams[tensor.opponent[tensor.seasons.index(row.season), row.week - tensor.weeks[0],
+                                            tensor.team_code(row.team)]] == row.opponent
+
+
+def test_team_history_and_week_state_are_slices(team_features: pd.DataFrame, tensor: TeamTensor):
+    team = team_features['team'].iloc[0]
+    code = tensor.team_code(team)
+    history = tensor.team_history(team, ['avg_rushing_yards'])[..., 0]
+    played = tensor.mask[:, :, code]
+
+    expected = team_features[team_features['team'] == team].sort_values(['season', 'week'])
+    np.testing.assert_allclose(history[played], expected['avg_rushing_yards'].to_numpy(dtype=np.float32))
+    assert np.isnan(history[~played]).all()
+
+    season, week = int(expected['season'].iloc[0]), int(expected['week'].iloc[0])
+    state = tensor.week_state(season, week)
+    assert state.shape == (len(tensor.teams), len(tensor.features))
+    week_rows = team_features[(team_features['season'] == season) & (team_features['week'] == week)]
+    assert int((~np.isnan(state[:, 0])).sum()) == len(week_rows)
+
+
+def test_unknown_keys_and_missing_tensor(tensor: TeamTensor, tmp_path):
+    with pytest.raises(KeyError, match="Unknown team"):
+        tensor.team_code('XXX')
+    with pytest.raises(KeyError, match="Unknown feature"):
+        tensor.team_history(tensor.teams[0], ['not_a_feature'])
+    with pytest.raises(KeyError, match="Unknown season"):
+        tensor.week_state(1900, 1)
+    with pytest.raises(FileNotFoundError):
+        TeamTensor(str(tmp_path / 'missing'))
+
+
+def test_export_rejects_two_games_in_a_week(team_features: pd.DataFrame, tmp_path):
+    with pytest.raises(ValueError, match="more than one row"):
+        export_team_tensor(pd.concat([team_features, team_features.iloc[:1]]), str(tmp_path / 'tensor'))
+
+
+def test_build_team_tensor_replaces_an_existing_export(team_tables: dict, tensor: TeamTensor):
+    rebuilt = build_team_tensor(team_tables, path=tensor.path)
+    np.testing.assert_array_equal(rebuilt.mask, tensor.mask)
@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from nfl_betting_app.artifacts import save_manifest, write_partitions
+from nfl_betting_app.feature_engineering import create_final_feature_set
+from nfl_betting_app.game_index import build_game_index, sort_plays
+from nfl_betting_app.work_queue import WorkQueue, create_sharded_feature_set, run_worker
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values('game_id').reset_index(drop=True)
+
+
+def _write_store(pbp_df: pd.DataFrame, tmp_path) -> str:
+    partition_dir = str(tmp_path / 'partitions')
+    save_manifest(write_partitions(pbp_df, partition_dir), os.path.join(partition_dir, 'manifest.json'))
+    return partition_dir
+
+
+def _claim_and_die(queue_dir: str, shard_id: str, claimed) -> None:
+    """A worker that takes a shard and then hangs without heartbeating."""
+    WorkQueue(queue_dir).claim(shard_id, 'doomed-worker')
+    claimed.set()
+    time.sleep(60)
+
+
+def test_sharded_feature_set_matches_single_process(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    partition_dir = _write_store(pbp_df, tmp_path)
+    queue_dir = str(tmp_path / 'queue')
+
+    expected = create_final_feature_set(pbp_df, game_index=build_game_index(pbp_df))
+    actual = create_sharded_feature_set(
+        partition_dir, queue_dir, local_workers=3, heartbeat_interval=0.05, poll_interval=0.05
+    )
+
+    pd.testing.assert_frame_equal(_sorted(actual), _sorted(expected), check_dtype=False)
+    queue = WorkQueue(queue_dir)
+    assert queue.pending() == []
+    assert len(queue.shard_ids) == pbp_df['season'].nunique()
+    assert os.listdir(os.path.join(queue_dir, 'leases')) == []
+
+
+def test_shard_of_dead_worker_is_taken_over(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    partition_dir = _write_store(pbp_df, tmp_path)
+    queue_dir = str(tmp_path / 'queue')
+    queue = WorkQueue.create(queue_dir, partition_dir, 'REG', lease_timeout=0.5)
+    shard_id = queue.shard_ids[0]
+
+    claimed = multiprocessing.Event()
+    doomed = multiprocessing.Process(target=_claim_and_die, args=(queue_dir, shard_id, claimed))
+    doomed.start()
+    assert claimed.wait(10)
+    doomed.kill()
+    doomed.join()
+
+    # The lease is still fresh, so nobody else may take the shard yet.
+    assert not queue.claim(shard_id, 'other-worker')
+
+    completed = run_worker(queue_dir, 'survivor', lease_timeout=0.5, heartbeat_interval=0.05, poll_interval=0.05)
+    assert completed == len(queue.shard_ids)
+    assert queue.pending() == []
+    assert not queue.claim(shard_id, 'late-worker')
+
+
+def test_recreating_a_different_queue_fails(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    partition_dir = _write_store(sort_plays(synthetic_pbp_df), tmp_path)
+    queue_dir = str(tmp_path / 'queue')
+    WorkQueue.create(queue_dir, partition_dir, 'REG')
+    WorkQueue.create(queue_dir, partition_dir, 'REG')
+
+    with pytest.raises(ValueError, match="different work queue"):
+        WorkQueue.create(queue_dir, partition_dir, 'POST')
+
+
+def test_only_one_worker_takes_over_an_expired_lease(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    partition_dir = _write_store(sort_plays(synthetic_pbp_df), tmp_path)
+    queue_dir = str(tmp_path / 'queue')
+    first, second = (WorkQueue.create(queue_dir, partition_dir, 'REG', lease_timeout=0.1) for _ in range(2))
+    shard_id = first.shard_ids[0]
+    assert WorkQueue(queue_dir).claim(shard_id, 'dead-worker')
+    time.sleep(0.2)
+
+    # Both saw the expired lease before either took it over.
+    seen = second._leases(shard_id)
+    assert first.claim(shard_id, 'first')
+    second._leases = lambda _: seen
+    assert not second.claim(shard_id, 'second')
+
+
+def test_changed_partitions_rerun_their_shards(synthetic_pbp_df: pd.DataFrame, tmp_path):
+    pbp_df = sort_plays(synthetic_pbp_df)
+    partition_dir = _write_store(pbp_df, tmp_path)
+    queue_dir = str(tmp_path / 'queue')
+    WorkQueue.create(queue_dir, partition_dir, 'REG')
+    run_worker(queue_dir, 'first-run', poll_interval=0.05)
+
+    # A weekly update rewrites the latest season's partition.
+    last_season = pbp_df['season'].max()
+    updated = pbp_df.assign(passing_yards=pbp_df['passing_yards'].where(pbp_df['season'] != last_season, 99.0))
+    save_manifest(write_partitions(updated, partition_dir), os.path.join(partition_dir, 'manifest.json'))
+    queue = WorkQueue.create(queue_dir, partition_dir, 'REG')
+
+    assert queue.pending() == [f'REG_{last_season}_{last_season}']
+    assert run_worker(queue_dir, 'second-run', poll_interval=0.05) == 1
+    assert set(queue.read_results()['season']) == set(pbp_df['season'])
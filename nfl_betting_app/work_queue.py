@@ -0,0 +1,324 @@
+# nfl_betting_app/work_queue.py
+# A shared-directory work queue that splits the team-game stats stage into
+# season shards, so any number of worker processes on hosts sharing storage
+# can build them, and a coordinator merges the results.
+#
+# Layout of a queue directory:
+#   queue.json                 partition dir, season type, store schema version
+#                              and the shards with their partition checksums
+#   leases/<shard>.<n>.json    generation n of a shard's lease: the worker
+#                              currently holding it; the file's mtime is its
+#                              heartbeat
+#   results/<shard>.parquet    the shard's team-game stats (atomically renamed
+#                              into place, so its presence means "done")
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import nfl_betting_app.config as config
+from nfl_betting_app.artifacts import load_manifest, manifest_seasons, read_partitions
+from nfl_betting_app.feature_engineering import _calculate_team_game_stats, get_backend
+from nfl_betting_app.game_index import GAME_LEVEL_COLUMNS, build_game_index
+from nfl_betting_app.ratings import calculate_weekly_ratings
+
+QUEUE_FILENAME = "queue.json"
+
+
+class WorkQueue:
+    """
+    Season shards of the team-game stats stage, claimed through lease files.
+
+    A claim is a single exclusive file creation: the first lease of a shard
+    is generation 0, and taking over an expired lease creates the next
+    generation, which only one of the racing workers can do. A worker whose
+    lease was taken over may still finish; results are identical and renamed
+    into place, so shards are processed at least once and stored exactly once.
+    """
+
+    def __init__(
+        self,
+        queue_dir: str,
+        lease_timeout: float = config.WORK_QUEUE_LEASE_TIMEOUT_SECONDS,
+        heartbeat_interval: float = config.WORK_QUEUE_HEARTBEAT_SECONDS
+    ):
+        self.queue_dir = queue_dir
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.spec = self._read_spec()
+        # Lease file of each shard this queue object holds.
+        self._held: Dict[str, str] = {}
+
+    def _read_spec(self) -> Dict[str, Any]:
+        with open(os.path.join(self.queue_dir, QUEUE_FILENAME)) as f:
+            return json.load(f)
+
+    @classmethod
+    def create(
+        cls,
+        queue_dir: str,
+        partition_dir: str,
+        season_type: str,
+        seasons_per_shard: int = 1,
+        **kwargs
+    ) -> 'WorkQueue':
+        """
+        Describes one shard per `seasons_per_shard` seasons of the partition
+        store, with the checksums of its partitions. Re-creating an existing
+        queue resumes it: finished shards are kept unless their partitions (or
+        the store's schema version) changed since, in which case their results
+        are discarded and they run again. A queue for another partition
+        directory or season type raises ValueError.
+        """
+        manifest = load_manifest(os.path.join(partition_dir, config.RAW_PBP_MANIFEST_FILENAME))
+        partitions = sorted(manifest["partitions"].items(), key=lambda item: item[1]["season"])
+        shards = {}
+        for i in range(0, len(partitions), seasons_per_shard):
+            shard_partitions = partitions[i:i + seasons_per_shard]
+            seasons = [entry["season"] for _, entry in shard_partitions]
+            shards[f"{season_type}_{seasons[0]}_{seasons[-1]}"] = {
+                "seasons": seasons,
+                "md5": {file_name: entry["md5"] for file_name, entry in shard_partitions},
+            }
+        spec = {
+            "partition_dir": os.path.abspath(partition_dir),
+            "season_type": season_type,
+            "schema_version": manifest["schema_version"],
+            "shards": shards,
+        }
+
+        queue_path = os.path.join(queue_dir, QUEUE_FILENAME)
+        if os.path.exists(queue_path):
+            with open(queue_path) as f:
+                old_spec = json.load(f)
+            if any(old_spec.get(key) != spec[key] for key in ("partition_dir", "season_type")):
+                raise ValueError(f"A different work queue already exists in '{queue_dir}'.")
+            if old_spec != spec:
+                same_store = old_spec.get("schema_version") == spec["schema_version"]
+                stale = [
+                    shard_id for shard_id, shard in old_spec["shards"].items()
+                    if not same_store or shards.get(shard_id) != shard
+                ]
+                print(f"Partitions changed since the work queue was created; rerunning {len(stale)} shards.")
+                queue = cls(queue_dir, **kwargs)
+                for shard_id in stale:
+                    queue._release(shard_id)
+                    try:
+                        os.remove(queue.result_path(shard_id))
+                    except FileNotFoundError:
+                        pass
+                cls._write_spec(queue_path, spec)
+        else:
+            for sub_dir in ["leases", "results"]:
+                os.makedirs(os.path.join(queue_dir, sub_dir), exist_ok=True)
+            cls._write_spec(queue_path, spec)
+        return cls(queue_dir, **kwargs)
+
+    @staticmethod
+    def _write_spec(queue_path: str, spec: Dict[str, Any]) -> None:
+        tmp_path = f"{queue_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(spec, f, indent=2)
+        os.replace(tmp_path, queue_path)
+
+    @property
+    def shard_ids(self) -> List[str]:
+        return list(self.spec["shards"])
+
+    def _lease_path(self, shard_id: str, generation: int) -> str:
+        return os.path.join(self.queue_dir, "leases", f"{shard_id}.{generation}.json")
+
+    def _leases(self, shard_id: str) -> List[Tuple[int, str]]:
+        """The shard's lease files as (generation, path), oldest first."""
+        lease_dir = os.path.join(self.queue_dir, "leases")
+        prefix = f"{shard_id}."
+        generations = [
+            int(name[len(prefix):-len(".json")]) for name in os.listdir(lease_dir)
+            if name.startswith(prefix) and name.endswith(".json") and name[len(prefix):-len(".json")].isdigit()
+        ]
+        return [(generation, self._lease_path(shard_id, generation)) for generation in sorted(generations)]
+
+    def _release(self, shard_id: str) -> None:
+        """Removes every lease generation of a shard."""
+        self._held.pop(shard_id, None)
+        for _, path in self._leases(shard_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def result_path(self, shard_id: str) -> str:
+        return os.path.join(self.queue_dir, "results", f"{shard_id}.parquet")
+
+    def is_done(self, shard_id: str) -> bool:
+        return os.path.exists(self.result_path(shard_id))
+
+    def pending(self) -> List[str]:
+        return [shard_id for shard_id in self.shard_ids if not self.is_done(shard_id)]
+
+    def claim(self, shard_id: str, worker_id: str) -> bool:
+        """Tries to take the lease on a shard. Returns True if this worker now holds it."""
+        if self.is_done(shard_id):
+            return False
+        leases = self._leases(shard_id)
+        generation = 0
+        if leases:
+            generation, latest_path = leases[-1]
+            try:
+                heartbeat_age = time.time() - os.path.getmtime(latest_path)
+            except FileNotFoundError:
+                return False  # Released while we looked.
+            if heartbeat_age <= self.lease_timeout:
+                return False
+            # The holder stopped heartbeating: take over with the next
+            # generation. Of the workers racing to do so, only the one whose
+            # exclusive create succeeds holds the shard.
+            generation += 1
+        lease_path = self._lease_path(shard_id, generation)
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({"worker": worker_id, "host": socket.gethostname(), "pid": os.getpid()}, f)
+        self._held[shard_id] = lease_path
+        return True
+
+    def heartbeat(self, shard_id: str) -> None:
+        try:
+            os.utime(self._held[shard_id])
+        except (KeyError, FileNotFoundError):
+            pass
+
+    def complete(self, shard_id: str, worker_id: str, result_df: pd.DataFrame) -> bool:
+        """
+        Stores a shard's result atomically and releases the lease. Returns
+        False, discarding the result, if the queue was re-created for changed
+        partitions while the shard was being processed.
+        """
+        if self._read_spec()["shards"].get(shard_id) != self.spec["shards"][shard_id]:
+            print(f"Shard {shard_id} changed while it was processed; discarding its result.")
+            self._held.pop(shard_id, None)
+            return False
+        tmp_path = f"{self.result_path(shard_id)}.tmp-{worker_id}"
+        result_df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.result_path(shard_id))
+        self._release(shard_id)
+        return True
+
+    def process_shard(self, shard_id: str) -> pd.DataFrame:
+        """Computes a shard's team-game stats from its season partitions."""
+        pbp_df = read_partitions(self.spec["partition_dir"], seasons=self.spec["shards"][shard_id]["seasons"])
+        return _calculate_team_game_stats(pbp_df, self.spec["season_type"], game_index=build_game_index(pbp_df))
+
+    def read_results(self) -> pd.DataFrame:
+        missing = self.pending()
+        if missing:
+            raise ValueError(f"Shards {missing} have not been completed.")
+        return pd.concat([pd.read_parquet(self.result_path(shard_id)) for shard_id in self.shard_ids], ignore_index=True)
+
+
+def _heartbeat_until(queue: WorkQueue, shard_id: str, stop: threading.Event) -> None:
+    while not stop.wait(queue.heartbeat_interval):
+        queue.heartbeat(shard_id)
+
+
+def run_worker(
+    queue_dir: str,
+    worker_id: Optional[str] = None,
+    lease_timeout: float = config.WORK_QUEUE_LEASE_TIMEOUT_SECONDS,
+    heartbeat_interval: float = config.WORK_QUEUE_HEARTBEAT_SECONDS,
+    poll_interval: float = 1.0
+) -> int:
+    """
+    Claims and processes shards until every shard in the queue is done,
+    heartbeating its lease while it works. When all remaining shards are
+    leased by others it waits, so it can take over from a worker that dies.
+
+    Returns:
+        The number of shards this worker completed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    queue = WorkQueue(queue_dir, lease_timeout=lease_timeout, heartbeat_interval=heartbeat_interval)
+    completed = 0
+    while True:
+        pending = queue.pending()
+        if not pending:
+            return completed
+        shard_id = next((shard_id for shard_id in pending if queue.claim(shard_id, worker_id)), None)
+        if shard_id is None:
+            time.sleep(poll_interval)
+            continue
+
+        print(f"Worker {worker_id} processing shard {shard_id}...")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat_until, args=(queue, shard_id, stop), daemon=True)
+        heartbeat.start()
+        try:
+            result_df = queue.process_shard(shard_id)
+        finally:
+            stop.set()
+            heartbeat.join()
+        if queue.complete(shard_id, worker_id, result_df):
+            completed += 1
+        else:
+            # The queue was re-created for new data; pick up its new spec.
+            queue = WorkQueue(queue_dir, lease_timeout=lease_timeout, heartbeat_interval=heartbeat_interval)
+
+
+def create_sharded_feature_set(
+    partition_dir: str,
+    queue_dir: str,
+    season_type: str = 'REG',
+    seasons_per_shard: int = 1,
+    local_workers: int = 0,
+    rating_stats: Optional[List[str]] = None,
+    backend: Optional[str] = None,
+    lease_timeout: float = config.WORK_QUEUE_LEASE_TIMEOUT_SECONDS,
+    heartbeat_interval: float = config.WORK_QUEUE_HEARTBEAT_SECONDS,
+    poll_interval: float = 1.0
+) -> pd.DataFrame:
+    """
+    Coordinates a sharded feature build.
+
+    Writes the work queue, optionally starts `local_workers` worker processes,
+    and works on shards itself until all are done (workers on other hosts can
+    join with `python -m nfl_betting_app.work_queue <queue_dir>`). The merged
+    team-game stats then go through the rolling and merge stages locally.
+    """
+    print(f"Starting sharded PBP feature engineering pipeline for season_type='{season_type}'...")
+    WorkQueue.create(
+        queue_dir, partition_dir, season_type, seasons_per_shard,
+        lease_timeout=lease_timeout, heartbeat_interval=heartbeat_interval
+    )
+    worker_args = (queue_dir, None, lease_timeout, heartbeat_interval, poll_interval)
+    workers = [multiprocessing.Process(target=run_worker, args=worker_args) for _ in range(local_workers)]
+    for worker in workers:
+        worker.start()
+    run_worker(*worker_args)
+    for worker in workers:
+        worker.join()
+
+    queue = WorkQueue(queue_dir)
+    team_game_stats_df = queue.read_results()
+    engine = get_backend(backend)
+    point_in_time_stats_df = engine.rolling_averages(team_game_stats_df)
+    ratings_df = calculate_weekly_ratings(team_game_stats_df, rating_stats) if rating_stats else None
+    games_df = read_partitions(partition_dir, columns=GAME_LEVEL_COLUMNS).drop_duplicates(subset=['game_id'])
+    final_feature_df = engine.merge_features(games_df, point_in_time_stats_df, ratings_df=ratings_df)
+
+    final_feature_df = final_feature_df[final_feature_df['week'] > 1].reset_index(drop=True)
+    print("Feature engineering pipeline complete.")
+    return final_feature_df
+
+
+if __name__ == "__main__":
+    # Joins an existing work queue as a worker: python -m nfl_betting_app.work_queue <queue_dir>
+    run_worker(sys.argv[1])